@@ -0,0 +1,80 @@
+"""
+Batched Evaluation - Pack many candidates into one structured LLM request
+Items are grouped into batches sized to the model's context budget, each batch asks for a
+JSON array with one object per item, and every item is validated individually. Items the
+model mangles fall back to the original one-at-a-time prompts.
+"""
+
+from scoring_engine import estimate_tokens
+from response_parsing import parse_batch_reply, batch_reply_is_complete
+
+# Context budget for the boardroom model (prompt + completion)
+MODEL_CONTEXT_TOKENS = 32768
+# Completion tokens reserved per item in the JSON array reply
+RESPONSE_TOKENS_PER_ITEM = 120
+# Hard cap so one bad reply never costs too many fallbacks
+MAX_BATCH_SIZE = 25
+
+
+def plan_batches(item_blocks, header_tokens, context_tokens=MODEL_CONTEXT_TOKENS, max_batch_size=MAX_BATCH_SIZE):
+    """
+    Greedily group item indexes so each batch fits the context budget.
+
+    Args:
+        item_blocks: Rendered text of each item
+        header_tokens: Tokens used by the shared part of the prompt
+
+    Returns:
+        List of index lists
+    """
+    budget = context_tokens - header_tokens
+    batches, current, used = [], [], 0
+    for i, block in enumerate(item_blocks):
+        cost = estimate_tokens([{"content": block}]) + RESPONSE_TOKENS_PER_ITEM
+        if current and (used + cost > budget or len(current) >= max_batch_size):
+            batches.append(current)
+            current, used = [], 0
+        current.append(i)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def run_batched(item_blocks, build_prompt, item_schema, generate, fallback, prompt_type, batch_prompt_version=None):
+    """
+    Evaluate items in batches, falling back to single-item requests where needed.
+
+    Args:
+        item_blocks: Rendered text of each item (numbered 1..N within its batch by build_prompt)
+        build_prompt: fn(list of item blocks) -> (system_prompt, user_input) for one batch
+        item_schema: Schema every element of the JSON array reply must satisfy (incl. "id")
+        generate: fn(list of (system_prompt, user_input), prompt_version, validate) -> raw replies,
+                  in order; validate holds one cache validator per batch (only complete replies are cached)
+        fallback: fn(list of item indexes) -> parsed values from single-item structured calls
+        prompt_type: Label for the parse counters
+        batch_prompt_version: LLM cache version for the batch prompt
+
+    Returns:
+        (values, stats) - one parsed dict (or None) per item in input order, and batch/fallback counts
+    """
+    header_tokens = estimate_tokens([{"content": build_prompt([])[0]}])
+    batches = plan_batches(item_blocks, header_tokens)
+    replies = generate(
+        [build_prompt([item_blocks[i] for i in batch]) for batch in batches], batch_prompt_version,
+        [lambda reply, n=len(batch): batch_reply_is_complete(reply, item_schema, n) for batch in batches]
+    )
+    
+    results = [None] * len(item_blocks)
+    for batch, reply in zip(batches, replies):
+        valid = parse_batch_reply(reply, item_schema, len(batch), prompt_type)
+        for position, index in enumerate(batch, 1):
+            results[index] = valid.get(position)
+    
+    missing = [i for i, r in enumerate(results) if r is None]
+    if missing:
+        for i, value in zip(missing, fallback(missing)):
+            results[i] = value
+    
+    stats = {"items": len(item_blocks), "batches": len(batches), "fallbacks": len(missing)}
+    return results, stats
@@ -0,0 +1,88 @@
+"""
+Benchmark - Per-row vs bulk writes
+Compares rows/sec of add_match / queue_outreach / send_agent_message / mark_message_read
+against their *_bulk counterparts on a throwaway database.
+
+Usage:
+    python benchmarks/bench_bulk_writes.py [rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+
+
+def _timed(label, rows, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    rate = rows / elapsed if elapsed else float("inf")
+    print(f"   {label:<32} {elapsed:8.3f}s  {rate:12,.0f} rows/sec")
+    return rate
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DATABASE_PATH = Path(tmp) / "bench.db"
+        database.init_database()
+
+        candidate_id = database.add_candidate("Bench Candidate")
+        job_id = database.add_job("Bench Role", "Bench Co")
+
+        match_rows = [{"candidate_id": candidate_id, "job_id": job_id, "score": i / rows, "source": "bench"}
+                      for i in range(rows)]
+        outreach_rows = [{"target_type": "candidate", "target_name": f"Person {i}",
+                          "target_linkedin_url": f"https://linkedin.com/in/p{i}", "message": "Hi!"}
+                         for i in range(rows)]
+        message_rows = [{"from_agent": "Scout", "to_agent": "Jack", "message_type": "bench",
+                         "content": f"Message {i}", "metadata": {"i": i}}
+                        for i in range(rows)]
+
+        print(f"\n📊 Writing {rows:,} rows per operation\n")
+
+        results = []
+
+        print("🎯 matches")
+        per_row = _timed("add_match", rows,
+                         lambda: [database.add_match(**m) for m in match_rows])
+        bulk = _timed("add_matches_bulk", rows, lambda: database.add_matches_bulk(match_rows))
+        results.append(("matches", per_row, bulk))
+
+        print("🎯 outreach_queue")
+        per_row = _timed("queue_outreach", rows,
+                         lambda: [database.queue_outreach(**o) for o in outreach_rows])
+        bulk = _timed("queue_outreach_bulk", rows, lambda: database.queue_outreach_bulk(outreach_rows))
+        results.append(("outreach_queue", per_row, bulk))
+
+        print("🎯 agent_messages")
+        ids = []
+        per_row = _timed("send_agent_message", rows,
+                         lambda: ids.extend(database.send_agent_message(**m) for m in message_rows))
+        bulk_ids = []
+        bulk = _timed("send_agent_messages_bulk", rows,
+                      lambda: bulk_ids.extend(database.send_agent_messages_bulk(message_rows)))
+        results.append(("agent_messages (insert)", per_row, bulk))
+
+        per_row = _timed("mark_message_read", rows,
+                         lambda: [database.mark_message_read(i) for i in ids])
+        bulk = _timed("mark_messages_read_bulk", rows, lambda: database.mark_messages_read_bulk(bulk_ids))
+        results.append(("agent_messages (read)", per_row, bulk))
+
+        database.close_connection()
+
+    print("\n" + "-" * 60)
+    for table, per_row, bulk in results:
+        print(f"   {table:<26} speedup: {bulk / per_row:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark - Prompt tokens over a long interview: resend everything vs ConversationHistory
+Simulates a voice interview (persona-sized system prompt, ~40-word answers, ~60-word replies)
+and compares the tokens sent per turn and in total when the whole history is resent versus
+when older turns are folded into a running summary. Summarization calls are counted in the
+compacted total (their input and output), so the saving is net.
+
+Usage:
+    python benchmarks/bench_conversation.py [turns] [budget_tokens]
+"""
+
+import os
+import sys
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conversation import ConversationHistory
+from scoring_engine import estimate_tokens
+
+PERSONA = "You are Jack, a warm and thorough technical recruiter. " * 180   # ~10 KB, like prompts/jack_persona.md
+SUMMARY_WORDS = 250
+
+
+def _answer(i):
+    return f"In my role number {i} I worked on service {i} with a team of {i % 9 + 2} people. " * 3
+
+
+def _reply(i):
+    return f"That's great context about service {i}. Can you tell me more about how you measured its impact? " * 3
+
+
+def main():
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+    budget = int(sys.argv[2]) if len(sys.argv) > 2 else 8000
+    summary_cost = {"calls": 0, "tokens": 0}
+
+    def summarize(summary, folded, assistant, user):
+        # Stand-in for the LLM: keeps a bounded tail of the notes; charges its input + output
+        notes = (summary + " " + " ".join(m["content"] for m in folded if m["role"] == "user")).split()
+        result = " ".join(notes[-SUMMARY_WORDS:])
+        summary_cost["calls"] += 1
+        summary_cost["tokens"] += estimate_tokens([{"content": summary}] + folded) + estimate_tokens([{"content": result}])
+        return result
+
+    full = [{"role": "system", "content": PERSONA}]
+    history = ConversationHistory(PERSONA, budget=budget, summarize=summarize, assistant="Jack", user="Candidate")
+    full_total = compacted_total = 0
+    full_peak = compacted_peak = 0
+    for i in range(turns):
+        full.append({"role": "user", "content": _answer(i)})
+        history.add("user", _answer(i))
+        sent_full = estimate_tokens(full)
+        sent_compacted = estimate_tokens(history.prompt_messages())
+        full_total += sent_full
+        compacted_total += sent_compacted
+        full_peak = max(full_peak, sent_full)
+        compacted_peak = max(compacted_peak, sent_compacted)
+        full.append({"role": "assistant", "content": _reply(i)})
+        history.add("assistant", _reply(i))
+
+    assert history.full_messages() == full
+    compacted_total += summary_cost["tokens"]
+    print(f"\n🧮 Conversation tokens: {turns} turns, persona {estimate_tokens([{'content': PERSONA}]):,} tokens, "
+          f"budget {budget:,}\n")
+    print(f"{'history':<22} {'last turn':>10} {'peak':>8} {'total':>11}")
+    print(f"{'resend everything':<22} {sent_full:>10,} {full_peak:>8,} {full_total:>11,}")
+    print(f"{'ConversationHistory':<22} {sent_compacted:>10,} {compacted_peak:>8,} {compacted_total:>11,}")
+    print(f"\n{summary_cost['calls']} summary call(s) ({summary_cost['tokens']:,} tokens, included above); "
+          f"{full_total / compacted_total:.1f}x fewer tokens; full history kept for the final profile: ✅")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark - Embedding index: build, reopen, incremental updates and top-K shortlists
+Uses bench_prerank's synthetic pool (planted relevant candidates per job) to report the
+cost of embedding and persisting every candidate, reopening the memory-mapped index in a
+new process-like handle, adding/removing single candidates, and per-job top-K cosine
+shortlists - with recall@K next to the BM25 PreRanker's.
+
+Usage:
+    python benchmarks/bench_embedding_index.py [candidates] [jobs]
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_prerank import build_dataset, RELEVANT_PER_JOB, K_VALUES
+from embedding_index import EmbeddingIndex, get_embedder
+from prerank import PreRanker, candidate_text, job_text
+
+
+def _recall(shortlists, jobs, relevant, k):
+    hits = sum(len({cid for cid, _ in shortlists[job["id"]][:k]} & relevant[job["id"]]) for job in jobs)
+    return hits / (RELEVANT_PER_JOB * len(jobs))
+
+
+def main():
+    n_candidates = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    n_jobs = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    candidates, jobs, relevant = build_dataset(n_candidates, n_jobs)
+    top_k = max(K_VALUES)
+    workdir = tempfile.mkdtemp(prefix="bench_embeddings_")
+    try:
+        start = time.perf_counter()
+        index = EmbeddingIndex("candidates", workdir, candidate_text, job_text)
+        index.add_rows(candidates)
+        build_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reopened = EmbeddingIndex("candidates", workdir, candidate_text, job_text)
+        reopen_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        shortlists = {job["id"]: reopened.shortlist(job, top_k) for job in jobs}
+        query_ms = (time.perf_counter() - start) * 1000 / len(jobs)
+
+        extra = [{"id": f"new{i}", "name": f"New {i}", "skills": '["skill1", "skill2"]'} for i in range(20)]
+        start = time.perf_counter()
+        for row in extra:
+            reopened.add_rows([row])
+        add_ms = (time.perf_counter() - start) * 1000 / len(extra)
+        start = time.perf_counter()
+        for row in extra:
+            reopened.remove(row["id"])
+        remove_ms = (time.perf_counter() - start) * 1000 / len(extra)
+        matrix_mb = os.path.getsize(reopened.matrix_path) / 1e6
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    bm25 = PreRanker(candidates).shortlist_many(jobs, top_k=top_k)
+
+    print(f"\n🧭 Embedding index ({get_embedder().name}): {len(candidates):,} candidates x {n_jobs} jobs "
+          f"({RELEVANT_PER_JOB} planted relevant candidates per job)\n")
+    print(f"   Build (embed + persist): {build_s:.2f}s   Reopen (memmap): {reopen_s * 1000:.1f}ms   "
+          f"Matrix file: {matrix_mb:.1f} MB")
+    print(f"   Shortlist per job: {query_ms:.2f}ms   Add one: {add_ms:.2f}ms   Remove one: {remove_ms:.2f}ms\n")
+    print(f"   {'K':>4} {'embedding recall@K':>19} {'BM25 recall@K':>14}")
+    for k in K_VALUES:
+        print(f"   {k:>4} {_recall(shortlists, jobs, relevant, k):>19.3f} {_recall(bm25, jobs, relevant, k):>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
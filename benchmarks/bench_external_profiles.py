@@ -0,0 +1,83 @@
+"""
+Benchmark - External profile store: deduplication and searches avoided
+Runs Scout's MODE 1 external-search path twice over jobs that share titles, with the
+search query cache disabled so only the external_profiles store can save searches.
+Reports profile copies kept in agent_messages metadata vs distinct stored profiles, and
+web searches issued on each run.
+
+Usage:
+    python benchmarks/bench_external_profiles.py [jobs] [distinct_titles]
+"""
+
+import io
+import os
+import sys
+import json
+import shutil
+import tempfile
+import contextlib
+from pathlib import Path
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+import search
+import scout_agent
+from search import FixtureProvider
+
+
+def _run(jobs):
+    """MODE 1's external path: stored matches first, then one batched web search for the rest."""
+    queued = []
+    for job in jobs:
+        requirements = json.loads(job['requirements'])
+        if scout_agent.find_stored_matches("candidate", job['title'], requirements[:3], "job", job['id']):
+            continue
+        queued.append({"job_id": job['id'], "title": job['title'],
+                       "query": scout_agent.candidate_xray_query(job['title'], requirements, "")})
+    scout_agent.send_candidate_searches(queued)
+    return len(queued)
+
+
+def main():
+    n_jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    titles = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    search.SEARCH_CACHE_ENABLED = False
+    provider = FixtureProvider()
+    search.configure(provider)
+
+    workdir = tempfile.mkdtemp(prefix="bench_external_")
+    database.DATABASE_PATH = Path(workdir) / "bench.db"
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            database.init_database()
+            for i in range(n_jobs):
+                database.add_job(f"Platform Engineer {i % titles}", f"Company {i}", requirements=["python", "kubernetes"])
+            jobs = list(database.iter_jobs())
+            first_calls, first_searched = provider.calls, _run(jobs)
+            first_calls = provider.calls - first_calls
+            second_calls, second_searched = provider.calls, _run(jobs)
+            second_calls = provider.calls - second_calls
+
+        conn = database.get_connection()
+        copies = sum(
+            len(json.loads(row['metadata'])['candidates'])
+            for row in conn.execute("SELECT metadata FROM agent_messages WHERE message_type = 'candidate_recommendation'")
+        )
+        profiles = conn.execute('SELECT COUNT(*) FROM external_profiles').fetchone()[0]
+        provenance = conn.execute('SELECT COUNT(*) FROM external_profile_sources').fetchone()[0]
+        database.close_connection()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"\n🗂️ External profiles: {n_jobs} jobs over {titles} titles, two Scout runs (query cache off)\n")
+    print(f"{'run':<8} {'jobs web-searched':>18} {'backend calls':>14}")
+    print(f"{'first':<8} {first_searched:>18} {first_calls:>14}")
+    print(f"{'second':<8} {second_searched:>18} {second_calls:>14}")
+    print(f"\nProfile copies in message metadata: {copies:,}")
+    print(f"Distinct stored profiles:           {profiles:,} ({provenance:,} job provenance links)")
+
+
+if __name__ == "__main__":
+    main()
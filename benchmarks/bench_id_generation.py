@@ -0,0 +1,87 @@
+"""
+Benchmark - ID generators vs insert throughput
+Fills agent_messages with N rows (default 1,000,000) using each ID generator and reports
+rows/sec, the tail-batch rate (when the B-tree is largest) and the final database size.
+The "ulid as BLOB" row stores the same ULIDs as 16 raw bytes, for the size comparison
+behind keeping IDs as TEXT.
+
+Usage:
+    python benchmarks/bench_id_generation.py [rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+
+BATCH_SIZE = 10_000
+
+# Crockford base32 digits -> the digits int(..., 32) understands
+_TO_BASE32 = str.maketrans(database._CROCKFORD_BASE32, "0123456789ABCDEFGHIJKLMNOPQRSTUV")
+
+
+def _ulid_blob():
+    return int(database.generate_ulid().translate(_TO_BASE32), 32).to_bytes(16, "big")
+
+
+GENERATORS = {
+    "uuid4[:8] (legacy)": database.generate_short_uuid,
+    "uuid4 (36 chars)": lambda: str(uuid.uuid4()),
+    "ulid (default)": database.generate_ulid,
+    "ulid as BLOB": _ulid_blob,
+}
+
+
+def _fill(rows):
+    """Insert `rows` agent messages in batches; return (total_seconds, last_batch_rows_per_sec)."""
+    message = {"from_agent": "Scout", "to_agent": "Jack", "message_type": "bench", "content": "x"}
+    start = time.perf_counter()
+    last_rate = 0.0
+    written = 0
+    while written < rows:
+        n = min(BATCH_SIZE, rows - written)
+        batch_start = time.perf_counter()
+        database.send_agent_messages_bulk([message] * n)
+        last_rate = n / (time.perf_counter() - batch_start)
+        written += n
+    return time.perf_counter() - start, last_rate
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"\n📊 Inserting {rows:,} agent_messages rows per generator\n")
+    print(f"   {'generator':<22} {'total':>9} {'rows/sec':>12} {'tail rows/sec':>14} {'db size':>10}")
+
+    for name, generator in GENERATORS.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            database.DATABASE_PATH = Path(tmp) / "ids.db"
+            database.set_id_generator(generator)
+            database.init_database()
+
+            try:
+                elapsed, tail_rate = _fill(rows)
+            except Exception as e:
+                # The legacy generator can collide on large tables
+                print(f"   {name:<22} failed: {e}")
+                database.close_connection()
+                continue
+
+            conn = database.get_connection()
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            size_mb = database.DATABASE_PATH.stat().st_size / 1e6
+            database.close_connection()
+
+            print(f"   {name:<22} {elapsed:8.2f}s {rows / elapsed:12,.0f} {tail_rate:14,.0f} {size_mb:8.1f}MB")
+
+    database.set_id_generator(database.generate_ulid)
+
+
+if __name__ == "__main__":
+    main()
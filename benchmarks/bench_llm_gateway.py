@@ -0,0 +1,67 @@
+"""
+Benchmark - Shared keep-alive LLM client vs a fresh client per call
+Runs sequential chat completions through the real Groq SDK against the local StubLLMServer,
+once building a new client for every call (no connection reuse) and once through the shared
+llm_gateway client, and reports latency and how many TCP connections each opened.
+
+Usage:
+    python benchmarks/bench_llm_gateway.py [calls]
+"""
+
+import os
+import sys
+import time
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import llm_gateway
+from fake_llm import StubLLMServer
+from scoring_engine import ScoringEngine
+
+
+def _messages(i):
+    return [{"role": "user", "content": f"request {i}"}]
+
+
+def _fresh_client_per_call(server, n):
+    from groq import Groq
+    start = time.perf_counter()
+    for i in range(n):
+        client = Groq(api_key="local-stub", base_url=server.base_url)
+        client.chat.completions.create(model=llm_gateway.MODEL_NAME, messages=_messages(i))
+        client.close()
+    return time.perf_counter() - start
+
+
+def _shared_client(server, n):
+    llm_gateway.configure("groq", base_url=server.base_url)
+    start = time.perf_counter()
+    for i in range(n):
+        llm_gateway.chat(_messages(i))
+    return time.perf_counter() - start
+
+
+def _concurrent_engine(server, n):
+    llm_gateway.configure("groq", base_url=server.base_url)
+    engine = ScoringEngine(requests_per_minute=0, tokens_per_minute=0)
+    start = time.perf_counter()
+    engine.run([_messages(i) for i in range(n)])
+    return time.perf_counter() - start
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print(f"\n🔌 LLM gateway: {n} calls against the local stub server\n")
+    print(f"{'client':<28} {'ms/call':>9} {'connections':>12}")
+    for name, run in (("fresh client per call", _fresh_client_per_call),
+                      ("shared gateway client", _shared_client),
+                      ("ScoringEngine (async pool)", _concurrent_engine)):
+        with StubLLMServer(latency=0) as server:
+            elapsed = run(server, n)
+            print(f"{name:<28} {elapsed / n * 1000:>9.2f} {server.connections:>12}")
+        llm_gateway.reset()
+
+
+if __name__ == "__main__":
+    main()
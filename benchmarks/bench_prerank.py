@@ -0,0 +1,86 @@
+"""
+Benchmark - Two-stage matching (local pre-ranker + LLM)
+Builds a synthetic candidate pool with planted relevant candidates per job, then reports
+recall@K of the PreRanker and how many LLM calls the top-K cut saves.
+
+Usage:
+    python benchmarks/bench_prerank.py [candidates] [jobs]
+"""
+
+import json
+import os
+import random
+import sys
+import time
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prerank import PreRanker
+
+SEED = 7
+SKILLS = [f"skill{i}" for i in range(400)]
+TITLES = ["backend engineer", "data scientist", "product manager", "designer", "devops engineer",
+          "ml engineer", "founders associate", "sales lead", "frontend engineer", "analyst"]
+RELEVANT_PER_JOB = 10
+K_VALUES = (5, 10, 20, 50)
+LLM_CALLS_PER_PAIR = {"scout": 1, "boardroom": 2}
+
+
+def build_dataset(n_candidates, n_jobs):
+    """Jobs with 6 requirements; RELEVANT_PER_JOB planted candidates share most of them."""
+    rng = random.Random(SEED)
+    jobs, relevant, candidates = [], {}, []
+
+    for j in range(n_jobs):
+        title = rng.choice(TITLES)
+        reqs = rng.sample(SKILLS, 6)
+        job_id = f"job{j}"
+        jobs.append({"id": job_id, "title": title, "company": "Synthetic Co", "requirements": json.dumps(reqs)})
+        relevant[job_id] = set()
+        for r in range(RELEVANT_PER_JOB):
+            cand_id = f"rel{j}_{r}"
+            skills = rng.sample(reqs, 4) + rng.sample(SKILLS, 4)
+            candidates.append({"id": cand_id, "name": f"Planted {j}-{r}", "headline": title,
+                               "skills": json.dumps(skills)})
+            relevant[job_id].add(cand_id)
+
+    while len(candidates) < n_candidates:
+        i = len(candidates)
+        candidates.append({"id": f"noise{i}", "name": f"Noise {i}", "headline": rng.choice(TITLES),
+                           "skills": json.dumps(rng.sample(SKILLS, 8))})
+    rng.shuffle(candidates)
+    return candidates, jobs, relevant
+
+
+def main():
+    n_candidates = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    n_jobs = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    candidates, jobs, relevant = build_dataset(n_candidates, n_jobs)
+    print(f"\n📊 {len(candidates):,} candidates x {n_jobs} jobs "
+          f"({RELEVANT_PER_JOB} planted relevant candidates per job)\n")
+
+    start = time.perf_counter()
+    ranker = PreRanker(candidates)
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    shortlists = ranker.shortlist_many(jobs, top_k=max(K_VALUES))
+    rank_s = time.perf_counter() - start
+    print(f"   Index build: {build_s:.2f}s   Ranking all jobs: {rank_s * 1000:.1f}ms\n")
+
+    pairs = len(candidates) * n_jobs
+    print(f"   {'K':>4} {'recall@K':>9} " + " ".join(f"{name + ' LLM calls':>24}" for name in LLM_CALLS_PER_PAIR))
+    for k in K_VALUES:
+        hits = sum(len({cid for cid, _ in shortlists[job["id"]][:k]} & relevant[job["id"]]) for job in jobs)
+        recall = hits / (RELEVANT_PER_JOB * n_jobs)
+        cells = []
+        for per_pair in LLM_CALLS_PER_PAIR.values():
+            before, after = pairs * per_pair, min(k, len(candidates)) * n_jobs * per_pair
+            cells.append(f"{after:>9,} vs {before:>9,} ({before / after:5.0f}x)")
+        print(f"   {k:>4} {recall:>9.3f} " + " ".join(f"{c:>24}" for c in cells))
+
+
+if __name__ == "__main__":
+    main()
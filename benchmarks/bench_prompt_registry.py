@@ -0,0 +1,89 @@
+"""
+Benchmark - Persona prompt loading and prefix reuse
+Compares re-reading the persona file on every call with the PromptRegistry (one stat per
+lookup), checks that an edited file is hot-reloaded under a new prefix ID, and runs a short
+conversation against the fake backend to show how many prompt tokens a prefix-caching
+backend can serve from cache when calls carry the persona's prefix ID.
+
+Usage:
+    python benchmarks/bench_prompt_registry.py [lookups] [turns]
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import llm_gateway
+from prompt_registry import PromptRegistry
+
+REPO_PROMPTS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "prompts")
+
+
+def _reread(path, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        with open(path, "r", encoding="utf-8") as f:
+            f.read()
+    return (time.perf_counter() - start) / n
+
+
+def _registry(registry, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        registry.get("jack_persona")
+    return (time.perf_counter() - start) / n
+
+
+def _conversation(registry, turns):
+    llm_gateway.configure("fake", latency=0)
+    client = llm_gateway.get_client()
+    messages = [{"role": "system", "content": registry.get("jack_persona")}]
+    for i in range(turns):
+        messages.append({"role": "user", "content": f"Answer {i}: I led a platform migration. " * 5})
+        reply = llm_gateway.chat(messages, prefix_id=registry.prefix_id("jack_persona"))
+        messages.append({"role": "assistant", "content": reply})
+    stats = client.prompt_tokens, client.cached_prompt_tokens
+    llm_gateway.reset()
+    return stats
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    turns = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    workdir = tempfile.mkdtemp(prefix="bench_prompts_")
+    try:
+        for name in os.listdir(REPO_PROMPTS):
+            shutil.copy(os.path.join(REPO_PROMPTS, name), workdir)
+        registry = PromptRegistry(workdir)
+        path = os.path.join(workdir, "jack_persona.md")
+
+        reread = _reread(path, n)
+        cached = _registry(registry, n)
+
+        before = registry.prefix_id("jack_persona")
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("\nAlways confirm the candidate's notice period.\n")
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+        after = registry.prefix_id("jack_persona")
+        reloaded = before != after and registry.get("jack_persona").endswith("notice period.\n")
+
+        prompt_tokens, cached_tokens = _conversation(registry, turns)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    PromptRegistry(REPO_PROMPTS).print_report()
+    print(f"\n{'lookup':<24} {'µs/call':>9}")
+    print(f"{'re-read file':<24} {reread * 1e6:>9.2f}")
+    print(f"{'PromptRegistry.get':<24} {cached * 1e6:>9.2f}")
+    print(f"\n{'✅' if reloaded else '❌'} Edited file hot-reloaded: {before} -> {after}")
+    print(f"🧩 {turns}-turn conversation: {cached_tokens:,} of {prompt_tokens:,} prompt tokens "
+          f"({cached_tokens / prompt_tokens:.0%}) reusable from a prefix cache keyed by the persona's prefix ID")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark - Scout query planning: one query per requester vs the query planner
+Builds Scout's MODE 1 X-Ray queries for jobs that share titles and overlapping skill lists
+(same skills in another order or case, or a subset of another job's skills) and searches
+them three ways with the query cache off: one search per job, search_many's exact-string
+dedupe, and a QueryPlan that also merges equivalent and subsumed queries. The provider
+answers from a synthetic profile corpus (each profile has one title and a few skills), so
+the benchmark can check that every profile a job receives really has the job's title and
+one of its skills. Reports queries requested vs issued and wall time.
+
+Usage:
+    python benchmarks/bench_query_planner.py [jobs] [distinct_titles] [round_trip_seconds]
+"""
+
+import os
+import re
+import sys
+import time
+import random
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import search
+import scout_agent
+from query_planner import QueryPlan
+from search import FixtureProvider
+
+SKILL_SETS = [
+    ["Python", "SQL", "AWS"], ["sql", "python", "aws"], ["Python", "SQL"], ["python"],
+    ["Go", "Kubernetes", "Terraform"], ["kubernetes", "go"], ["Terraform"],
+    ["Java", "Spring", "Kafka"], ["Kafka", "Java"],
+]
+ALL_SKILLS = sorted({s.lower() for skills in SKILL_SETS for s in skills})
+PROFILES_PER_TITLE = 120
+
+
+class CorpusProvider(FixtureProvider):
+    """Answers X-Ray queries from a fixed profile corpus: every phrase and one term per OR-group must match."""
+
+    def __init__(self, titles, latency):
+        super().__init__(latency=latency)
+        rng = random.Random(3)
+        self.corpus = []
+        for t in range(titles):
+            for i in range(PROFILES_PER_TITLE):
+                skills = rng.sample(ALL_SKILLS, 2)
+                self.corpus.append({
+                    "title": f"Person {t}-{i} - Engineer {t} | LinkedIn",
+                    "href": f"https://www.linkedin.com/in/person-{t}-{i}",
+                    "body": f"Engineer {t}. Skills: {', '.join(skills)}.",
+                    "skills": set(skills), "role": f"engineer {t}",
+                })
+
+    def text(self, query, max_results):
+        self.limiter.acquire()
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        groups = [set(re.findall(r'"([^"]+)"', g)) for g in re.findall(r"\(([^)]*)\)", query)]
+        phrases = re.findall(r'"([^"]+)"', re.sub(r"\([^)]*\)", "", query))
+        hits = [p for p in self.corpus
+                if all(ph == p["role"] for ph in phrases) and all(g & p["skills"] for g in groups)]
+        return [{k: p[k] for k in ("title", "href", "body")} for p in hits[:max_results]]
+
+
+def _legacy_query(title, skills):
+    """Scout's query string before canonicalization (order and case preserved)."""
+    skill_query = " OR ".join([f'"{s}"' for s in skills[:3]])
+    return f'site:linkedin.com/in/ "{title}" ({skill_query}) ""'
+
+
+def _satisfies(result, title, skills, corpus):
+    """Independent of the planner: the profile behind the result has the title and a requested skill."""
+    profile = corpus[result["href"]]
+    return profile["role"] == title.lower() and bool(profile["skills"] & {s.lower() for s in skills[:3]})
+
+
+def _timed(provider, fn):
+    search.configure(provider)
+    before = provider.calls
+    start = time.perf_counter()
+    results = fn()
+    return time.perf_counter() - start, provider.calls - before, results
+
+
+def main():
+    n_jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    titles = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.05
+    search.SEARCH_CACHE_ENABLED = False
+    rng = random.Random(7)
+    jobs = [(f"Engineer {rng.randrange(titles)}", rng.choice(SKILL_SETS)) for _ in range(n_jobs)]
+    limit = scout_agent.SCOUT_SEARCH_LIMIT
+
+    def per_job():
+        provider = search.get_provider()
+        return [provider.text(_legacy_query(t, s), limit) for t, s in jobs]
+
+    def exact_dedupe():
+        return search.search_many((_legacy_query(t, s), limit) for t, s in jobs)
+
+    plan = QueryPlan()
+
+    def planned():
+        for title, skills in jobs:
+            plan.add(scout_agent.candidate_xray_query(title, skills, ""), limit)
+        return plan.execute()
+
+    rows = [
+        ("one search per job", _timed(CorpusProvider(titles, latency), per_job)),
+        ("search_many exact dedupe", _timed(CorpusProvider(titles, latency), exact_dedupe)),
+        ("QueryPlan", _timed(CorpusProvider(titles, latency), planned)),
+    ]
+    corpus = {p["href"]: p for p in CorpusProvider(titles, 0).corpus}
+    planned_results = rows[-1][1][2]
+    served = all(len(found) == limit for found in planned_results)
+    correct = all(_satisfies(r, title, skills, corpus)
+                  for (title, skills), found in zip(jobs, planned_results) for r in found)
+
+    print(f"\n🧭 Query planning: {n_jobs} jobs over {titles} titles and {len(SKILL_SETS)} overlapping "
+          f"skill lists, {latency:.2f}s round trip (query cache off)\n")
+    print(f"{'strategy':<28} {'requested':>10} {'issued':>8} {'seconds':>8}")
+    for name, (elapsed, calls, _) in rows:
+        print(f"{name:<28} {n_jobs:>10} {calls:>8} {elapsed:>8.2f}")
+    print(f"\nPlan: {plan.identical} identical, {plan.subsumed} subsumed by a broader query, "
+          f"{plan.reissued} re-issued because too few shared results matched")
+    print(f"{'✅' if served else '❌'} Every job received {limit} results: {served}")
+    print(f"{'✅' if correct else '❌'} Every result has the job's title and one of its skills: {correct}")
+    if not (served and correct):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark - Scout X-Ray searches: sequential with per-result sleeps vs the search subsystem
+Runs one search per job (several jobs share a title, as in a real pipeline) against the
+fixture provider with simulated round-trip latency. The original loop searches one query
+at a time and sleeps 0.3 s after every result; search.search_many dedupes, runs queries
+concurrently under the backend's rate limit, and answers repeat runs from the query cache.
+All delays are scaled by SCALE to keep the run short.
+
+Usage:
+    python benchmarks/bench_search.py [jobs] [distinct_titles] [round_trip_seconds]
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+import search
+from search import FixtureProvider
+
+SCALE = 0.1
+RESULTS_PER_QUERY = 5
+PER_RESULT_SLEEP_SECONDS = 0.3 * SCALE   # the original time.sleep(0.3) after every result
+
+
+def _queries(jobs, titles):
+    return [(f'site:linkedin.com/in/ "Role {i % titles}" ("python" OR "sql") ""', RESULTS_PER_QUERY)
+            for i in range(jobs)]
+
+
+def _sequential(queries, latency):
+    provider = FixtureProvider(latency=latency)
+    start = time.perf_counter()
+    results = []
+    for query, limit in queries:
+        found = provider.text(query, limit)
+        for _ in found:
+            time.sleep(PER_RESULT_SLEEP_SECONDS)
+        results.append(found)
+    return time.perf_counter() - start, provider.calls, results
+
+
+def _subsystem(queries, provider):
+    search.configure(provider)
+    calls_before = provider.calls
+    start = time.perf_counter()
+    results = search.search_many(queries)
+    return time.perf_counter() - start, provider.calls - calls_before, results
+
+
+def main():
+    jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    titles = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+    latency = float(sys.argv[3]) if len(sys.argv) > 3 else 1.0 * SCALE
+    queries = _queries(jobs, titles)
+
+    workdir = tempfile.mkdtemp(prefix="bench_search_")
+    database.DATABASE_PATH = Path(workdir) / "bench.db"
+    try:
+        database.init_database()
+        sequential = _sequential(queries, latency)
+        # Rate limit of 4 requests/s (scaled) shared by all workers
+        provider = FixtureProvider(latency=latency, requests_per_second=4 / SCALE)
+        cold = _subsystem(queries, provider)
+        warm = _subsystem(queries, provider)
+    finally:
+        database.close_connection()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    identical = sequential[2] == cold[2] == warm[2]
+    print(f"\n🔎 Scout searches: {jobs} jobs, {titles} distinct queries, {latency:.2f}s round trip, "
+          f"concurrency {search.SEARCH_CONCURRENCY} (all delays x{SCALE})\n")
+    print(f"{'search':<32} {'seconds':>8} {'backend calls':>14}")
+    for name, (elapsed, calls, _) in (("sequential + per-result sleep", sequential),
+                                      ("search_many (cold cache)", cold),
+                                      ("search_many (warm cache)", warm)):
+        print(f"{name:<32} {elapsed:>8.2f} {calls:>14}")
+    print(f"\n{'✅' if identical else '❌'} Same results: {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark - Job-level sharding of the recruiting loop across worker processes
+Seeds a synthetic database, runs the boardroom serially and with 2-8 shard workers against
+the deterministic fake LLM, checks every sharded run produces the same transcript, matches
+and boardroom decisions as the serial run, and reports wall-clock scaling.
+
+Usage:
+    python benchmarks/bench_sharding.py [jobs] [candidates] [latency_seconds]
+"""
+
+import contextlib
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ["LLM_CACHE_ENABLED"] = "0"
+
+import database
+import llm_cache
+import llm_gateway
+import run_recruiting_loop as boardroom
+from scoring_engine import ScoringEngine
+
+SEED = 11
+SKILLS = ["python", "sql", "react", "aws", "kubernetes", "go", "pandas", "figma", "sales", "rust"]
+WORKER_COUNTS = (1, 2, 4, 8)
+LATENCY = 0.02
+
+
+def _fake_clients():
+    """Worker hook: deterministic fake LLM clients and no web search."""
+    llm_gateway.configure("fake", latency=LATENCY)
+    boardroom.scoring_engine = ScoringEngine(requests_per_minute=0, tokens_per_minute=0)
+    boardroom.search_linkedin_candidates = lambda *args, **kwargs: []
+    llm_cache.CACHE_ENABLED = False
+
+
+def seed_database(path, n_jobs, n_candidates):
+    database.DATABASE_PATH = path
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        database.init_database()
+    rng = random.Random(SEED)
+    for i in range(n_candidates):
+        database.add_candidate(f"Candidate {i}", skills=rng.sample(SKILLS, rng.randint(1, 4)))
+    for i in range(n_jobs):
+        database.add_job(f"Role {i}", f"Company {i % 7}", requirements=rng.sample(SKILLS, 2))
+    database.close_connection()
+
+
+def snapshot(db_path, transcript_path):
+    """Everything a run produces, minus timestamps and generated IDs."""
+    with open(transcript_path, encoding="utf-8") as f:
+        transcript = [line for line in f if not line.startswith("**Date:**")]
+    conn = sqlite3.connect(db_path)
+    matches = sorted(conn.execute("SELECT candidate_id, job_id, score, source FROM matches"))
+    pairs = sorted(conn.execute(
+        "SELECT job_id, candidate_id, jack_score, jill_score, avg_score, decision FROM boardroom_pairs"
+    ))
+    conn.close()
+    return transcript, matches, pairs
+
+
+def run(workers, seed_path, workdir):
+    db_path = os.path.join(workdir, f"run-{workers}.db")
+    shutil.copy(seed_path, db_path)
+    database.close_connection()
+    database.DATABASE_PATH = db_path
+    boardroom.TRANSCRIPT_FILE = os.path.join(workdir, f"negotiation_log-{workers}.md")
+    _fake_clients()
+
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        if workers == 1:
+            boardroom.main([])
+        else:
+            boardroom.start_transcript(False)
+            boardroom.run_sharded(boardroom.parse_args([f"--workers={workers}"]), workers, initializer=_fake_clients)
+            boardroom.close_transcript()
+    elapsed = time.perf_counter() - start
+    database.close_connection()
+    return elapsed, snapshot(db_path, boardroom.TRANSCRIPT_FILE)
+
+
+def main():
+    global LATENCY
+    n_jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    n_candidates = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    LATENCY = float(sys.argv[3]) if len(sys.argv) > 3 else LATENCY
+
+    workdir = tempfile.mkdtemp(prefix="bench_sharding_")
+    try:
+        seed_path = os.path.join(workdir, "seed.db")
+        seed_database(seed_path, n_jobs, n_candidates)
+
+        print(f"\n🧩 Sharded boardroom: {n_jobs} jobs, {n_candidates} candidates, {LATENCY * 1000:.0f} ms fake latency\n")
+        print(f"{'workers':>8} {'seconds':>9} {'speedup':>8} {'identical':>10}")
+        baseline = None
+        all_identical = True
+        for workers in WORKER_COUNTS:
+            elapsed, result = run(workers, seed_path, workdir)
+            if baseline is None:
+                baseline = (elapsed, result)
+            identical = result == baseline[1]
+            all_identical &= identical
+            print(f"{workers:>8} {elapsed:>9.2f} {baseline[0] / elapsed:>7.2f}x {'yes' if identical else 'NO':>10}")
+
+        transcript, matches, pairs = baseline[1]
+        print(f"\n   {len(transcript)} transcript lines, {len(matches)} matches, {len(pairs)} boardroom decisions per run")
+        if not all_identical:
+            print("❌ Sharded output differs from the serial run")
+            sys.exit(1)
+        print("✅ Every sharded run matches the serial run")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
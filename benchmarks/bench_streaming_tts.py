@@ -0,0 +1,63 @@
+"""
+Benchmark - Time-to-first-audio for streamed vs blocking voice turns
+Drives tts.speak_llm_reply against the fake LLM backend (fixed time-to-first-token plus a
+per-token delay) with a fake TTS engine that takes time proportional to the words spoken,
+and compares first-audio and total turn time with and without streaming.
+
+Usage:
+    python benchmarks/bench_streaming_tts.py [turns] [seconds_per_token] [seconds_per_spoken_word]
+"""
+
+import io
+import os
+import sys
+import time
+import contextlib
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import llm_gateway
+from tts import speak_stream, _whole_reply
+
+FIRST_TOKEN_SECONDS = 0.25
+REPLY = (
+    "That sounds like a great background. "
+    "You mentioned leading the migration to Kubernetes, which is exactly the kind of work this team needs. "
+    "How large was the team you worked with, and what was your role in the rollout? "
+    "I'd also love to hear what you would do differently next time. "
+    "Take your time, there's no rush."
+)
+
+
+def _turn(streaming, spoken_word_seconds):
+    def speak(text):
+        time.sleep(spoken_word_seconds * len(text.split()))
+    messages = [{"role": "user", "content": "Tell me about the role."}]
+    chunks = llm_gateway.chat_stream(messages) if streaming else _whole_reply(messages, llm_gateway.MODEL_NAME)
+    with contextlib.redirect_stdout(io.StringIO()):
+        reply, metrics = speak_stream("Jack", chunks, speak, split=streaming)
+    assert reply.strip() == REPLY.strip()
+    return metrics
+
+
+def main():
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    token_seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 0.02
+    spoken_word_seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 0.05
+    llm_gateway.configure("fake", latency=FIRST_TOKEN_SECONDS, token_latency=token_seconds,
+                          responder=lambda messages: REPLY)
+
+    print(f"\n🔊 Voice turn latency: {len(REPLY.split())}-word reply, {FIRST_TOKEN_SECONDS:.2f}s to first token, "
+          f"{token_seconds * 1000:.0f} ms/token, {spoken_word_seconds * 1000:.0f} ms per spoken word\n")
+    print(f"{'mode':<10} {'first audio':>12} {'total':>8} {'sentences':>10}")
+    for streaming in (False, True):
+        runs = [_turn(streaming, spoken_word_seconds) for _ in range(turns)]
+        first_audio = sum(m["first_audio"] for m in runs) / turns
+        total = sum(m["total"] for m in runs) / turns
+        print(f"{'streaming' if streaming else 'blocking':<10} {first_audio:>11.2f}s {total:>7.2f}s {runs[0]['sentences']:>10}")
+    llm_gateway.reset()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark - Per-turn listen overhead: recognizer + microphone + calibration every turn vs one Listener
+The microphone is simulated (no audio device needed): opening it costs a fixed delay,
+calibration consumes its duration in real time like a live stream, and each capture replays
+a generated WAV utterance. Recognition uses the deterministic replay backend.
+
+Usage:
+    python benchmarks/bench_stt_listener.py [turns] [mic_open_seconds]
+"""
+
+import io
+import os
+import sys
+import math
+import time
+import wave
+import struct
+import shutil
+import tempfile
+import contextlib
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import stt
+from stt import Listener, ReplaySource
+
+
+class SimulatedMicrophone(ReplaySource):
+    """ReplaySource with a live microphone's costs: a slow open and real-time calibration."""
+
+    def __init__(self, paths, open_seconds):
+        super().__init__(paths)
+        self.open_seconds = open_seconds
+        self.opens = 0
+        self.calibrations = 0
+
+    def open(self):
+        time.sleep(self.open_seconds)
+        self.opens += 1
+        return self
+
+    def calibrate(self, recognizer, duration):
+        time.sleep(duration)
+        self.calibrations += 1
+
+
+def _write_turns(workdir, turns):
+    for i in range(turns):
+        with wave.open(os.path.join(workdir, f"turn{i:03d}.wav"), "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(16000)
+            w.writeframes(b"".join(struct.pack("<h", int(2000 * math.sin(j / 8))) for j in range(4000)))
+        with open(os.path.join(workdir, f"turn{i:03d}.txt"), "w", encoding="utf-8") as f:
+            f.write(f"answer number {i}")
+
+
+def _per_turn_setup(workdir, turns, open_seconds):
+    """The original listen(): a new recognizer, microphone and calibration for every turn."""
+    paths = sorted(os.path.join(workdir, p) for p in os.listdir(workdir) if p.endswith(".wav"))
+    texts, totals, mic = [], [], None
+    for i in range(turns):
+        start = time.perf_counter()
+        mic = SimulatedMicrophone(paths[i:i + 1], open_seconds)
+        listener = Listener(backend="replay", source=mic)
+        listener.open()
+        texts.append(listener.listen())
+        totals.append(time.perf_counter() - start)
+    return texts, totals
+
+
+def _persistent(workdir, turns, open_seconds):
+    mic = SimulatedMicrophone(workdir, open_seconds)
+    listener = Listener(backend="replay", source=mic)
+    listener.open()
+    texts, totals = [], []
+    for _ in range(turns):
+        start = time.perf_counter()
+        texts.append(listener.listen())
+        totals.append(time.perf_counter() - start)
+    return texts, totals, mic
+
+
+def main():
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    open_seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    workdir = tempfile.mkdtemp(prefix="bench_stt_")
+    try:
+        _write_turns(workdir, turns)
+        with contextlib.redirect_stdout(io.StringIO()):
+            fresh_texts, fresh = _per_turn_setup(workdir, turns, open_seconds)
+            kept_texts, kept, mic = _persistent(workdir, turns, open_seconds)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"\n🎙️ Listen overhead: {turns} turns, mic open {open_seconds * 1000:.0f} ms, "
+          f"calibration {stt.CALIBRATION_SECONDS * 1000:.0f} ms\n")
+    print(f"{'listener':<26} {'ms/turn':>9}")
+    print(f"{'new mic + calibrate/turn':<26} {sum(fresh) / turns * 1000:>9.1f}")
+    print(f"{'persistent Listener':<26} {sum(kept) / turns * 1000:>9.1f}   "
+          f"({mic.opens} open, {mic.calibrations} calibration)")
+    print(f"\n{'✅' if fresh_texts == kept_texts else '❌'} Same transcripts: {fresh_texts == kept_texts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark - Transcript writes: open/append/close per line vs the buffered TranscriptSink
+Reports the time the caller spends per utterance (what the LLM loop waits for), the total
+time until everything is on disk, and how many disk writes each approach needs.
+
+Usage:
+    python benchmarks/bench_transcript.py [lines]
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import time
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transcript import TranscriptSink
+
+
+def _naive(path, lines):
+    """The original log_to_transcript: one open/write/close per utterance."""
+    start = time.perf_counter()
+    for speaker, text in lines:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(f"**{speaker}**: {text}\n\n")
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed, len(lines)
+
+
+def _sink(path, lines, jsonl):
+    start = time.perf_counter()
+    sink = TranscriptSink(path, jsonl=jsonl, echo=False)
+    for speaker, text in lines:
+        sink.write(speaker, text)
+    enqueued = time.perf_counter() - start
+    sink.close()
+    return enqueued, time.perf_counter() - start, sink.disk_writes
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    lines = [("Jack" if i % 2 else "Jill", f"Utterance {i}: " + "lorem ipsum " * 8) for i in range(n)]
+    workdir = tempfile.mkdtemp(prefix="bench_transcript_")
+    try:
+        results = [
+            ("open/append/close", _naive(os.path.join(workdir, "naive.md"), lines)),
+            ("TranscriptSink", _sink(os.path.join(workdir, "sink.md"), lines, jsonl=False)),
+            ("TranscriptSink + JSONL", _sink(os.path.join(workdir, "sink_jsonl.md"), lines, jsonl=True)),
+        ]
+        with open(os.path.join(workdir, "naive.md"), encoding="utf-8") as a, \
+                open(os.path.join(workdir, "sink.md"), encoding="utf-8") as b:
+            identical = a.read() == b.read()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"\n📝 Transcript writes: {n} utterances\n")
+    print(f"{'writer':<24} {'caller µs/line':>15} {'total s':>9} {'disk writes':>12}")
+    for name, (caller, total, writes) in results:
+        print(f"{name:<24} {caller / n * 1e6:>15.2f} {total:>9.2f} {writes:>12}")
+    print(f"\n{'✅' if identical else '❌'} Markdown output identical: {identical}")
+
+
+if __name__ == "__main__":
+    main()
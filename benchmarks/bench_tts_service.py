@@ -0,0 +1,142 @@
+"""
+Benchmark - Per-utterance TTS setup: fresh engine per speak() vs the long-lived SpeechService
+Uses a fake engine whose init and voice enumeration cost what a real driver typically does,
+and whose speech takes time per word, then reports setup overhead per utterance, how long
+speak_async takes to return, and how quickly cancel() silences a queued backlog.
+
+Usage:
+    python benchmarks/bench_tts_service.py [utterances] [init_seconds] [voice_list_seconds]
+"""
+
+import io
+import os
+import sys
+import time
+import contextlib
+from types import SimpleNamespace
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tts
+from tts import SpeechService, clean_for_speech
+
+SPOKEN_WORD_SECONDS = 0.002
+LINES = [
+    "Thanks for joining me today! *smiles*",
+    "## Tell me about a project you're proud of.",
+    "- What was the hardest part, and how did you handle it?",
+    "That sounds like a great fit for the team.",
+]
+
+
+class FakeEngine:
+    """pyttsx3-shaped engine with a configurable start-up and voice-listing cost."""
+
+    def __init__(self, init_seconds, voice_list_seconds):
+        time.sleep(init_seconds)
+        self.voice_list_seconds = voice_list_seconds
+        self.pending = []
+        self.stopped = False
+        self.spoken = []
+        self.callbacks = {}
+
+    def getProperty(self, name):
+        if name == "voices":
+            time.sleep(self.voice_list_seconds)
+            return [SimpleNamespace(id=f"voice-{i}", name=n)
+                    for i, n in enumerate(["Microsoft Hazel", "Microsoft David", "Microsoft Zira"])]
+        return 200
+
+    def setProperty(self, name, value):
+        pass
+
+    def say(self, text):
+        self.pending.append(text)
+
+    def connect(self, topic, callback):
+        self.callbacks.setdefault(topic, []).append(callback)
+
+    def runAndWait(self):
+        # Like pyttsx3, word callbacks fire on the thread running the loop, which may stop it
+        self.stopped = False
+        for text in self.pending:
+            location = 0
+            for word in text.split():
+                for callback in self.callbacks.get("started-word", []):
+                    callback(None, location, len(word))
+                if self.stopped:
+                    break
+                time.sleep(SPOKEN_WORD_SECONDS)
+                location += len(word) + 1
+            self.spoken.append(text)
+        self.pending = []
+
+    def stop(self):
+        self.stopped = True
+
+
+def _fake_factory(init_seconds, voice_list_seconds):
+    def factory(voice_keywords=()):
+        engine = FakeEngine(init_seconds, voice_list_seconds)
+        voice_id = tts.find_voice(engine, voice_keywords)
+        if voice_id:
+            engine.setProperty("voice", voice_id)
+        return engine
+    return factory
+
+
+def _fresh_engine_per_call(n, init_seconds, voice_list_seconds):
+    """The original speak(): init, enumerate voices, pick one, speak - for every utterance."""
+    total = 0.0
+    for i in range(n):
+        start = time.perf_counter()
+        engine = FakeEngine(init_seconds, voice_list_seconds)
+        next((v.id for v in engine.getProperty("voices") if "david" in v.name.lower()), None)
+        total += time.perf_counter() - start
+        engine.say(clean_for_speech(LINES[i % len(LINES)]))
+        engine.runAndWait()
+    return total / n
+
+
+def _service(n, init_seconds, voice_list_seconds):
+    tts._voice_cache.clear()
+    speech = SpeechService(("david", "male"), engine_factory=_fake_factory(init_seconds, voice_list_seconds))
+    speech.start()
+    for i in range(n):
+        speech.speak(LINES[i % len(LINES)])
+    per_utterance = speech.stats["queue_wait_seconds"] / speech.stats["utterances"]
+
+    # Non-blocking enqueue, then barge-in on a backlog
+    start = time.perf_counter()
+    handles = [speech.speak_async(LINES[i % len(LINES)] * 20) for i in range(n)]
+    enqueue = (time.perf_counter() - start) / n
+    start = time.perf_counter()
+    speech.cancel()
+    handles[-1].wait()
+    silenced = time.perf_counter() - start
+    dropped = sum(h.cancelled for h in handles)
+    speech.close()
+    return per_utterance, speech.stats["setup_seconds"], enqueue, silenced, dropped
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    init_seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 0.15
+    voice_list_seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 0.05
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        fresh = _fresh_engine_per_call(n, init_seconds, voice_list_seconds)
+        service, setup, enqueue, silenced, dropped = _service(n, init_seconds, voice_list_seconds)
+
+    print(f"\n🔊 TTS setup: {n} utterances, engine init {init_seconds * 1000:.0f} ms, "
+          f"voice listing {voice_list_seconds * 1000:.0f} ms\n")
+    print(f"{'speaker':<24} {'setup ms/utterance':>19}")
+    print(f"{'fresh engine per call':<24} {fresh * 1000:>19.2f}")
+    print(f"{'SpeechService':<24} {service * 1000:>19.2f}   (one-time start-up {setup * 1000:.0f} ms)")
+    print(f"\nspeak_async returns in {enqueue * 1e6:.0f} µs; cancel() silenced a {n}-utterance backlog "
+          f"in {silenced * 1000:.1f} ms ({dropped} dropped unspoken)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Query Plan Check
+Runs the hot read paths in database.py against a seeded throwaway database, captures
+the SQL they execute and fails if any of them full-scans or sorts a table.
+
+Usage:
+    python benchmarks/check_query_plans.py
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+
+# Read paths that must be served from an index
+HOT_PATHS = {
+    "get_matches_for_job": lambda ids: database.get_matches_for_job(ids["job_id"]),
+    "get_matches_for_candidate": lambda ids: database.get_matches_for_candidate(ids["candidate_id"]),
+    "get_agent_messages(unread_only)": lambda ids: database.get_agent_messages("Jack", unread_only=True),
+    "get_pending_outreach": lambda ids: database.get_pending_outreach(),
+    "iter_candidates": lambda ids: list(database.iter_candidates(batch_size=20)),
+    "iter_jobs": lambda ids: list(database.iter_jobs(batch_size=4)),
+}
+
+
+def _seed():
+    candidate_ids = [database.add_candidate(f"Candidate {i}") for i in range(50)]
+    job_ids = [database.add_job(f"Role {i}", "Co") for i in range(10)]
+    database.add_matches_bulk(
+        {"candidate_id": c, "job_id": j, "score": 0.5}
+        for c in candidate_ids for j in job_ids
+    )
+    database.send_agent_messages_bulk(
+        {"from_agent": "Scout", "to_agent": agent, "message_type": "seed", "content": "x"}
+        for agent in ("Jack", "Jill") for _ in range(200)
+    )
+    database.queue_outreach_bulk(
+        {"target_type": "candidate", "target_name": f"P{i}", "message": "Hi"}
+        for i in range(200)
+    )
+    database.get_connection().execute("ANALYZE")
+    return {"candidate_id": candidate_ids[0], "job_id": job_ids[0]}
+
+
+def _capture_sql(fn, ids):
+    statements = []
+    conn = database.get_connection()
+    conn.set_trace_callback(statements.append)
+    try:
+        fn(ids)
+    finally:
+        conn.set_trace_callback(None)
+    return [sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]
+
+
+def main():
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DATABASE_PATH = Path(tmp) / "plans.db"
+        database.init_database()
+        ids = _seed()
+        conn = database.get_connection()
+
+        for name, fn in HOT_PATHS.items():
+            print(f"\n🔍 {name}")
+            for sql in _capture_sql(fn, ids):
+                plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+                for detail in plan:
+                    bad = (detail.startswith("SCAN") and "USING" not in detail) or "TEMP B-TREE" in detail
+                    print(f"   {'❌' if bad else '✓'} {detail}")
+                    failures += bad
+
+        database.close_connection()
+
+    print("\n" + "-" * 60)
+    if failures:
+        print(f"❌ {failures} full scan(s)/sort(s) found on hot paths")
+        sys.exit(1)
+    print("✅ All hot paths are index-backed")
+
+
+if __name__ == "__main__":
+    main()
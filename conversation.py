@@ -0,0 +1,132 @@
+"""
+Conversation - Token-budgeted chat history for long voice interviews
+Keeps the system prompt, pinned context (job requirements, CV) and the most recent turns
+verbatim, and folds older turns into a running summary whenever the prompt would exceed
+its token budget, so a long interview's per-turn prompt stays flat instead of growing
+with every exchange. The full, uncompacted history is kept for the final documents.
+"""
+
+import os
+
+import llm_gateway
+from scoring_engine import estimate_tokens
+
+# Prompt size (estimated tokens) above which older turns are folded into the summary
+CONVERSATION_TOKEN_BUDGET = int(os.getenv("CONVERSATION_TOKEN_BUDGET", "8000"))
+# Most recent messages that are always sent verbatim (3 user/assistant exchanges)
+CONVERSATION_KEEP_RECENT = int(os.getenv("CONVERSATION_KEEP_RECENT", "6"))
+# After compacting, the prompt is brought down to this fraction of the budget so the
+# summary is not rewritten on every following turn
+COMPACT_TARGET_RATIO = 0.6
+
+SUMMARY_PROMPT = """You keep the running notes for a recruiting conversation between {assistant} and {user}.
+Update the notes with the new exchanges below. Keep every concrete fact ({user}'s names, companies, roles,
+dates, numbers, skills, examples, preferences, compensation, location, open questions) and drop small talk.
+Reply with the updated notes only, as short bullet points.
+
+CURRENT NOTES:
+{summary}
+
+NEW EXCHANGES:
+{exchanges}"""
+
+
+def llm_summarize(summary, turns, assistant="Assistant", user="User"):
+    """Fold `turns` into `summary` with one LLM call (the default summarizer)."""
+    exchanges = "\n".join(
+        f"{assistant if m['role'] == 'assistant' else user}: {m['content']}" for m in turns
+    )
+    prompt = SUMMARY_PROMPT.format(assistant=assistant, user=user,
+                                   summary=summary or "(none yet)", exchanges=exchanges)
+    return llm_gateway.chat([{"role": "user", "content": prompt}], temperature=0.2).strip()
+
+
+class ConversationHistory:
+    """
+    Chat history that sends a bounded prompt but remembers everything.
+
+    Usage:
+        history = ConversationHistory(system_prompt, assistant="Jack", user="Candidate")
+        history.add("user", "CONTEXT: ...", pin=True)     # always sent verbatim
+        history.add("user", user_input)
+        reply = chat(history.prompt_messages())           # compacted to the budget
+        history.add("assistant", reply)
+        generate_candidate_profile(history.full_messages())
+    """
+
+    def __init__(self, system_prompt, budget=CONVERSATION_TOKEN_BUDGET, keep_recent=CONVERSATION_KEEP_RECENT,
+                 summarize=None, assistant="Assistant", user="User"):
+        self.system = {"role": "system", "content": system_prompt}
+        self.budget = budget
+        self.keep_recent = keep_recent
+        self.summarize = summarize or llm_summarize
+        self.assistant = assistant
+        self.user = user
+        self.pinned = []
+        self.turns = []          # every non-pinned message, never dropped
+        self.summary = ""        # covers turns[:self.summarized]
+        self.summarized = 0
+        self.compactions = 0
+        self.stats = []          # one entry per prompt_messages() call
+
+    def add(self, role, content, pin=False):
+        message = {"role": role, "content": content}
+        (self.pinned if pin else self.turns).append(message)
+
+    def full_messages(self):
+        """The whole conversation, uncompacted (for the final profile / job spec)."""
+        return [self.system] + self.pinned + self.turns
+
+    def _messages(self):
+        summary = []
+        if self.summary:
+            summary = [{"role": "system", "content": f"Notes on the earlier part of this conversation:\n{self.summary}"}]
+        return [self.system] + self.pinned + summary + self.turns[self.summarized:]
+
+    def compact(self):
+        """Fold the oldest live turns into the summary until the prompt is back under target."""
+        live = self.turns[self.summarized:]
+        foldable = len(live) - self.keep_recent
+        if foldable <= 0:
+            return False
+
+        target = int(self.budget * COMPACT_TARGET_RATIO)
+        excess = estimate_tokens(self._messages()) - target
+        fold = 0
+        while fold < foldable and excess > 0:
+            excess -= estimate_tokens([live[fold]])
+            fold += 1
+        # Never split an exchange: a user turn is folded together with the reply that follows it
+        if fold < foldable and live[fold]["role"] == "assistant":
+            fold += 1
+
+        try:
+            summary = self.summarize(self.summary, live[:fold], assistant=self.assistant, user=self.user)
+        except Exception as e:
+            print(f"⚠️ Could not summarize conversation history (sending it in full): {e}")
+            return False
+        self.summary = summary
+        self.summarized += fold
+        self.compactions += 1
+        return True
+
+    def prompt_messages(self):
+        """Messages to send for the next reply, compacted to the token budget."""
+        if estimate_tokens(self._messages()) > self.budget:
+            self.compact()
+        messages = self._messages()
+        self.stats.append({
+            "turn": len(self.stats) + 1,
+            "prompt_tokens": estimate_tokens(messages),
+            "full_tokens": estimate_tokens(self.full_messages()),
+            "summarized_turns": self.summarized,
+            "compactions": self.compactions,
+        })
+        return messages
+
+    def format_stats(self):
+        if not self.stats:
+            return "🧮 Context: no prompts sent yet"
+        last = self.stats[-1]
+        return (f"🧮 Context: {last['prompt_tokens']:,} tokens sent (full history {last['full_tokens']:,}, "
+                f"budget {self.budget:,}), {last['summarized_turns']} turn(s) summarized")
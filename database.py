@@ -3,103 +3,627 @@ Database Layer for AI Recruiter Multi-Agent System
 SQLite-based storage for candidates, jobs, matches, and agent communication.
 """
 
+import os
+import re
 import sqlite3
 import json
+import hashlib
+import threading
+import time
 import uuid
-from datetime import datetime
+from contextlib import contextmanager
 from pathlib import Path
+from urllib.parse import urlsplit, unquote
 
 DATABASE_PATH = Path(__file__).parent / "data" / "recruiter.db"
 
-def get_connection():
-    """Get a database connection, creating the database if it doesn't exist."""
-    DATABASE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(DATABASE_PATH)
+# Connection tuning - applied once per pooled connection
+BUSY_TIMEOUT_SECONDS = 30
+STATEMENT_CACHE_SIZE = 256
+
+# ============================================================
+# CONNECTION MANAGER
+# ============================================================
+
+_local = threading.local()
+
+def _open_connection(path):
+    """Open and configure a new long-lived connection."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(
+        path,
+        timeout=BUSY_TIMEOUT_SECONDS,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        isolation_level=None  # Transactions are managed explicitly by transaction()
+    )
     conn.row_factory = sqlite3.Row  # Enable dict-like access
+    # Lets upserts rebuild external_profiles.search_text from merged columns exactly as _search_text() does
+    conn.create_function(
+        'profile_search_text', 3,
+        lambda name, headline, snippet: _search_text({'name': name, 'headline': headline, 'snippet': snippet}),
+        deterministic=True
+    )
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute(f'PRAGMA busy_timeout={BUSY_TIMEOUT_SECONDS * 1000}')
     return conn
 
+def get_connection():
+    """
+    Get this thread's pooled database connection, creating the database if it doesn't exist.
+
+    Connections are opened once per thread (and per process, so forked workers never
+    share a handle) and reused for every call. Do not close the returned connection -
+    use close_connection() when a thread is done with the database.
+    """
+    path = Path(DATABASE_PATH)
+    conn = getattr(_local, 'conn', None)
+    if conn is not None and (_local.path != path or _local.pid != os.getpid()):
+        # DATABASE_PATH was repointed or we are in a forked child - start fresh
+        if _local.pid == os.getpid():
+            conn.close()
+        conn = None
+    if conn is None:
+        conn = _open_connection(path)
+        _local.conn = conn
+        _local.path = path
+        _local.pid = os.getpid()
+        _local.depth = 0
+    return conn
+
+def close_connection():
+    """Close this thread's pooled connection (if any)."""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        if _local.pid == os.getpid():
+            conn.close()
+        _local.conn = None
+        _local.depth = 0
+
+@contextmanager
+def transaction():
+    """
+    Group database work into a single transaction.
+
+    Usage:
+        with transaction() as conn:
+            conn.execute(...)
+            add_match(...)   # joins the surrounding transaction
+
+    Nested transaction() blocks join the outermost one; it commits when the outermost
+    block exits cleanly and rolls back if any exception escapes.
+    """
+    conn = get_connection()
+    if _local.depth == 0:
+        conn.execute('BEGIN IMMEDIATE')
+    _local.depth += 1
+    try:
+        yield conn
+    except BaseException:
+        _local.depth -= 1
+        if _local.depth == 0:
+            conn.rollback()
+        raise
+    else:
+        _local.depth -= 1
+        if _local.depth == 0:
+            conn.commit()
+
 def init_database():
     """Initialize the database schema."""
-    conn = get_connection()
-    cursor = conn.cursor()
+    with transaction() as conn:
+        cursor = conn.cursor()
+        
+        # Candidates table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS candidates (
+                id TEXT PRIMARY KEY,
+                name TEXT,
+                email TEXT,
+                linkedin_url TEXT,
+                profile_file TEXT,
+                skills TEXT,
+                preferences TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Jobs table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                title TEXT,
+                company TEXT,
+                linkedin_url TEXT,
+                spec_file TEXT,
+                requirements TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Matches table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS matches (
+                id TEXT PRIMARY KEY,
+                candidate_id TEXT,
+                job_id TEXT,
+                score REAL,
+                source TEXT,
+                status TEXT DEFAULT 'pending',
+                jack_notes TEXT,
+                jill_notes TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (candidate_id) REFERENCES candidates(id),
+                FOREIGN KEY (job_id) REFERENCES jobs(id)
+            )
+        ''')
+        
+        # Outreach queue table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS outreach_queue (
+                id TEXT PRIMARY KEY,
+                target_type TEXT,
+                target_name TEXT,
+                target_linkedin_url TEXT,
+                message TEXT,
+                status TEXT DEFAULT 'pending',
+                sent_at TIMESTAMP,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Agent messages table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS agent_messages (
+                id TEXT PRIMARY KEY,
+                from_agent TEXT,
+                to_agent TEXT,
+                message_type TEXT,
+                content TEXT,
+                metadata TEXT,
+                read INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Bring existing databases up to the latest schema
+        migrate()
     
-    # Candidates table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS candidates (
-            id TEXT PRIMARY KEY,
-            name TEXT,
-            email TEXT,
-            linkedin_url TEXT,
-            profile_file TEXT,
-            skills TEXT,
-            preferences TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
+    print("✅ Database initialized")
+
+# ============================================================
+# ID GENERATION
+# ============================================================
+
+_CROCKFORD_BASE32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_ulid_lock = threading.Lock()
+_ulid_last = (0, 0)  # (timestamp_ms, randomness) of the last ULID handed out
+
+def generate_ulid():
+    """
+    Generate a ULID: 48-bit millisecond timestamp + 80 random bits, as 26 Crockford base32 chars.
+
+    IDs sort in creation order (so inserts append to the end of the primary key B-tree)
+    and stay monotonic within a millisecond by incrementing the random part; if that ever
+    overflows, the ID moves on to the next millisecond instead of wrapping around.
+
+    IDs are deliberately kept as TEXT rather than 16-byte BLOBs: every ID column and foreign
+    key already holds text (including legacy 8-character IDs, which stay valid without a
+    rewrite), and IDs travel as plain strings through message metadata, transcripts and the
+    agents' JSON. The cost is about 14% more space on agent_messages
+    (see benchmarks/bench_id_generation.py).
+    """
+    global _ulid_last
+    now_ms = int(time.time() * 1000)
+    with _ulid_lock:
+        last_ms, last_rand = _ulid_last
+        if now_ms <= last_ms:
+            now_ms, rand = last_ms, last_rand + 1
+            if rand >> 80:
+                now_ms, rand = last_ms + 1, int.from_bytes(os.urandom(10), 'big')
+        else:
+            rand = int.from_bytes(os.urandom(10), 'big')
+        _ulid_last = (now_ms, rand)
     
-    # Jobs table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS jobs (
-            id TEXT PRIMARY KEY,
-            title TEXT,
-            company TEXT,
-            linkedin_url TEXT,
-            spec_file TEXT,
-            requirements TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    value = (now_ms << 80) | rand
+    chars = []
+    for _ in range(26):
+        chars.append(_CROCKFORD_BASE32[value & 31])
+        value >>= 5
+    return ''.join(reversed(chars))
+
+def generate_short_uuid():
+    """Legacy 8-character random ID (32 bits - collision-prone at volume)."""
+    return str(uuid.uuid4())[:8]
+
+_id_generator = generate_ulid
+
+def set_id_generator(generator):
+    """Swap the function used for new primary keys (e.g. for tests or benchmarks)."""
+    global _id_generator
+    _id_generator = generator
+
+def new_id():
+    """Generate a new primary key with the configured ID generator."""
+    return _id_generator()
+
+# ============================================================
+# SCHEMA MIGRATIONS
+# ============================================================
+
+def _backfill_skill_index(conn):
+    """Populate candidate_skills / job_requirements from the legacy JSON columns."""
+    for row in conn.execute('SELECT id, skills FROM candidates WHERE skills IS NOT NULL').fetchall():
+        _index_terms(conn, 'candidate_skills', 'candidate_id', 'skill_norm', row['id'], _load_json_list(row['skills']))
+    for row in conn.execute('SELECT id, requirements FROM jobs WHERE requirements IS NOT NULL').fetchall():
+        _index_terms(conn, 'job_requirements', 'job_id', 'req_norm', row['id'], _load_json_list(row['requirements']))
+
+# Ordered list of (version, description, steps). Each step is a SQL string or a
+# callable taking the connection. Append new migrations - never edit applied ones.
+MIGRATIONS = [
+    (1, "Indexes for match, inbox and outreach lookups", [
+        'CREATE INDEX IF NOT EXISTS idx_matches_job_score ON matches(job_id, score DESC)',
+        'CREATE INDEX IF NOT EXISTS idx_matches_candidate_score ON matches(candidate_id, score DESC)',
+        'CREATE INDEX IF NOT EXISTS idx_agent_messages_unread ON agent_messages(to_agent, created_at) WHERE read = 0',
+        'CREATE INDEX IF NOT EXISTS idx_outreach_status_created ON outreach_queue(status, created_at)',
+    ]),
+    (2, "Keyset pagination indexes for candidates and jobs", [
+        'CREATE INDEX IF NOT EXISTS idx_candidates_created_id ON candidates(created_at, id)',
+        'CREATE INDEX IF NOT EXISTS idx_jobs_created_id ON jobs(created_at, id)',
+    ]),
+    (3, "Normalized skill/requirement tables with backfill", [
+        '''
+        CREATE TABLE IF NOT EXISTS candidate_skills (
+            candidate_id TEXT NOT NULL,
+            skill_norm TEXT NOT NULL,
+            PRIMARY KEY (skill_norm, candidate_id),
+            FOREIGN KEY (candidate_id) REFERENCES candidates(id)
+        ) WITHOUT ROWID
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_candidate_skills_candidate ON candidate_skills(candidate_id)',
+        '''
+        CREATE TABLE IF NOT EXISTS job_requirements (
+            job_id TEXT NOT NULL,
+            req_norm TEXT NOT NULL,
+            PRIMARY KEY (req_norm, job_id),
+            FOREIGN KEY (job_id) REFERENCES jobs(id)
+        ) WITHOUT ROWID
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_job_requirements_job ON job_requirements(job_id)',
+        _backfill_skill_index,
+    ]),
+    (4, "Persistent LLM response cache", [
+        '''
+        CREATE TABLE IF NOT EXISTS llm_cache (
+            cache_key TEXT PRIMARY KEY,
+            model TEXT,
+            prompt_version TEXT,
+            response TEXT,
+            created_at REAL,
+            last_accessed REAL
         )
-    ''')
-    
-    # Matches table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS matches (
-            id TEXT PRIMARY KEY,
-            candidate_id TEXT,
-            job_id TEXT,
-            score REAL,
-            source TEXT,
-            status TEXT DEFAULT 'pending',
-            jack_notes TEXT,
-            jill_notes TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (candidate_id) REFERENCES candidates(id),
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_llm_cache_last_accessed ON llm_cache(last_accessed)',
+    ]),
+    (5, "Boardroom high-water marks for incremental runs", [
+        '''
+        CREATE TABLE IF NOT EXISTS boardroom_jobs (
+            job_id TEXT PRIMARY KEY,
+            job_hash TEXT,
+            job_updated_at TIMESTAMP,
+            evaluated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (job_id) REFERENCES jobs(id)
         )
-    ''')
-    
-    # Outreach queue table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS outreach_queue (
-            id TEXT PRIMARY KEY,
-            target_type TEXT,
-            target_name TEXT,
-            target_linkedin_url TEXT,
-            message TEXT,
-            status TEXT DEFAULT 'pending',
-            sent_at TIMESTAMP,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS boardroom_pairs (
+            job_id TEXT NOT NULL,
+            candidate_id TEXT NOT NULL,
+            job_hash TEXT,
+            candidate_hash TEXT,
+            candidate_updated_at TIMESTAMP,
+            jack_score REAL,
+            jill_score REAL,
+            avg_score REAL,
+            decision TEXT,
+            evaluated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (job_id, candidate_id),
+            FOREIGN KEY (job_id) REFERENCES jobs(id),
+            FOREIGN KEY (candidate_id) REFERENCES candidates(id)
         )
-    ''')
-    
-    # Agent messages table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS agent_messages (
+        ''',
+    ]),
+    (6, "Persistent web search query cache", [
+        '''
+        CREATE TABLE IF NOT EXISTS search_cache (
+            cache_key TEXT PRIMARY KEY,
+            backend TEXT,
+            query TEXT,
+            max_results INTEGER,
+            results TEXT,
+            created_at REAL
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_search_cache_created ON search_cache(created_at)',
+    ]),
+    (7, "Deduplicated external (LinkedIn) profiles with provenance", [
+        '''
+        CREATE TABLE IF NOT EXISTS external_profiles (
             id TEXT PRIMARY KEY,
-            from_agent TEXT,
-            to_agent TEXT,
-            message_type TEXT,
-            content TEXT,
-            metadata TEXT,
-            read INTEGER DEFAULT 0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            url_norm TEXT NOT NULL UNIQUE,
+            kind TEXT NOT NULL,
+            linkedin_url TEXT,
+            name TEXT,
+            headline TEXT,
+            snippet TEXT,
+            search_text TEXT,
+            times_seen INTEGER DEFAULT 1,
+            first_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
-    ''')
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_external_profiles_kind_seen ON external_profiles(kind, last_seen_at)',
+        '''
+        CREATE TABLE IF NOT EXISTS external_profile_sources (
+            profile_id TEXT NOT NULL,
+            source_type TEXT NOT NULL,
+            source_id TEXT NOT NULL,
+            first_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (profile_id, source_type, source_id),
+            FOREIGN KEY (profile_id) REFERENCES external_profiles(id)
+        ) WITHOUT ROWID
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_external_profile_sources_source ON external_profile_sources(source_type, source_id)',
+    ]),
+    (8, "One negotiation win per candidate/job pair", [
+        # Keep only the latest win of pairs that incremental runs re-evaluated
+        '''
+        DELETE FROM matches
+        WHERE source = 'negotiation_win' AND rowid NOT IN (
+            SELECT MAX(rowid) FROM matches WHERE source = 'negotiation_win' GROUP BY candidate_id, job_id
+        )
+        ''',
+        '''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_matches_negotiation_win
+        ON matches(candidate_id, job_id) WHERE source = 'negotiation_win'
+        ''',
+    ]),
+]
+
+def get_schema_version():
+    """Return the highest applied migration version (0 for a fresh database)."""
+    conn = get_connection()
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'"
+    ).fetchone()
+    if not exists:
+        return 0
+    row = conn.execute('SELECT MAX(version) FROM schema_version').fetchone()
+    return row[0] or 0
+
+def migrate():
+    """Apply any pending migrations in order. Safe to run repeatedly."""
+    with transaction() as conn:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description TEXT,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        current = get_schema_version()
+        
+        for version, description, steps in MIGRATIONS:
+            if version <= current:
+                continue
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute(
+                'INSERT INTO schema_version (version, description) VALUES (?, ?)',
+                (version, description)
+            )
+            print(f"   ⬆️ Applied migration {version}: {description}")
+
+# ============================================================
+# SKILL INDEX
+# ============================================================
+
+def normalize_skill(skill):
+    """Normalize a skill/requirement for indexing: lowercase, single-spaced, trimmed."""
+    return " ".join(str(skill).lower().split())
+
+def _load_json_list(value):
+    """Decode a JSON list column, tolerating malformed legacy values."""
+    try:
+        items = json.loads(value) if value else []
+    except (TypeError, ValueError):
+        return []
+    return items if isinstance(items, list) else []
+
+def _index_terms(conn, table, owner_column, term_column, owner_id, terms):
+    """Replace the normalized terms indexed for one candidate/job."""
+    conn.execute(f'DELETE FROM {table} WHERE {owner_column} = ?', (owner_id,))
+    normalized = {normalize_skill(t) for t in terms or []}
+    normalized.discard("")
+    conn.executemany(
+        f'INSERT INTO {table} ({owner_column}, {term_column}) VALUES (?, ?)',
+        [(owner_id, term) for term in sorted(normalized)]
+    )
+
+def get_candidate_skills(candidate_id):
+    """Get a candidate's normalized skills."""
+    conn = get_connection()
+    rows = conn.execute(
+        'SELECT skill_norm FROM candidate_skills WHERE candidate_id = ? ORDER BY skill_norm', (candidate_id,)
+    ).fetchall()
+    return [row[0] for row in rows]
+
+def get_job_requirements(job_id):
+    """Get a job's normalized requirements."""
+    conn = get_connection()
+    rows = conn.execute(
+        'SELECT req_norm FROM job_requirements WHERE job_id = ? ORDER BY req_norm', (job_id,)
+    ).fetchall()
+    return [row[0] for row in rows]
+
+def find_candidates_by_skills(skills, min_overlap=1, limit=None):
+    """
+    Find candidates sharing at least `min_overlap` skills with the given list.
+
+    Returns:
+        Candidate dicts with an extra 'overlap' count, best overlap first
+    """
+    terms = sorted({normalize_skill(s) for s in skills or []} - {""})
+    if not terms:
+        return []
     
-    conn.commit()
-    conn.close()
-    print("✅ Database initialized")
+    placeholders = ", ".join("?" for _ in terms)
+    query = f'''
+        SELECT c.*, s.overlap
+        FROM (
+            SELECT candidate_id, COUNT(*) AS overlap
+            FROM candidate_skills
+            WHERE skill_norm IN ({placeholders})
+            GROUP BY candidate_id
+            HAVING COUNT(*) >= ?
+        ) s
+        JOIN candidates c ON c.id = s.candidate_id
+        ORDER BY s.overlap DESC, c.created_at, c.id
+    '''
+    params = terms + [min_overlap]
+    if limit:
+        query += ' LIMIT ?'
+        params.append(limit)
+    
+    conn = get_connection()
+    rows = conn.execute(query, params).fetchall()
+    return [dict(row) for row in rows]
+
+def find_candidate_ids_by_skills(skills, min_overlap=1):
+    """
+    IDs of candidates sharing at least `min_overlap` skills with the given list.
+    Reads only the skill index (no candidate rows), for prefilters that just need membership.
+    """
+    terms = sorted({normalize_skill(s) for s in skills or []} - {""})
+    if not terms:
+        return set()
+    conn = get_connection()
+    rows = conn.execute(f'''
+        SELECT candidate_id
+        FROM candidate_skills
+        WHERE skill_norm IN ({", ".join("?" for _ in terms)})
+        GROUP BY candidate_id
+        HAVING COUNT(*) >= ?
+    ''', terms + [min_overlap])
+    return {row[0] for row in rows}
+
+def find_jobs_by_requirements(skills, min_overlap=1, limit=None):
+    """
+    Find jobs requiring at least `min_overlap` of the given skills.
+
+    Returns:
+        Job dicts with an extra 'overlap' count, best overlap first
+    """
+    terms = sorted({normalize_skill(s) for s in skills or []} - {""})
+    if not terms:
+        return []
+    
+    placeholders = ", ".join("?" for _ in terms)
+    query = f'''
+        SELECT j.*, r.overlap
+        FROM (
+            SELECT job_id, COUNT(*) AS overlap
+            FROM job_requirements
+            WHERE req_norm IN ({placeholders})
+            GROUP BY job_id
+            HAVING COUNT(*) >= ?
+        ) r
+        JOIN jobs j ON j.id = r.job_id
+        ORDER BY r.overlap DESC, j.created_at, j.id
+    '''
+    params = terms + [min_overlap]
+    if limit:
+        query += ' LIMIT ?'
+        params.append(limit)
+    
+    conn = get_connection()
+    rows = conn.execute(query, params).fetchall()
+    return [dict(row) for row in rows]
+
+# ============================================================
+# STREAMING READS
+# ============================================================
+
+DEFAULT_BATCH_SIZE = 500
+
+# Columns that iter_candidates / iter_jobs accept as equality filters
+CANDIDATE_FILTER_COLUMNS = {'name', 'email', 'linkedin_url', 'profile_file'}
+JOB_FILTER_COLUMNS = {'title', 'company', 'linkedin_url', 'spec_file'}
+
+def _iter_rows(table, allowed_filters, batch_size, since, filters):
+    """
+    Yield rows of `table` lazily, oldest first, using keyset pagination on (created_at, id).
+
+    Only one batch is held in memory at a time and no cursor is left open between
+    batches, so callers may write to the database while iterating.
+    """
+    conditions = []
+    params = []
+    
+    if since is not None:
+        conditions.append('created_at >= ?')
+        params.append(since)
+    for column, value in (filters or {}).items():
+        if column not in allowed_filters:
+            raise ValueError(f"Cannot filter {table} on column: {column}")
+        conditions.append(f'{column} = ?')
+        params.append(value)
+    
+    last_key = None
+    conn = get_connection()
+    while True:
+        page_conditions = list(conditions)
+        page_params = list(params)
+        if last_key is not None:
+            page_conditions.append('(created_at, id) > (?, ?)')
+            page_params.extend(last_key)
+        
+        where = f"WHERE {' AND '.join(page_conditions)}" if page_conditions else ''
+        rows = conn.execute(
+            f'SELECT * FROM {table} {where} ORDER BY created_at, id LIMIT ?',
+            page_params + [batch_size]
+        ).fetchall()
+        
+        for row in rows:
+            yield dict(row)
+        if len(rows) < batch_size:
+            return
+        last_key = (rows[-1]['created_at'], rows[-1]['id'])
+
+# Index new candidates/jobs in the local embedding index as they are inserted - on by
+# default only when the boardroom/Scout shortlist with it (SHORTLIST_RANKER=embedding)
+EMBEDDING_INDEX_ON_INSERT = os.getenv(
+    "EMBEDDING_INDEX_ON_INSERT", "1" if os.getenv("SHORTLIST_RANKER") == "embedding" else "0"
+) != "0"
+
+def _index_embedding(kind, row):
+    """Add a new candidate/job to the local embedding index - a failure never undoes the insert."""
+    if not EMBEDDING_INDEX_ON_INSERT:
+        return
+    try:
+        import embedding_index
+        if kind == 'candidate':
+            embedding_index.index_candidate(row)
+        else:
+            embedding_index.index_job(row)
+    except Exception as e:
+        print(f"   ⚠️ Embedding index not updated for {kind} {row['id']}: {e}")
 
 # ============================================================
 # CANDIDATE OPERATIONS
@@ -107,143 +631,189 @@ def init_database():
 
 def add_candidate(name, email=None, linkedin_url=None, profile_file=None, skills=None, preferences=None):
     """Add a new candidate to the database."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    candidate_id = str(uuid.uuid4())[:8]
-    cursor.execute('''
-        INSERT INTO candidates (id, name, email, linkedin_url, profile_file, skills, preferences)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        candidate_id,
-        name,
-        email,
-        linkedin_url,
-        profile_file,
-        json.dumps(skills) if skills else None,
-        json.dumps(preferences) if preferences else None
-    ))
-    
-    conn.commit()
-    conn.close()
+    candidate_id = new_id()
+    with transaction() as conn:
+        conn.execute('''
+            INSERT INTO candidates (id, name, email, linkedin_url, profile_file, skills, preferences)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            candidate_id,
+            name,
+            email,
+            linkedin_url,
+            profile_file,
+            json.dumps(skills) if skills else None,
+            json.dumps(preferences) if preferences else None
+        ))
+        _index_terms(conn, 'candidate_skills', 'candidate_id', 'skill_norm', candidate_id, skills)
+    _index_embedding('candidate', get_candidate(candidate_id))
     return candidate_id
 
 def get_candidate(candidate_id):
     """Get a candidate by ID."""
     conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM candidates WHERE id = ?', (candidate_id,))
-    row = cursor.fetchone()
-    conn.close()
+    row = conn.execute('SELECT * FROM candidates WHERE id = ?', (candidate_id,)).fetchone()
     return dict(row) if row else None
 
 def get_all_candidates():
     """Get all candidates."""
     conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM candidates ORDER BY created_at DESC')
-    rows = cursor.fetchall()
-    conn.close()
+    rows = conn.execute('SELECT * FROM candidates ORDER BY created_at DESC').fetchall()
     return [dict(row) for row in rows]
 
+def iter_candidates(batch_size=DEFAULT_BATCH_SIZE, since=None, filters=None):
+    """
+    Stream candidates oldest first without loading the whole table.
+
+    Args:
+        batch_size: Rows fetched per round trip
+        since: Only yield candidates created at or after this timestamp
+        filters: Optional dict of column -> value equality filters
+    """
+    return _iter_rows('candidates', CANDIDATE_FILTER_COLUMNS, batch_size, since, filters)
+
+def count_candidates():
+    """Count all candidates."""
+    conn = get_connection()
+    return conn.execute('SELECT COUNT(*) FROM candidates').fetchone()[0]
+
 # ============================================================
 # JOB OPERATIONS
 # ============================================================
 
 def add_job(title, company, linkedin_url=None, spec_file=None, requirements=None):
     """Add a new job to the database."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    job_id = str(uuid.uuid4())[:8]
-    cursor.execute('''
-        INSERT INTO jobs (id, title, company, linkedin_url, spec_file, requirements)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', (
-        job_id,
-        title,
-        company,
-        linkedin_url,
-        spec_file,
-        json.dumps(requirements) if requirements else None
-    ))
-    
-    conn.commit()
-    conn.close()
+    job_id = new_id()
+    with transaction() as conn:
+        conn.execute('''
+            INSERT INTO jobs (id, title, company, linkedin_url, spec_file, requirements)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (
+            job_id,
+            title,
+            company,
+            linkedin_url,
+            spec_file,
+            json.dumps(requirements) if requirements else None
+        ))
+        _index_terms(conn, 'job_requirements', 'job_id', 'req_norm', job_id, requirements)
+    _index_embedding('job', get_job(job_id))
     return job_id
 
 def get_job(job_id):
     """Get a job by ID."""
     conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM jobs WHERE id = ?', (job_id,))
-    row = cursor.fetchone()
-    conn.close()
+    row = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
     return dict(row) if row else None
 
 def get_all_jobs():
     """Get all jobs."""
     conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM jobs ORDER BY created_at DESC')
-    rows = cursor.fetchall()
-    conn.close()
+    rows = conn.execute('SELECT * FROM jobs ORDER BY created_at DESC').fetchall()
     return [dict(row) for row in rows]
 
+def iter_jobs(batch_size=DEFAULT_BATCH_SIZE, since=None, filters=None):
+    """
+    Stream jobs oldest first without loading the whole table.
+
+    Args:
+        batch_size: Rows fetched per round trip
+        since: Only yield jobs created at or after this timestamp
+        filters: Optional dict of column -> value equality filters
+    """
+    return _iter_rows('jobs', JOB_FILTER_COLUMNS, batch_size, since, filters)
+
+def count_jobs():
+    """Count all jobs."""
+    conn = get_connection()
+    return conn.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+
 # ============================================================
 # MATCH OPERATIONS
 # ============================================================
 
 def add_match(candidate_id, job_id, score, source='jack_jill'):
-    """Add a new match to the database."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    match_id = str(uuid.uuid4())[:8]
-    cursor.execute('''
+    """Add a new match to the database (a repeat negotiation win updates the existing one). Returns its ID."""
+    with transaction() as conn:
+        return _insert_matches(conn, [(new_id(), candidate_id, job_id, score, source)])[0]
+
+def add_matches_bulk(matches):
+    """
+    Add many matches in a single transaction.
+    A negotiation win for a pair that already has one updates that row's score instead.
+
+    Args:
+        matches: Iterable of dicts with candidate_id, job_id, score and optional source
+
+    Returns:
+        List of match IDs, in input order (an updated win keeps its existing ID)
+    """
+    rows = []
+    for m in matches:
+        rows.append((new_id(), m['candidate_id'], m['job_id'], m['score'], m.get('source', 'jack_jill')))
+    if not rows:
+        return []
+    with transaction() as conn:
+        return _insert_matches(conn, rows)
+
+def _insert_matches(conn, rows):
+    """Insert (id, candidate_id, job_id, score, source) rows, upserting negotiation wins; returns stored IDs."""
+    conn.executemany('''
         INSERT INTO matches (id, candidate_id, job_id, score, source)
         VALUES (?, ?, ?, ?, ?)
-    ''', (match_id, candidate_id, job_id, score, source))
-    
-    conn.commit()
-    conn.close()
-    return match_id
+        ON CONFLICT(candidate_id, job_id) WHERE source = 'negotiation_win'
+        DO UPDATE SET score = excluded.score
+    ''', rows)
+    ids = []
+    for match_id, candidate_id, job_id, _, source in rows:
+        if source == 'negotiation_win':
+            # The generated ID was discarded if the pair already had a win
+            match_id = conn.execute(
+                "SELECT id FROM matches WHERE candidate_id = ? AND job_id = ? AND source = 'negotiation_win'",
+                (candidate_id, job_id)
+            ).fetchone()[0]
+        ids.append(match_id)
+    return ids
+
+def delete_matches(job_id, candidate_ids, source):
+    """Delete a job's matches from one source for the given candidates. Returns rows deleted."""
+    candidate_ids = list(candidate_ids)
+    deleted = 0
+    with transaction() as conn:
+        for start in range(0, len(candidate_ids), _IN_CHUNK):
+            chunk = candidate_ids[start:start + _IN_CHUNK]
+            deleted += conn.execute(f'''
+                DELETE FROM matches
+                WHERE job_id = ? AND source = ? AND candidate_id IN ({", ".join("?" * len(chunk))})
+            ''', [job_id, source, *chunk]).rowcount
+    return deleted
 
 def get_matches_for_job(job_id):
     """Get all matches for a specific job."""
     conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
+    rows = conn.execute('''
         SELECT m.*, c.name as candidate_name, c.linkedin_url as candidate_linkedin
         FROM matches m
         JOIN candidates c ON m.candidate_id = c.id
         WHERE m.job_id = ?
         ORDER BY m.score DESC
-    ''', (job_id,))
-    rows = cursor.fetchall()
-    conn.close()
+    ''', (job_id,)).fetchall()
     return [dict(row) for row in rows]
 
 def get_matches_for_candidate(candidate_id):
     """Get all matches for a specific candidate."""
     conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
+    rows = conn.execute('''
         SELECT m.*, j.title as job_title, j.company
         FROM matches m
         JOIN jobs j ON m.job_id = j.id
         WHERE m.candidate_id = ?
         ORDER BY m.score DESC
-    ''', (candidate_id,))
-    rows = cursor.fetchall()
-    conn.close()
+    ''', (candidate_id,)).fetchall()
     return [dict(row) for row in rows]
 
 def update_match_status(match_id, status, jack_notes=None, jill_notes=None):
     """Update a match's status and notes."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
     updates = ['status = ?']
     params = [status]
     
@@ -255,10 +825,8 @@ def update_match_status(match_id, status, jack_notes=None, jill_notes=None):
         params.append(jill_notes)
     
     params.append(match_id)
-    cursor.execute(f'UPDATE matches SET {", ".join(updates)} WHERE id = ?', params)
-    
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute(f'UPDATE matches SET {", ".join(updates)} WHERE id = ?', params)
 
 # ============================================================
 # OUTREACH QUEUE OPERATIONS
@@ -266,39 +834,55 @@ def update_match_status(match_id, status, jack_notes=None, jill_notes=None):
 
 def queue_outreach(target_type, target_name, target_linkedin_url, message):
     """Add an outreach message to the queue."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    outreach_id = str(uuid.uuid4())[:8]
-    cursor.execute('''
-        INSERT INTO outreach_queue (id, target_type, target_name, target_linkedin_url, message)
-        VALUES (?, ?, ?, ?, ?)
-    ''', (outreach_id, target_type, target_name, target_linkedin_url, message))
-    
-    conn.commit()
-    conn.close()
+    outreach_id = new_id()
+    with transaction() as conn:
+        conn.execute('''
+            INSERT INTO outreach_queue (id, target_type, target_name, target_linkedin_url, message)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (outreach_id, target_type, target_name, target_linkedin_url, message))
     return outreach_id
 
+def queue_outreach_bulk(items):
+    """
+    Add many outreach messages to the queue in a single transaction.
+
+    Args:
+        items: Iterable of dicts with target_type, target_name, target_linkedin_url and message
+
+    Returns:
+        List of generated outreach IDs, in input order
+    """
+    rows = []
+    for item in items:
+        rows.append((
+            new_id(),
+            item['target_type'],
+            item['target_name'],
+            item.get('target_linkedin_url'),
+            item['message']
+        ))
+    if rows:
+        with transaction() as conn:
+            conn.executemany('''
+                INSERT INTO outreach_queue (id, target_type, target_name, target_linkedin_url, message)
+                VALUES (?, ?, ?, ?, ?)
+            ''', rows)
+    return [row[0] for row in rows]
+
 def get_pending_outreach():
     """Get all pending outreach messages."""
     conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM outreach_queue WHERE status = "pending" ORDER BY created_at')
-    rows = cursor.fetchall()
-    conn.close()
+    rows = conn.execute("SELECT * FROM outreach_queue WHERE status = 'pending' ORDER BY created_at").fetchall()
     return [dict(row) for row in rows]
 
 def mark_outreach_sent(outreach_id):
     """Mark an outreach message as sent."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        UPDATE outreach_queue 
-        SET status = "sent", sent_at = CURRENT_TIMESTAMP 
-        WHERE id = ?
-    ''', (outreach_id,))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute('''
+            UPDATE outreach_queue 
+            SET status = "sent", sent_at = CURRENT_TIMESTAMP 
+            WHERE id = ?
+        ''', (outreach_id,))
 
 # ============================================================
 # AGENT MESSAGE OPERATIONS
@@ -306,24 +890,45 @@ def mark_outreach_sent(outreach_id):
 
 def send_agent_message(from_agent, to_agent, message_type, content, metadata=None):
     """Send a message between agents."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    msg_id = str(uuid.uuid4())[:8]
-    cursor.execute('''
-        INSERT INTO agent_messages (id, from_agent, to_agent, message_type, content, metadata)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', (msg_id, from_agent, to_agent, message_type, content, json.dumps(metadata) if metadata else None))
-    
-    conn.commit()
-    conn.close()
+    msg_id = new_id()
+    with transaction() as conn:
+        conn.execute('''
+            INSERT INTO agent_messages (id, from_agent, to_agent, message_type, content, metadata)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (msg_id, from_agent, to_agent, message_type, content, json.dumps(metadata) if metadata else None))
     return msg_id
 
+def send_agent_messages_bulk(messages):
+    """
+    Send many agent messages in a single transaction.
+
+    Args:
+        messages: Iterable of dicts with from_agent, to_agent, message_type, content and optional metadata
+
+    Returns:
+        List of generated message IDs, in input order
+    """
+    rows = []
+    for msg in messages:
+        metadata = msg.get('metadata')
+        rows.append((
+            new_id(),
+            msg['from_agent'],
+            msg['to_agent'],
+            msg['message_type'],
+            msg['content'],
+            json.dumps(metadata) if metadata else None
+        ))
+    if rows:
+        with transaction() as conn:
+            conn.executemany('''
+                INSERT INTO agent_messages (id, from_agent, to_agent, message_type, content, metadata)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', rows)
+    return [row[0] for row in rows]
+
 def get_agent_messages(to_agent, unread_only=True, message_type=None):
     """Get messages for an agent."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
     query = 'SELECT * FROM agent_messages WHERE to_agent = ?'
     params = [to_agent]
     
@@ -335,18 +940,250 @@ def get_agent_messages(to_agent, unread_only=True, message_type=None):
     
     query += ' ORDER BY created_at DESC'
     
-    cursor.execute(query, params)
-    rows = cursor.fetchall()
-    conn.close()
+    conn = get_connection()
+    rows = conn.execute(query, params).fetchall()
     return [dict(row) for row in rows]
 
 def mark_message_read(message_id):
     """Mark a message as read."""
+    with transaction() as conn:
+        conn.execute('UPDATE agent_messages SET read = 1 WHERE id = ?', (message_id,))
+
+def mark_messages_read_bulk(message_ids):
+    """Mark many messages as read in a single transaction. Returns the number of rows updated."""
+    rows = [(message_id,) for message_id in message_ids]
+    if not rows:
+        return 0
+    with transaction() as conn:
+        cursor = conn.executemany('UPDATE agent_messages SET read = 1 WHERE id = ?', rows)
+        return cursor.rowcount
+
+# ============================================================
+# BOARDROOM STATE (INCREMENTAL RUNS)
+# ============================================================
+
+_JOB_HASH_FIELDS = ('title', 'company', 'linkedin_url', 'spec_file', 'requirements')
+_CANDIDATE_HASH_FIELDS = ('name', 'email', 'linkedin_url', 'profile_file', 'skills', 'preferences')
+
+def _content_hash(row, fields):
+    payload = json.dumps([row.get(f) for f in fields])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def job_content_hash(job):
+    """Hash of the job fields the boardroom negotiates on."""
+    return _content_hash(job, _JOB_HASH_FIELDS)
+
+def candidate_content_hash(candidate):
+    """Hash of the candidate fields the boardroom negotiates on."""
+    return _content_hash(candidate, _CANDIDATE_HASH_FIELDS)
+
+def get_boardroom_job_state(job_id):
+    """Get the high-water mark recorded the last time a job went through the boardroom."""
+    conn = get_connection()
+    row = conn.execute('SELECT * FROM boardroom_jobs WHERE job_id = ?', (job_id,)).fetchone()
+    return dict(row) if row else None
+
+def get_boardroom_pairs(job_id):
+    """
+    Get earlier boardroom outcomes for a job, keyed by candidate ID. Each pair also carries the
+    candidate's name and current_candidate_hash (None if the candidate no longer exists), so
+    callers can tell whether the candidate changed since the pair was negotiated.
+    """
     conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('UPDATE agent_messages SET read = 1 WHERE id = ?', (message_id,))
-    conn.commit()
-    conn.close()
+    columns = ", ".join(f"c.{field} AS candidate_{field}" for field in _CANDIDATE_HASH_FIELDS)
+    rows = conn.execute(f'''
+        SELECT p.*, c.id AS current_candidate_id, {columns}
+        FROM boardroom_pairs p
+        LEFT JOIN candidates c ON c.id = p.candidate_id
+        WHERE p.job_id = ?
+    ''', (job_id,)).fetchall()
+    pairs = {}
+    for row in rows:
+        pair = dict(row)
+        candidate = {field: pair.pop(f"candidate_{field}") for field in _CANDIDATE_HASH_FIELDS}
+        pair['candidate_name'] = candidate['name']
+        pair['current_candidate_hash'] = (
+            candidate_content_hash(candidate) if pair.pop('current_candidate_id') is not None else None
+        )
+        pairs[row['candidate_id']] = pair
+    return pairs
+
+def record_boardroom_outcomes(job, outcomes, withdrawn=()):
+    """
+    Record a job's high-water mark and its evaluated pairs in one transaction.
+
+    Args:
+        job: Job row (dict)
+        outcomes: Iterable of dicts with candidate (row), decision and optional jack_score/jill_score/avg_score
+        withdrawn: Candidate IDs whose earlier decision no longer holds - their pairs are forgotten,
+                   so they are negotiated afresh if they reach the shortlist again
+    """
+    withdrawn = list(withdrawn)
+    job_hash = job_content_hash(job)
+    rows = []
+    for outcome in outcomes:
+        candidate = outcome['candidate']
+        rows.append((
+            job['id'], candidate['id'], job_hash, candidate_content_hash(candidate),
+            candidate.get('updated_at'), outcome.get('jack_score'), outcome.get('jill_score'),
+            outcome.get('avg_score'), outcome['decision']
+        ))
+    with transaction() as conn:
+        conn.execute('''
+            INSERT OR REPLACE INTO boardroom_jobs (job_id, job_hash, job_updated_at, evaluated_at)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+        ''', (job['id'], job_hash, job.get('updated_at')))
+        conn.executemany('''
+            INSERT OR REPLACE INTO boardroom_pairs
+                (job_id, candidate_id, job_hash, candidate_hash, candidate_updated_at,
+                 jack_score, jill_score, avg_score, decision, evaluated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ''', rows)
+        for start in range(0, len(withdrawn), _IN_CHUNK):
+            chunk = withdrawn[start:start + _IN_CHUNK]
+            conn.execute(
+                f'DELETE FROM boardroom_pairs WHERE job_id = ? AND candidate_id IN ({", ".join("?" * len(chunk))})',
+                [job['id'], *chunk]
+            )
+
+# ============================================================
+# EXTERNAL PROFILES (SCOUT SEARCH RESULTS)
+# ============================================================
+# One row per LinkedIn profile (kind 'candidate') or job posting (kind 'job') found by a
+# web search, however many searches returned it. external_profile_sources records which
+# job (or candidate) each one was found for.
+
+_JOB_POSTING_ID = re.compile(r"^/jobs/view/(?:.*-)?(\d+)$")
+# SQLite's limit on bound variables per statement is 999 on older builds
+_IN_CHUNK = 500
+
+def normalize_linkedin_url(url):
+    """
+    Canonical LinkedIn URL for deduplication: no scheme, www/country subdomain, query,
+    fragment or trailing slash; lowercased; job postings reduced to their numeric ID.
+    """
+    url = (url or "").strip()
+    parts = urlsplit(url if "//" in url else f"//{url}")
+    host = parts.netloc.lower().rsplit("@", 1)[-1].split(":")[0]
+    if host.endswith(".linkedin.com"):
+        host = "linkedin.com"
+    path = unquote(parts.path).lower().rstrip("/")
+    job = _JOB_POSTING_ID.match(path)
+    if job:
+        path = f"/jobs/view/{job.group(1)}"
+    return host + path
+
+def _search_text(profile):
+    return " ".join(" ".join(str(profile.get(f) or "") for f in ('name', 'headline', 'snippet')).lower().split())
+
+def upsert_external_profiles(profiles):
+    """
+    Insert or refresh many external profiles, plus their provenance, in one transaction.
+
+    Args:
+        profiles: Iterable of dicts with kind ('candidate' or 'job'), linkedin_url and
+                  optional name, headline, snippet, source_type ('job' / 'candidate') and source_id
+
+    Returns:
+        List of profile IDs, in input order (the existing ID for an already-known URL)
+    """
+    profiles = [p for p in profiles if p.get('linkedin_url')]
+    if not profiles:
+        return []
+    rows, sources, urls = [], [], []
+    for p in profiles:
+        url_norm = normalize_linkedin_url(p['linkedin_url'])
+        urls.append(url_norm)
+        rows.append((new_id(), url_norm, p['kind'], p['linkedin_url'], p.get('name'),
+                     p.get('headline'), p.get('snippet'), _search_text(p)))
+        if p.get('source_id'):
+            sources.append((url_norm, p['source_type'], p['source_id']))
+
+    with transaction() as conn:
+        conn.executemany('''
+            INSERT INTO external_profiles (id, url_norm, kind, linkedin_url, name, headline, snippet, search_text)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(url_norm) DO UPDATE SET
+                linkedin_url = excluded.linkedin_url,
+                name = COALESCE(excluded.name, name),
+                headline = COALESCE(excluded.headline, headline),
+                snippet = COALESCE(excluded.snippet, snippet),
+                search_text = profile_search_text(
+                    COALESCE(excluded.name, name),
+                    COALESCE(excluded.headline, headline),
+                    COALESCE(excluded.snippet, snippet)
+                ),
+                times_seen = times_seen + 1,
+                last_seen_at = CURRENT_TIMESTAMP
+        ''', rows)
+        ids = {}
+        unique = list(dict.fromkeys(urls))
+        for start in range(0, len(unique), _IN_CHUNK):
+            chunk = unique[start:start + _IN_CHUNK]
+            ids.update(conn.execute(
+                f'SELECT url_norm, id FROM external_profiles WHERE url_norm IN ({",".join("?" * len(chunk))})',
+                chunk
+            ).fetchall())
+        _add_external_sources(conn, [(ids[url], source_type, source_id) for url, source_type, source_id in sources])
+    return [ids[url] for url in urls]
+
+def _add_external_sources(conn, rows):
+    conn.executemany('''
+        INSERT INTO external_profile_sources (profile_id, source_type, source_id)
+        VALUES (?, ?, ?)
+        ON CONFLICT(profile_id, source_type, source_id) DO UPDATE SET last_seen_at = CURRENT_TIMESTAMP
+    ''', rows)
+
+def add_external_profile_sources(profile_ids, source_type, source_id):
+    """Record that already-stored profiles were used for a job (or candidate) without a new search."""
+    rows = [(profile_id, source_type, source_id) for profile_id in profile_ids]
+    if rows:
+        with transaction() as conn:
+            _add_external_sources(conn, rows)
+
+def find_external_profiles(kind, phrase=None, any_terms=(), limit=10, max_age_days=None):
+    """
+    Stored external profiles matching an X-Ray style query, most recently seen first.
+
+    Args:
+        kind: 'candidate' or 'job'
+        phrase: Text that must appear in the name/headline/snippet (e.g. the job title)
+        any_terms: At least one of these must appear (e.g. required skills)
+        limit: Maximum profiles to return
+        max_age_days: Only profiles seen in the last N days
+    """
+    def like(term):
+        escaped = " ".join(str(term).lower().split()).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return f"%{escaped}%"
+
+    clauses, params = ["kind = ?"], [kind]
+    if phrase and phrase.strip():
+        clauses.append("search_text LIKE ? ESCAPE '\\'")
+        params.append(like(phrase))
+    terms = [t for t in any_terms if str(t).strip()]
+    if terms:
+        clauses.append("(" + " OR ".join(["search_text LIKE ? ESCAPE '\\'"] * len(terms)) + ")")
+        params.extend(like(t) for t in terms)
+    if max_age_days is not None:
+        clauses.append("last_seen_at >= datetime('now', ?)")
+        params.append(f"-{int(max_age_days)} days")
+    params.append(limit)
+    conn = get_connection()
+    rows = conn.execute(f'''
+        SELECT * FROM external_profiles
+        WHERE {" AND ".join(clauses)}
+        ORDER BY last_seen_at DESC, id
+        LIMIT ?
+    ''', params).fetchall()
+    return [dict(row) for row in rows]
+
+def get_external_profile_sources(profile_id):
+    """Every job (or candidate) an external profile was found for."""
+    conn = get_connection()
+    rows = conn.execute('''
+        SELECT * FROM external_profile_sources WHERE profile_id = ? ORDER BY first_seen_at, source_id
+    ''', (profile_id,)).fetchall()
+    return [dict(row) for row in rows]
 
 # Initialize on import
 if __name__ == "__main__":
@@ -0,0 +1,513 @@
+"""
+Embedding Index - Local semantic vectors for candidate profiles and job specs
+Each candidate (profile file + skills) and job (spec file + requirements) gets one
+L2-normalized vector from a CPU embedding model, or from a hashing vectorizer when no
+model is installed. Vectors live in a memory-mapped float32 matrix on disk with a JSON
+row -> ID map, so shortlisting is one matrix-vector product (top-K cosine) and never
+touches the LLM. With SHORTLIST_RANKER=embedding (or EMBEDDING_INDEX_ON_INSERT=1),
+add_candidate / add_job index new rows as they are inserted.
+
+Usage:
+    python embedding_index.py        # index any missing rows and print a report
+"""
+
+import os
+import json
+import zlib
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+import database
+from prerank import tokenize, candidate_text, job_text, PRERANK_TOP_K
+
+# "auto" (sentence-transformers if installed, else hashing), "hashing" or "sentence-transformers"
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "auto")
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+HASHING_DIMENSIONS = int(os.getenv("EMBEDDING_HASHING_DIMENSIONS", "1024"))
+# Index files live here; by default next to the database (data/recruiter.embeddings/)
+EMBEDDING_INDEX_DIR = os.getenv("EMBEDDING_INDEX_DIR")
+
+INITIAL_CAPACITY = 256
+EMBED_BATCH_SIZE = 256
+# The map log is folded into the snapshot once it has more lines than this and than the index has rows
+COMPACT_MIN_LOG_ENTRIES = 1024
+
+# ============================================================
+# EMBEDDERS
+# ============================================================
+# An embedder has a `name` (stored with the index; a different name rebuilds it), a `dim`
+# and `embed(texts)` returning a (len(texts), dim) float32 array of unit vectors.
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return (vectors / np.where(norms > 0, norms, 1.0)).astype(np.float32)
+
+
+class HashingEmbedder:
+    """
+    Signed feature hashing of word unigrams and bigrams with sublinear term frequency.
+    No model download; stable across processes (crc32, not Python's salted hash()).
+    """
+
+    def __init__(self, dim=HASHING_DIMENSIONS):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _features(self, text):
+        tokens = tokenize(text)
+        return Counter(tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])])
+
+    def embed(self, texts):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for feature, tf in self._features(text).items():
+                h = zlib.crc32(feature.encode("utf-8"))
+                sign = 1.0 if h & 0x80000000 else -1.0
+                vectors[i, h % self.dim] += sign * (1.0 + np.log(tf))
+        return _normalize(vectors)
+
+
+class SentenceTransformerEmbedder:
+    """A sentence-transformers model on CPU (loaded on first use)."""
+
+    def __init__(self, model=EMBEDDING_MODEL):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model, device="cpu")
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = f"st-{model}"
+
+    def embed(self, texts):
+        vectors = self.model.encode(list(texts), batch_size=32, normalize_embeddings=True)
+        return np.asarray(vectors, dtype=np.float32).reshape(len(texts), self.dim)
+
+
+def _auto_embedder():
+    try:
+        return SentenceTransformerEmbedder()
+    except ImportError:
+        return HashingEmbedder()
+    except Exception as e:
+        print(f"   ⚠️ Could not load embedding model {EMBEDDING_MODEL!r} ({e}) - using the hashing embedder")
+        return HashingEmbedder()
+
+
+_EMBEDDERS = {
+    "auto": _auto_embedder,
+    "hashing": HashingEmbedder,
+    "sentence-transformers": SentenceTransformerEmbedder,
+}
+
+
+def register_embedder(name, factory):
+    """Add an embedding backend: factory() -> embedder."""
+    _EMBEDDERS[name] = factory
+
+
+_embedder = None
+_embedder_error = None
+_embedder_lock = threading.Lock()
+
+
+def get_embedder():
+    """The configured embedder. A failed load is remembered and re-raised, not retried."""
+    global _embedder, _embedder_error
+    if _embedder is None:
+        with _embedder_lock:
+            if _embedder is None:
+                if _embedder_error is not None:
+                    raise _embedder_error
+                try:
+                    if EMBEDDING_BACKEND not in _EMBEDDERS:
+                        raise ValueError(f"Unknown embedding backend {EMBEDDING_BACKEND!r} (known: {', '.join(sorted(_EMBEDDERS))})")
+                    _embedder = _EMBEDDERS[EMBEDDING_BACKEND]()
+                except Exception as e:
+                    _embedder_error = e
+                    raise
+    return _embedder
+
+
+def configure(embedder=None):
+    """Use `embedder` (an instance or a registered backend name) for indexes opened afterwards."""
+    global _embedder, _embedder_error
+    with _embedder_lock:
+        _embedder = _EMBEDDERS[embedder]() if isinstance(embedder, str) else embedder
+        _embedder_error = None
+        _indexes.clear()
+
+# ============================================================
+# INDEX
+# ============================================================
+
+if os.name == "nt":
+    import msvcrt
+
+    def _lock_file(f):
+        f.seek(0)
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                pass  # LK_LOCK gives up after ~10 s - keep waiting for the writer
+
+    def _unlock_file(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _lock_file(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class EmbeddingIndex:
+    """
+    Memory-mapped matrix of unit vectors plus a row -> ID map, persisted in `directory`:
+    {name}.f32 (the matrix), {name}.json (a snapshot of the map) and {name}.log (map changes
+    since the snapshot, one "[row, id]" line each - an id of null frees the row). Adds and
+    removes append to the log, which is folded into the snapshot once it outgrows the index
+    or the matrix grows (by doubling), so an insert costs O(1) however large the index is.
+    Writers hold an exclusive lock on {name}.lock, and readers pick up other processes'
+    changes by replaying the new end of the log.
+
+    Usage:
+        index = EmbeddingIndex("candidates", "data/recruiter.embeddings", text=candidate_text, query_text=job_text)
+        index.add_rows(iter_candidates())
+        index.shortlist(job, top_k=20)      # [(candidate_id, cosine), ...] best first
+    """
+
+    def __init__(self, name, directory, text, query_text, embedder=None):
+        self.name = name
+        self.directory = Path(directory)
+        self.text = text
+        self.query_text = query_text
+        self.embedder = embedder or get_embedder()
+        self.matrix_path = self.directory / f"{name}.f32"
+        self.map_path = self.directory / f"{name}.json"
+        self.log_path = self.directory / f"{name}.log"
+        self.lock_path = self.directory / f"{name}.lock"
+        self._lock = threading.RLock()
+        self._lock_file = None
+        self._lock_depth = 0
+        self._reset()
+        self._refresh()
+
+    # --- persistence -------------------------------------------------
+
+    def _reset(self):
+        self.ids = []
+        self.rows = {}
+        self.free = []
+        self.capacity = 0
+        self.matrix = np.zeros((0, self.embedder.dim), dtype=np.float32)
+        self._map_mtime_ns = None
+        self._log_offset = 0
+        self._log_entries = 0
+        self._rebuild = False
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive cross-process lock on the index files (reentrant within this object)."""
+        with self._lock:
+            if self._lock_depth == 0:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self._lock_file = open(self.lock_path, "a+b")
+                _lock_file(self._lock_file)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0:
+                    _unlock_file(self._lock_file)
+                    self._lock_file.close()
+                    self._lock_file = None
+
+    def _state(self):
+        try:
+            map_mtime_ns = os.stat(self.map_path).st_mtime_ns
+        except OSError:
+            map_mtime_ns = None
+        try:
+            log_size = os.path.getsize(self.log_path)
+        except OSError:
+            log_size = 0
+        return map_mtime_ns, log_size
+
+    def _refresh(self):
+        """Pick up changes another process made since this index was last read."""
+        with self._lock:
+            map_mtime_ns, log_size = self._state()
+            if map_mtime_ns == self._map_mtime_ns and log_size == self._log_offset:
+                return
+            with self._locked():
+                map_mtime_ns, log_size = self._state()
+                if map_mtime_ns != self._map_mtime_ns or log_size < self._log_offset:
+                    self._load()
+                elif log_size > self._log_offset:
+                    self._replay_log()
+
+    def _load(self):
+        self._reset()
+        try:
+            with open(self.map_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            self._map_mtime_ns = os.stat(self.map_path).st_mtime_ns
+        except (OSError, ValueError):
+            meta = None
+        if meta is None or meta.get("embedder") != self.embedder.name or meta.get("dim") != self.embedder.dim:
+            if meta is not None:
+                print(f"   🔄 Embedding index '{self.name}' was built with {meta.get('embedder')} - rebuilding with {self.embedder.name}")
+            # Whatever is on disk is replaced by the next write; until then the index is empty
+            self._log_offset = self._state()[1]
+            self._rebuild = True
+            return
+        self.capacity = meta["capacity"]
+        self.ids = meta["ids"]
+        self.rows = {item_id: row for row, item_id in enumerate(self.ids) if item_id is not None}
+        if self.capacity:
+            self.matrix = np.memmap(self.matrix_path, dtype=np.float32, mode="r+", shape=(self.capacity, self.embedder.dim))
+        self._replay_log()
+
+    def _replay_log(self):
+        """Apply log lines written since the last read (replaying a line twice is harmless)."""
+        try:
+            with open(self.log_path, "rb") as f:
+                f.seek(self._log_offset)
+                tail = f.read()
+        except OSError:
+            tail = b""
+        complete = tail[:tail.rfind(b"\n") + 1]
+        for line in complete.splitlines():
+            row, item_id = json.loads(line)
+            self._assign(row, item_id)
+            self._log_entries += 1
+        self._log_offset += len(complete)
+        self.free = [row for row, item_id in enumerate(self.ids) if item_id is None]
+
+    def _assign(self, row, item_id):
+        """Point `row` at `item_id` (None frees it) in the in-memory map."""
+        if row >= len(self.ids):
+            self.ids.extend([None] * (row + 1 - len(self.ids)))
+        previous = self.ids[row]
+        if previous is not None and self.rows.get(previous) == row:
+            del self.rows[previous]
+        self.ids[row] = item_id
+        if item_id is not None:
+            self.rows[item_id] = row
+
+    def _compact(self):
+        """Write the whole map as the new snapshot and empty the log."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.map_path.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"embedder": self.embedder.name, "dim": self.embedder.dim,
+                       "capacity": self.capacity, "ids": self.ids}, f)
+        os.replace(tmp, self.map_path)
+        open(self.log_path, "wb").close()
+        self._map_mtime_ns = os.stat(self.map_path).st_mtime_ns
+        self._log_offset = 0
+        self._log_entries = 0
+        self._rebuild = False
+
+    def _commit(self, changes):
+        """Persist [(row, item_id)] map changes - vectors are flushed before the map points at them."""
+        if isinstance(self.matrix, np.memmap):
+            self.matrix.flush()
+        self._log_entries += len(changes)
+        if self._rebuild or self._log_entries > max(COMPACT_MIN_LOG_ENTRIES, len(self.ids)):
+            self._compact()
+            return
+        with open(self.log_path, "ab") as f:
+            f.write("".join(json.dumps([row, item_id]) + "\n" for row, item_id in changes).encode("utf-8"))
+        self._log_offset = os.path.getsize(self.log_path)
+
+    def _grow(self, needed):
+        capacity = max(INITIAL_CAPACITY, self.capacity)
+        while capacity < needed:
+            capacity *= 2
+        if capacity == self.capacity:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.matrix_path.with_suffix(".f32.tmp")
+        grown = np.memmap(tmp, dtype=np.float32, mode="w+", shape=(capacity, self.embedder.dim))
+        grown[:len(self.ids)] = self.matrix[:len(self.ids)]
+        grown.flush()
+        del grown
+        if isinstance(self.matrix, np.memmap):
+            del self.matrix
+        os.replace(tmp, self.matrix_path)
+        self.capacity = capacity
+        self.matrix = np.memmap(self.matrix_path, dtype=np.float32, mode="r+", shape=(capacity, self.embedder.dim))
+        # Readers must see the new capacity before any log line points past the old one
+        self._compact()
+
+    # --- updates -----------------------------------------------------
+
+    def add_many(self, items):
+        """Index or re-index (item_id, text) pairs. Returns how many were written."""
+        items = list(items)
+        written = 0
+        with self._locked():
+            self._refresh()
+            for start in range(0, len(items), EMBED_BATCH_SIZE):
+                batch = items[start:start + EMBED_BATCH_SIZE]
+                vectors = self.embedder.embed([text for _, text in batch])
+                new = sum(1 for item_id, _ in batch if item_id not in self.rows)
+                self._grow(len(self.ids) + max(0, new - len(self.free)))
+                changes = []
+                for (item_id, _), vector in zip(batch, vectors):
+                    row = self.rows.get(item_id)
+                    if row is None:
+                        row = self.free.pop() if self.free else len(self.ids)
+                        self._assign(row, item_id)
+                        changes.append((row, item_id))
+                    self.matrix[row] = vector
+                self._commit(changes)
+                written += len(batch)
+        return written
+
+    def add(self, item_id, text):
+        return self.add_many([(item_id, text)])
+
+    def add_rows(self, rows):
+        """Index database rows (dicts with 'id'), using this index's text function."""
+        return self.add_many((row['id'], self.text(row)) for row in rows)
+
+    def remove_many(self, item_ids):
+        """Drop IDs from the index; their rows are reused by later adds. Returns how many were removed."""
+        changes = []
+        with self._locked():
+            self._refresh()
+            for item_id in item_ids:
+                row = self.rows.get(item_id)
+                if row is None:
+                    continue
+                self._assign(row, None)
+                self.matrix[row] = 0.0
+                self.free.append(row)
+                changes.append((row, None))
+            if changes:
+                self._commit(changes)
+        return len(changes)
+
+    def remove(self, item_id):
+        return self.remove_many([item_id]) > 0
+
+    def sync(self, rows):
+        """Index rows missing from the index and remove IDs no longer among `rows`. Returns (added, removed)."""
+        with self._locked():
+            self._refresh()
+            seen = set()
+            missing = []
+            for row in rows:
+                seen.add(row['id'])
+                if row['id'] not in self.rows:
+                    missing.append(row)
+            added = self.add_rows(missing)
+            removed = self.remove_many([item_id for item_id in self.rows if item_id not in seen])
+        return added, removed
+
+    # --- queries -----------------------------------------------------
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, item_id):
+        return item_id in self.rows
+
+    def search(self, text, top_k=10, allowed_ids=None):
+        """Top-K (item_id, cosine similarity) for a query text, best first."""
+        with self._lock:
+            self._refresh()
+            n = len(self.ids)
+            if not self.rows or top_k <= 0:
+                return []
+            query = self.embedder.embed([text])[0]
+            scores = np.asarray(self.matrix[:n] @ query, dtype=np.float64)
+            if allowed_ids is None:
+                candidates = np.fromiter(self.rows.values(), dtype=np.int64, count=len(self.rows))
+            else:
+                candidates = np.array([self.rows[i] for i in allowed_ids if i in self.rows], dtype=np.int64)
+            if not len(candidates):
+                return []
+            if len(candidates) > top_k:
+                candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+            # Best score first; ties keep row order for stable shortlists
+            order = np.lexsort((candidates, -scores[candidates]))
+            return [(self.ids[i], float(scores[i])) for i in candidates[order]]
+
+    def shortlist(self, row, top_k=PRERANK_TOP_K, allowed_ids=None):
+        """Top-K IDs for a row from the other side (a job for the candidate index) - same shape as PreRanker.shortlist."""
+        return self.search(self.query_text(row), top_k, allowed_ids)
+
+# ============================================================
+# CANDIDATE / JOB INDEXES
+# ============================================================
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def index_directory():
+    if EMBEDDING_INDEX_DIR:
+        return Path(EMBEDDING_INDEX_DIR)
+    return Path(database.DATABASE_PATH).with_suffix(".embeddings")
+
+
+def _index(name, text, query_text):
+    key = (name, str(index_directory()))
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = EmbeddingIndex(name, key[1], text, query_text)
+        return _indexes[key]
+
+
+def candidate_index():
+    """Candidate profiles, queried with job text."""
+    return _index("candidates", candidate_text, job_text)
+
+
+def job_index():
+    """Job specs, queried with candidate text."""
+    return _index("jobs", job_text, candidate_text)
+
+
+def index_candidate(candidate):
+    candidate_index().add_rows([candidate])
+
+
+def index_job(job):
+    job_index().add_rows([job])
+
+
+def remove_candidate(candidate_id):
+    return candidate_index().remove(candidate_id)
+
+
+def remove_job(job_id):
+    return job_index().remove(job_id)
+
+
+def sync_all():
+    """Bring both indexes in line with the database. Returns {name: (added, removed)}."""
+    return {
+        "candidates": candidate_index().sync(database.iter_candidates()),
+        "jobs": job_index().sync(database.iter_jobs()),
+    }
+
+
+if __name__ == "__main__":
+    database.init_database()
+    changes = sync_all()
+    print(f"\n🧭 Embedding indexes ({get_embedder().name}) in {index_directory()}")
+    for name, index in (("candidates", candidate_index()), ("jobs", job_index())):
+        added, removed = changes[name]
+        print(f"   {name:<11} {len(index):>7} vectors  (+{added} / -{removed}), capacity {index.capacity}")
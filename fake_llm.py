@@ -0,0 +1,265 @@
+"""
+Fake LLM - In-process stand-in for the Groq chat completions API
+Mimics `client.chat.completions.create(...)` (sync and async) with configurable latency,
+injected 429/5xx failures and deterministic replies, for tests and throughput benchmarks.
+StubLLMServer serves the same replies over HTTP for exercising the real SDK client path.
+"""
+
+import json
+import time
+import re
+import random
+import socket
+import asyncio
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+
+class FakeAPIError(Exception):
+    """HTTP-style error carrying a status_code, like the Groq SDK's APIStatusError."""
+
+    def __init__(self, status_code, message="fake error"):
+        super().__init__(f"{status_code}: {message}")
+        self.status_code = status_code
+
+
+def deterministic_reply(messages):
+    """
+    Stable reply derived from a hash of the prompt.
+    Answers match-score, Jack and Jill evaluation prompts with the JSON objects they ask for.
+    """
+    prompt = "\n".join(m.get("content") or "" for m in messages)
+    digest = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest(), 16)
+    score = digest % 11
+    if "JSON array" in prompt:
+        return _batch_reply(prompt)
+    if "Respond with ONLY a JSON object" in prompt:
+        if "0.0 to 1.0" in prompt:
+            return json.dumps({"score": round(score / 10, 2), "reason": f"fake reason {digest % 997}"})
+        if '"pitch"' in prompt:
+            return json.dumps({"score": score, "pitch": None if score < 4 else f"Fake pitch {digest % 997}."})
+        return json.dumps({"score": score, "reason": f"Fake reasoning {digest % 997}."})
+    return f"Fake reply {digest % 997}."
+
+
+def _batch_reply(prompt):
+    """JSON array reply for batched prompts: one item per numbered "[i] ..." line."""
+    items = []
+    for line in prompt.splitlines():
+        line = line.strip()
+        if not (line.startswith("[") and "]" in line and line[1:line.index("]")].isdigit()):
+            continue
+        item_id = int(line[1:line.index("]")])
+        digest = int(hashlib.sha256(line.encode("utf-8")).hexdigest(), 16)
+        score = digest % 11
+        if '"pitch"' in prompt:
+            items.append({"id": item_id, "score": score, "pitch": None if score < 4 else f"Fake pitch {digest % 997}."})
+        else:
+            items.append({"id": item_id, "score": score, "reason": f"Fake reasoning {digest % 997}."})
+    return json.dumps(items)
+
+
+def _response(content, messages, cached_tokens=0):
+    prompt_tokens = sum(len(m.get("content") or "") for m in messages) // 4
+    completion_tokens = len(content) // 4
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=cached_tokens)
+        )
+    )
+
+
+class _FakeServer:
+    """Shared behaviour: latency, failure injection, call accounting."""
+
+    def __init__(self, latency=0.05, error_rate=0.0, error_status=429, responder=None, seed=0, token_latency=0.0):
+        self.latency = latency
+        # Delay between streamed tokens (stream=True); `latency` is the time to the first token
+        self.token_latency = token_latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.responder = responder or deterministic_reply
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        # Prefix cache: prompt_cache_key -> first message content (hit when the prefix is unchanged)
+        self.prefix_cache = {}
+        self.prompt_tokens = 0
+        self.cached_prompt_tokens = 0
+
+    def _begin(self):
+        with self.lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            fail = self.rng.random() < self.error_rate
+            if fail:
+                self.errors += 1
+        return fail
+
+    def _account_prompt(self, messages, prompt_cache_key):
+        """Count prompt tokens, and the leading-message tokens served from the prefix cache."""
+        tokens = sum(len(m.get("content") or "") for m in messages) // 4
+        cached = 0
+        if prompt_cache_key and messages:
+            prefix = messages[0].get("content") or ""
+            with self.lock:
+                if self.prefix_cache.get(prompt_cache_key) == prefix:
+                    cached = len(prefix) // 4
+                self.prefix_cache[prompt_cache_key] = prefix
+        with self.lock:
+            self.prompt_tokens += tokens
+            self.cached_prompt_tokens += cached
+        return cached
+
+    def _generation_time(self, content):
+        """Extra time a non-streamed reply takes to generate when token_latency is set."""
+        return self.token_latency * max(0, len(content.split()) - 1)
+
+    def _end(self):
+        with self.lock:
+            self.in_flight -= 1
+
+
+class FakeLLMClient(_FakeServer):
+    """Synchronous fake: `client.chat.completions.create(model=..., messages=...)`."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model=None, messages=None, stream=False, prompt_cache_key=None, **kwargs):
+        cached = self._account_prompt(messages, prompt_cache_key)
+        if stream:
+            return self._stream(messages)
+        fail = self._begin()
+        try:
+            time.sleep(self.latency)
+            if fail:
+                raise FakeAPIError(self.error_status)
+            content = self.responder(messages)
+            time.sleep(self._generation_time(content))
+            return _response(content, messages, cached)
+        finally:
+            self._end()
+
+    def _stream(self, messages):
+        """Yield chat-completion chunks word by word, like create(stream=True)."""
+        fail = self._begin()
+        try:
+            time.sleep(self.latency)
+            if fail:
+                raise FakeAPIError(self.error_status)
+            for i, token in enumerate(re.findall(r"\S+\s*", self.responder(messages))):
+                if i:
+                    time.sleep(self.token_latency)
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=token))])
+        finally:
+            self._end()
+
+
+class FakeAsyncLLMClient(_FakeServer):
+    """Async fake: `await client.chat.completions.create(model=..., messages=...)`."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, model=None, messages=None, prompt_cache_key=None, **kwargs):
+        cached = self._account_prompt(messages, prompt_cache_key)
+        fail = self._begin()
+        try:
+            await asyncio.sleep(self.latency)
+            if fail:
+                raise FakeAPIError(self.error_status)
+            content = self.responder(messages)
+            await asyncio.sleep(self._generation_time(content))
+            return _response(content, messages, cached)
+        finally:
+            self._end()
+
+
+class StubLLMServer(_FakeServer):
+    """
+    Local OpenAI/Groq-compatible HTTP server (POST .../chat/completions) on 127.0.0.1.
+    Point the gateway at it with llm_gateway.configure("groq", base_url=server.base_url).
+    Counts TCP connections so keep-alive reuse is observable.
+    """
+
+    def __init__(self, port=0, **kwargs):
+        super().__init__(**kwargs)
+        self.connections = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def setup(self):
+                super().setup()
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                with stub.lock:
+                    stub.connections += 1
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                fail = stub._begin()
+                try:
+                    time.sleep(stub.latency)
+                    if fail:
+                        self._send(stub.error_status, {"error": {"message": "stub error"}})
+                        return
+                    messages = body.get("messages", [])
+                    response = _response(stub.responder(messages), messages)
+                    self._send(200, {
+                        "id": f"stub-{stub.calls}", "object": "chat.completion", "created": int(time.time()),
+                        "model": body.get("model", "stub"),
+                        "choices": [{"index": 0, "finish_reason": "stop",
+                                     "message": {"role": "assistant", "content": response.choices[0].message.content}}],
+                        "usage": {**vars(response.usage),
+                                  "prompt_tokens_details": vars(response.usage.prompt_tokens_details)},
+                    })
+                finally:
+                    stub._end()
+
+            def _send(self, status, payload):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-llm", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -2,113 +2,61 @@ import os
 import sys
 import time
 import re
-from groq import Groq
 from dotenv import load_dotenv
+from llm_gateway import chat, require_backend
+from tts import SpeechService, clean_for_speech, speak_llm_reply
+from stt import Listener
+from conversation import ConversationHistory
+from prompt_registry import get_prompt, prefix_id, registry
 import speech_recognition as sr
-import pyttsx3
 
 # Load environment variables
 load_dotenv()
 
-# Global Groq client
-client = None
 
-def init_groq():
-    """Initialize Groq client"""
-    global client
-    api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
-        print("Error: GROQ_API_KEY not found in environment variables.")
-        print("Please create a .env file with GROQ_API_KEY=your_key")
-        sys.exit(1)
-    client = Groq(api_key=api_key)
-    return client
-
-def groq_call(messages, model="llama-3.3-70b-versatile", temperature=0.7):
-    """Helper to call Groq API"""
-    response = client.chat.completions.create(
-        model=model,
-        messages=messages,
-        temperature=temperature
-    )
-    return response.choices[0].message.content
+PERSONA = "jack_persona"
 
 def load_system_prompt():
     try:
-        with open("prompts/jack_persona.md", "r", encoding="utf-8") as f:
-            return f.read()
+        return get_prompt(PERSONA)
     except FileNotFoundError:
         print("Error: prompts/jack_persona.md not found.")
         sys.exit(1)
 
-def init_engine():
-    """Initializes the TTS engine with male voice and natural speed."""
-    engine = pyttsx3.init()
-    
-    # Set Rate (Speed) - Default for natural feel
-    rate = engine.getProperty('rate')
-    engine.setProperty('rate', rate) 
-    
-    # Set Voice (Male)
-    voices = engine.getProperty('voices')
-    target_voice = None
-    
-    # Look for "David" (common Windows male voice) or just "Male"
-    for voice in voices:
-        if "david" in voice.name.lower() or "male" in voice.name.lower():
-            target_voice = voice.id
-            break
-
-    if target_voice:
-        engine.setProperty('voice', target_voice)
-            
-    return engine
+# One long-lived TTS engine (male voice, looked up once); utterances queue to its own thread
+speech = SpeechService(
+    voice_keywords=("david", "male")
+)
 
 def speak(text):
-    """Speaks the text using a fresh engine instance."""
-    try:
-        # Clean text for speech: remove markdown symbols and ALL asterisks
-        clean_text = re.sub(r'\*.*?\*', '', text)  # Remove *text*
-        clean_text = clean_text.replace("*", "")  # Remove any remaining asterisks
-        clean_text = clean_text.replace("#", "").replace("- ", "")
-        
-        print(f"[Debug] Speaking: {clean_text[:50]}...")
-        engine = init_engine()
-        engine.say(clean_text)
-        engine.runAndWait()
-        print("[Debug] Speech finished.")
-    except Exception as e:
-        print(f"Error in TTS: {e}")
+    """Speaks the text on the shared speech service and waits until it has been played."""
+    print(f"[Debug] Speaking: {clean_for_speech(text)[:50]}...")
+    speech.speak(text)
+    print("[Debug] Speech finished.")
+
+# One long-lived microphone listener: calibrated once, stream kept open between turns
+listener = Listener(pause_threshold=2.5)  # Wait 2.5 seconds before processing (to avoid cutting off mid-sentence)
 
 def listen():
     """Listens to the microphone and returns text."""
-    r = sr.Recognizer()
-    r.pause_threshold = 2.5  # Wait 2.5 seconds before processing (to avoid cutting off mid-sentence)
-    
-    with sr.Microphone() as source:
-        print("\nListening... (Speak now)")
-        # Adjust for ambient noise - reduced duration for faster response
-        r.adjust_for_ambient_noise(source, duration=0.3)
-        try:
-            # Removed phrase_time_limit to allow longer, uninterrupted speech
-            audio = r.listen(source, timeout=10, phrase_time_limit=None)
-            print("Recognizing...")
-            text = r.recognize_google(audio)
-            print(f"You said: {text}")
-            return text
-        except sr.WaitTimeoutError:
-            message = "I can't hear you. Could you please repeat that?"
-            print(f"Jack: {message}")
-            speak(message)
-            return None
-        except sr.UnknownValueError:
-            message = "I didn't catch that. Could you say it again?"
-            print(f"Jack: {message}")
-            speak(message)
-            return None
-        except sr.RequestError as e:
-            print(f"Could not request results; {e}")
-            return None
+    print("\nListening... (Speak now)")
+    try:
+        text = listener.listen()
+        print(f"You said: {text}")
+        return text
+    except sr.WaitTimeoutError:
+        message = "I can't hear you. Could you please repeat that?"
+        print(f"Jack: {message}")
+        speak(message)
+        return None
+    except sr.UnknownValueError:
+        message = "I didn't catch that. Could you say it again?"
+        print(f"Jack: {message}")
+        speak(message)
+        return None
+    except sr.RequestError as e:
+        print(f"Could not request results; {e}")
+        return None
 
 def load_job_requirements():
     """Loads the job requirements generated by Jill if they exist."""
@@ -143,10 +91,9 @@ def generate_candidate_profile(messages, job_role=None, cv_content=None):
     """Generates a candidate profile document based on the conversation and optional CV."""
     print("\n📝 Generating Candidate Profile One-Pager...")
     try:
-        # Load system prompt for generation context
+        # Load system prompt for generation context (cached by the prompt registry)
         try:
-            with open("prompts/jack_persona.md", "r", encoding="utf-8") as f:
-                persona_prompt = f.read()
+            persona_prompt = get_prompt(PERSONA)
         except:
             persona_prompt = "You are an expert technical recruiter."
 
@@ -198,13 +145,15 @@ If there are any discrepancies between the conversation and CV, note them in the
         Format it as a concise **ONE-PAGE SUMMARY**. Do not write a multi-page essay.
         Use bullet points and short paragraphs. Make it a clean, professional Markdown document.
         Be specific and cite examples from our conversation. For behavioral traits, reference the specific scenarios they shared.
-        # Call Groq to generate
-        gen_messages = [
-            {"role": "system", "content": persona_prompt},
-            {"role": "user", "content": prompt}
-        ]
+        """
+        # Call the LLM to generate - with the full, uncompacted interview
+        gen_messages = (
+            [{"role": "system", "content": persona_prompt}]
+            + [m for m in messages if m["role"] != "system"]
+            + [{"role": "user", "content": prompt}]
+        )
         
-        content = groq_call(gen_messages, model="llama-3.3-70b-versatile")
+        content = chat(gen_messages, model="llama-3.3-70b-versatile", prefix_id=prefix_id(PERSONA))
         candidate_name = "unknown"
         for line in content.split('\n'):
             if 'CANDIDATE_NAME:' in line:
@@ -329,13 +278,17 @@ Let me know if you'd like me to reach out to the candidate about this opportunit
 
 
 def main():
-    # Initialize Groq
-    init_groq()
+    # Fail fast if the LLM backend is not configured
+    require_backend()
+    # Engine and voice are set up once here, not before every utterance
+    speech.start()
+    listener.open()
 
     system_prompt = load_system_prompt()
+    print(f"📚 Persona {prefix_id(PERSONA)}: {registry.tokens(PERSONA):,} tokens per turn")
     
     # Initialize database
-    from database import init_database, get_agent_messages, mark_message_read, add_candidate
+    from database import init_database, get_agent_messages, mark_messages_read_bulk, add_candidate
     init_database()
     
     # Read messages from Jill (legacy system) - REMOVED
@@ -382,8 +335,8 @@ def main():
                 for j in jobs[:3]:
                     print(f"      • {j.get('title', 'Unknown')[:40]}...")
                 print()
-            
-            mark_message_read(msg['id'])
+        
+        mark_messages_read_bulk(msg['id'] for msg in scout_messages)
         
         print("   💡 Run `python linkedin_outreach.py` to generate outreach messages.\n")
     else:
@@ -397,22 +350,22 @@ def main():
     model_name = "llama-3.3-70b-versatile"
     
     try:
-        # Initialize conversation history for Groq
-        messages = [{"role": "system", "content": system_prompt}]
+        # Conversation history: recent turns verbatim, older ones summarized to stay within budget
+        history = ConversationHistory(system_prompt, assistant="Jack", user="Candidate")
         
         # Build better intro message
         intro_text = "Hey! I'm Jack, your Talent Advocate. I'm here to help you land your next amazing role. Let's talk about your experience and what you're looking for. Tell me - what kind of work have you been doing lately?"
         
         if job_requirements:
             intro_text = "Hey! I'm Jack. I'm currently helping fill a specific role, and I'd love to chat with you about it. But first, tell me about yourself - what's your background?"
-            messages.append({"role": "user", "content": f"CONTEXT: You are recruiting for this role:\n{job_requirements}"})
-            ack = groq_call(messages, model_name)
-            messages.append({"role": "assistant", "content": ack})
+            history.add("user", f"CONTEXT: You are recruiting for this role:\n{job_requirements}", pin=True)
+            ack = chat(history.prompt_messages(), model_name, prefix_id=prefix_id(PERSONA))
+            history.add("assistant", ack, pin=True)
         elif cv_input:
             intro_text = "Hi! I'm Jack, your Talent Advocate. I've got your CV here - let's dive into your experience. Tell me about your most recent role and what you loved about it!"
-            messages.append({"role": "user", "content": f"CONTEXT: Candidate provided this CV:\n{cv_input}"})
-            ack = groq_call(messages, model_name)
-            messages.append({"role": "assistant", "content": ack})
+            history.add("user", f"CONTEXT: Candidate provided this CV:\n{cv_input}", pin=True)
+            ack = chat(history.prompt_messages(), model_name, prefix_id=prefix_id(PERSONA))
+            history.add("assistant", ack, pin=True)
 
         print(f"Jack (Talent Advocate) [{model_name}]: {intro_text}")
         speak(intro_text)
@@ -475,7 +428,7 @@ def main():
                             speak(no_cv_msg)
                     
                     # Generate Profile with optional CV cross-reference
-                    result = generate_candidate_profile(messages, job_role="Target Role" if job_requirements else None, cv_content=cv_content)
+                    result = generate_candidate_profile(history.full_messages(), job_role="Target Role" if job_requirements else None, cv_content=cv_content)
                     
                     if result and result[0]:
                         filename, profile_content = result
@@ -543,7 +496,7 @@ Please generate an UPDATED version incorporating their feedback. Keep the same f
                                 update_messages = [{"role": "system", "content": system_prompt}, {"role": "user", "content": update_prompt}]
                                 
                                 # Extract updated content
-                                updated_content = groq_call(update_messages)
+                                updated_content = chat(update_messages, prefix_id=prefix_id(PERSONA))
                                 for line in updated_content.split('\n'):
                                     if 'CANDIDATE_NAME:' in line:
                                         updated_content = updated_content.replace(line, "").strip()
@@ -558,12 +511,14 @@ Please generate an UPDATED version incorporating their feedback. Keep the same f
                         speak(error_msg)
                     break  # Exit main conversation loop
 
-                messages.append({"role": "user", "content": user_input})
-                ai_response = groq_call(messages, model_name)
-                messages.append({"role": "assistant", "content": ai_response})
-                print(f"\nJack: {ai_response}")
-                speak(ai_response)
+                history.add("user", user_input)
+                # Streamed: the first sentence is spoken while the rest is still being generated
+                ai_response = speak_llm_reply("Jack", history.prompt_messages(), model_name, speak,
+                                              prefix_id=prefix_id(PERSONA))
+                history.add("assistant", ai_response)
+                print(history.format_stats())
             except KeyboardInterrupt:
+                speech.cancel()  # barge-in: stop mid-sentence
                 print("\nJack: Goodbye!")
                 break
             except Exception as e:
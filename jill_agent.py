@@ -2,114 +2,62 @@ import os
 import sys
 import time
 import re
-from groq import Groq
 from dotenv import load_dotenv
+from llm_gateway import chat, require_backend
+from tts import SpeechService, clean_for_speech, speak_llm_reply
+from stt import Listener
+from conversation import ConversationHistory
+from prompt_registry import get_prompt, prefix_id, registry
 import speech_recognition as sr
-import pyttsx3
 
 # Load environment variables
 load_dotenv()
-# Global Groq client
-client = None
-
-def init_groq():
-    """Initialize Groq client"""
-    global client
-    api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
-        print("Error: GROQ_API_KEY not found in environment variables.")
-        print("Please create a .env file with GROQ_API_KEY=your_key")
-        sys.exit(1)
-    client = Groq(api_key=api_key)
-    return client
 
-def groq_call(messages, model="llama-3.3-70b-versatile", temperature=0.7):
-    """Helper to call Groq API"""
-    response = client.chat.completions.create(
-        model=model,
-        messages=messages,
-        temperature=temperature
-    )
-    return response.choices[0].message.content
 
+PERSONA = "jill_persona"
 
 def load_system_prompt():
     try:
-        with open("prompts/jill_persona.md", "r", encoding="utf-8") as f:
-            return f.read()
+        return get_prompt(PERSONA)
     except FileNotFoundError:
         print("Error: prompts/jill_persona.md not found.")
         sys.exit(1)
 
-def init_engine():
-    """Initializes the TTS engine with female voice and slower speed."""
-    engine = pyttsx3.init()
-    
-    # Set Rate (Speed) - Slower for better clarity
-    rate = engine.getProperty('rate')
-    engine.setProperty('rate', rate)  # Standard speed (removed slowdown)
-    
-    # Set Voice (Female)
-    voices = engine.getProperty('voices')
-    target_voice = None
-    
-    # Look for "Zira" (common Windows female voice) or just "Female"
-    for voice in voices:
-        if "zira" in voice.name.lower() or "female" in voice.name.lower():
-            target_voice = voice.id
-            break
-            
-    if target_voice:
-        engine.setProperty('voice', target_voice)
-    else:
-        print("Warning: No female voice found. Using default.")
-            
-    return engine
+# One long-lived TTS engine (female voice, looked up once); utterances queue to its own thread
+speech = SpeechService(
+    voice_keywords=("zira", "female"),
+    missing_voice_warning="Warning: No female voice found. Using default."
+)
 
 def speak(text):
-    """Speaks the text using a fresh engine instance."""
-    try:
-        # Clean text for speech: remove ALL markdown and asterisks
-        clean_text = re.sub(r'\*.*?\*', '', text)  # Remove *text*
-        clean_text = clean_text.replace("*", "")  # Remove standalone asterisks
-        clean_text = clean_text.replace("#", "").replace("- ", "")
-        
-        print(f"[Debug] Speaking: {clean_text[:50]}...")
-        engine = init_engine()
-        engine.say(clean_text)
-        engine.runAndWait()
-        print("[Debug] Speech finished.")
-    except Exception as e:
-        print(f"Error in TTS: {e}")
+    """Speaks the text on the shared speech service and waits until it has been played."""
+    print(f"[Debug] Speaking: {clean_for_speech(text)[:50]}...")
+    speech.speak(text)
+    print("[Debug] Speech finished.")
+
+# One long-lived microphone listener: calibrated once, stream kept open between turns
+listener = Listener(pause_threshold=1.5)  # Wait 1.5 seconds before processing
 
 def listen():
     """Listens to the microphone and returns text."""
-    r = sr.Recognizer()
-    r.pause_threshold = 1.5  # Wait 1.5 seconds before processing
-    
-    with sr.Microphone() as source:
-        print("\nListening... (Speak now)")
-        # Adjust for ambient noise - reduced duration for faster response
-        r.adjust_for_ambient_noise(source, duration=0.3)
-        try:
-            audio = r.listen(source, timeout=10, phrase_time_limit=None)
-            print("Recognizing...")
-            text = r.recognize_google(audio)
-            print(f"You said: {text}")
-            return text
-        except sr.WaitTimeoutError:
-            message = "I can't hear you. Could you please repeat that?"
-            print(f"Jill: {message}")
-            speak(message)
-            return None
-        except sr.UnknownValueError:
-            message = "I didn't catch that. Could you say it again?"
-            print(f"Jill: {message}")
-            speak(message)
-            return None
-        except sr.RequestError as e:
-            print(f"Could not request results; {e}")
-            return None
+    print("\nListening... (Speak now)")
+    try:
+        text = listener.listen()
+        print(f"You said: {text}")
+        return text
+    except sr.WaitTimeoutError:
+        message = "I can't hear you. Could you please repeat that?"
+        print(f"Jill: {message}")
+        speak(message)
+        return None
+    except sr.UnknownValueError:
+        message = "I didn't catch that. Could you say it again?"
+        print(f"Jill: {message}")
+        speak(message)
+        return None
+    except sr.RequestError as e:
+        print(f"Could not request results; {e}")
+        return None
 
 def generate_job_spec(messages, jd_content=None):
     """Generates a job specification document based on the conversation and optional job description."""
@@ -155,9 +103,9 @@ If there are any discrepancies between the conversation and the job description,
         """
         messages.append({"role": "user", "content": prompt})
         
-        # Call Groq to generate
+        # Call the LLM to generate
         model_name = "llama-3.3-70b-versatile"
-        response_text = groq_call(messages, model_name)
+        response_text = chat(messages, model_name, prefix_id=prefix_id(PERSONA))
         messages.append({"role": "assistant", "content": response_text})
         
         # Extract job title from response
@@ -272,7 +220,7 @@ Provide:
 Format: Start with "MATCH_SCORE: X.XX" then your analysis."""
 
             match_messages = [{"role": "user", "content": match_prompt}]
-            analysis = groq_call(match_messages)
+            analysis = chat(match_messages)
             
             score_line = [line for line in analysis.split('\n') if 'MATCH_SCORE' in line]
             match_score = 0.0
@@ -308,12 +256,16 @@ Would you like me to reach out to see if they're interested?"""
 
 
 def main():
-    init_groq()
+    require_backend()
+    # Engine and voice are set up once here, not before every utterance
+    speech.start()
+    listener.open()
 
     system_prompt = load_system_prompt()
+    print(f"📚 Persona {prefix_id(PERSONA)}: {registry.tokens(PERSONA):,} tokens per turn")
     
     # Initialize database
-    from database import init_database, get_agent_messages, mark_message_read, add_job
+    from database import init_database, get_agent_messages, mark_messages_read_bulk, add_job
     init_database()
     
     # Read messages from Jack (legacy system) - REMOVED
@@ -352,8 +304,8 @@ def main():
                     title = j.get('title', 'Unknown')
                     print(f"      • {company} - {title[:30]}...")
                 print()
-            
-            mark_message_read(msg['id'])
+        
+        mark_messages_read_bulk(msg['id'] for msg in scout_messages)
         
         print("   💡 Run `python linkedin_outreach.py` to generate hiring manager messages.\n")
     else:
@@ -365,9 +317,8 @@ def main():
     model_name = "llama-3.3-70b-versatile"
     
     try:
-        messages = [{"role": "system", "content": system_prompt}]
-
-        # Using messages array for Groq
+        # Conversation history: recent turns verbatim, older ones summarized to stay within budget
+        history = ConversationHistory(system_prompt, assistant="Jill", user="Hiring manager")
         
         context_parts = []
         if job_input:
@@ -378,9 +329,9 @@ def main():
         if context_parts:
             context_prompt = "\n".join(context_parts) + "\n\nPlease acknowledge these details. If a Candidate Profile is provided, mention if they might be a fit for this new role or if we need a different profile. Start the conversation naturally."
             print(f"\n📄 Loading Context (Job Input: {'Yes' if job_input else 'No'}, Candidate Profile: {'Yes' if candidate_profile else 'No'})...")
-            messages.append({"role": "user", "content": context_prompt})
-            intro_text = groq_call(messages, model_name)
-            messages.append({"role": "assistant", "content": intro_text})
+            history.add("user", context_prompt, pin=True)
+            intro_text = chat(history.prompt_messages(), model_name, prefix_id=prefix_id(PERSONA))
+            history.add("assistant", intro_text, pin=True)
         else:
             intro_text = "Hello! I'm Jill, your Talent Acquisition Partner. It's a pleasure to meet you. How can I help you build your team today? What role are we looking to fill?"
 
@@ -445,7 +396,7 @@ def main():
                             speak(no_jd_msg)
                     
                     # Generate job spec with optional JD cross-reference
-                    result = generate_job_spec(messages, jd_content=jd_content)
+                    result = generate_job_spec(history.full_messages(), jd_content=jd_content)
                     
                     if result and result[0]:
                         filename, job_spec_content = result
@@ -509,7 +460,7 @@ Please generate an UPDATED version incorporating their feedback. Keep the same f
 
                                 print("\n🔄 Updating job specification...")
                                 update_messages = [{"role": "system", "content": system_prompt}, {"role": "user", "content": update_prompt}]
-                                updated_content = groq_call(update_messages)
+                                updated_content = chat(update_messages, prefix_id=prefix_id(PERSONA))
                                 
                                 # Extract updated content
                                 for line in updated_content.split('\n'):
@@ -526,13 +477,15 @@ Please generate an UPDATED version incorporating their feedback. Keep the same f
                         speak(error_msg)
                     break  # Exit main conversation loop
 
-                messages.append({"role": "user", "content": user_input})
-                response_text = groq_call(messages, model_name)
-                messages.append({"role": "assistant", "content": response_text})
-                print(f"\nJill: {response_text}")
-                speak(response_text)
+                history.add("user", user_input)
+                # Streamed: the first sentence is spoken while the rest is still being generated
+                response_text = speak_llm_reply("Jill", history.prompt_messages(), model_name, speak,
+                                                prefix_id=prefix_id(PERSONA))
+                history.add("assistant", response_text)
+                print(history.format_stats())
 
             except KeyboardInterrupt:
+                speech.cancel()  # barge-in: stop mid-sentence
                 print("\nJill: Goodbye!")
                 break
             except Exception as e:
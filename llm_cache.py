@@ -0,0 +1,119 @@
+"""
+LLM Response Cache - Persistent, content-addressed cache for LLM completions
+Keys hash the model, prompt template version, temperature and normalized messages, so
+re-running Scout or the boardroom over unchanged data skips the LLM entirely.
+Entries expire after a TTL and the table is trimmed least-recently-used first. Callers that
+parse replies pass a validator, so replies that fail it are neither stored nor served.
+"""
+
+import os
+import json
+import time
+import hashlib
+
+from database import get_connection, transaction
+
+CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") != "0"
+CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))
+
+# Trim the table every this many writes (and at the end of a run via evict())
+EVICT_EVERY_WRITES = 500
+
+_stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+
+def _normalize(text):
+    return " ".join((text or "").split())
+
+
+def cache_key(model, prompt_version, temperature, messages):
+    """Stable SHA-256 key for a chat request."""
+    payload = json.dumps({
+        "model": model,
+        "prompt_version": prompt_version,
+        "temperature": temperature,
+        "messages": [[m.get("role"), _normalize(m.get("content"))] for m in messages],
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get(key, validate=None):
+    """
+    Return the cached response for `key`, or None on a miss/expired entry.
+    With `validate` (fn(response) -> bool), a stored response it rejects counts as a miss.
+    """
+    if not CACHE_ENABLED:
+        return None
+    now = time.time()
+    conn = get_connection()
+    row = conn.execute('SELECT response, created_at FROM llm_cache WHERE cache_key = ?', (key,)).fetchone()
+    if (row is None or now - row['created_at'] > CACHE_TTL_SECONDS
+            or (validate is not None and not validate(row['response']))):
+        _stats["misses"] += 1
+        return None
+    with transaction() as conn:
+        conn.execute('UPDATE llm_cache SET last_accessed = ? WHERE cache_key = ?', (now, key))
+    _stats["hits"] += 1
+    return row['response']
+
+
+def put(key, model, prompt_version, response, validate=None):
+    """Store a response. Error strings/None, and responses `validate` rejects, are never cached."""
+    if not CACHE_ENABLED or not isinstance(response, str):
+        return
+    if validate is not None and not validate(response):
+        return
+    now = time.time()
+    with transaction() as conn:
+        conn.execute('''
+            INSERT OR REPLACE INTO llm_cache (cache_key, model, prompt_version, response, created_at, last_accessed)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (key, model, prompt_version, response, now, now))
+    _stats["writes"] += 1
+    if _stats["writes"] % EVICT_EVERY_WRITES == 0:
+        evict()
+
+
+def evict():
+    """Drop expired entries, then the least recently used ones beyond CACHE_MAX_ENTRIES."""
+    with transaction() as conn:
+        expired = conn.execute(
+            'DELETE FROM llm_cache WHERE created_at < ?', (time.time() - CACHE_TTL_SECONDS,)
+        ).rowcount
+        overflow = conn.execute('''
+            DELETE FROM llm_cache WHERE cache_key IN (
+                SELECT cache_key FROM llm_cache
+                ORDER BY last_accessed DESC
+                LIMIT -1 OFFSET ?
+            )
+        ''', (CACHE_MAX_ENTRIES,)).rowcount
+    _stats["evictions"] += expired + overflow
+    return expired + overflow
+
+
+def cached_call(model, prompt_version, temperature, messages, call, validate=None):
+    """
+    Return the cached reply for this request, or run `call()` and cache its string result.
+    With `validate`, only replies it accepts are served from or written to the cache.
+    """
+    key = cache_key(model, prompt_version, temperature, messages)
+    response = get(key, validate)
+    if response is None:
+        response = call()
+        put(key, model, prompt_version, response, validate)
+    return response
+
+
+def get_stats():
+    """Hit/miss counters for this process."""
+    stats = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
+
+
+def print_stats():
+    stats = get_stats()
+    print(f"   💾 LLM cache: {stats['hits']} hits / {stats['misses']} misses "
+          f"({stats['hit_rate']:.0%} hit rate)")
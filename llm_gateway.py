@@ -0,0 +1,222 @@
+"""
+LLM Gateway - One shared, lazily created LLM client for every agent
+Jack, Jill, Scout and the boardroom all call the model through here: the client is only
+built on first use, one pooled keep-alive HTTP session is reused by every call in the
+process, every request carries a timeout, and the backend is pluggable so a local stub
+server (or an in-process fake) can stand in for Groq in tests and benchmarks.
+"""
+
+import os
+import sys
+import threading
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+MODEL_NAME = "llama-3.3-70b-versatile"
+
+# "groq" (default; point LLM_BASE_URL at a local stub server to test over HTTP) or "fake"
+LLM_BACKEND = os.getenv("LLM_BACKEND", "groq")
+LLM_BASE_URL = os.getenv("LLM_BASE_URL") or None
+
+# Per-call timeouts (seconds)
+REQUEST_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+CONNECT_TIMEOUT_SECONDS = float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", "5"))
+
+# HTTP connection pool shared by every call in the process
+MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "32"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "16"))
+KEEPALIVE_EXPIRY_SECONDS = 60.0
+
+
+def _timeout():
+    return httpx.Timeout(REQUEST_TIMEOUT_SECONDS, connect=CONNECT_TIMEOUT_SECONDS)
+
+
+def _limits():
+    return httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS
+    )
+
+# ============================================================
+# BACKENDS
+# ============================================================
+# A backend is a pair of factories returning objects with the chat-completions interface:
+#   sync:  client.chat.completions.create(model=..., messages=..., **kwargs)
+#   async: await client.chat.completions.create(model=..., messages=..., **kwargs)
+
+def _groq_sync(**options):
+    from groq import Groq
+    return Groq(
+        api_key=options.get("api_key") or os.getenv("GROQ_API_KEY") or "local-stub",
+        base_url=options.get("base_url", LLM_BASE_URL),
+        timeout=_timeout(),
+        max_retries=options.get("max_retries", 2),
+        http_client=httpx.Client(limits=_limits(), timeout=_timeout())
+    )
+
+
+def _groq_async(**options):
+    # SDK retries off - the ScoringEngine owns retry/backoff
+    from groq import AsyncGroq
+    return AsyncGroq(
+        api_key=options.get("api_key") or os.getenv("GROQ_API_KEY") or "local-stub",
+        base_url=options.get("base_url", LLM_BASE_URL),
+        timeout=_timeout(),
+        max_retries=0,
+        http_client=httpx.AsyncClient(limits=_limits(), timeout=_timeout())
+    )
+
+
+def _fake_sync(**options):
+    from fake_llm import FakeLLMClient
+    return FakeLLMClient(**options)
+
+
+def _fake_async(**options):
+    from fake_llm import FakeAsyncLLMClient
+    return FakeAsyncLLMClient(**options)
+
+
+_BACKENDS = {
+    "groq": (_groq_sync, _groq_async),
+    "fake": (_fake_sync, _fake_async),
+}
+
+# Request parameter each backend takes for a prompt-prefix cache key (prompt_registry prefix
+# IDs). Groq caches identical prefixes on its own and rejects unknown parameters, so it gets none.
+_PREFIX_CACHE_PARAMS = {
+    "fake": "prompt_cache_key",
+}
+
+
+def register_backend(name, sync_factory, async_factory, prefix_cache_param=None):
+    """
+    Add a backend: factories take the configure() options and return chat-completions clients.
+    `prefix_cache_param` names the request option that carries a prefix_id, if the backend has one.
+    """
+    _BACKENDS[name] = (sync_factory, async_factory)
+    if prefix_cache_param:
+        _PREFIX_CACHE_PARAMS[name] = prefix_cache_param
+    else:
+        _PREFIX_CACHE_PARAMS.pop(name, None)
+
+# ============================================================
+# SHARED CLIENT
+# ============================================================
+
+_lock = threading.Lock()
+_client = None
+_client_pid = None
+_backend = LLM_BACKEND
+_options = {}
+
+
+def configure(backend=None, **options):
+    """
+    Select the backend (and its options, e.g. base_url or latency) for every later call.
+    Drops the current client so the next call builds a new one.
+    """
+    global _backend, _options
+    if backend is not None and backend not in _BACKENDS:
+        raise ValueError(f"Unknown LLM backend {backend!r} (known: {', '.join(sorted(_BACKENDS))})")
+    with _lock:
+        _backend = backend or _backend
+        _options = options
+    reset()
+
+
+def require_backend():
+    """For CLI entry points: exit with a helpful message if the Groq backend has no API key."""
+    if _backend == "groq" and not _options.get("api_key") and not LLM_BASE_URL and not os.getenv("GROQ_API_KEY"):
+        print("Error: GROQ_API_KEY not found in environment variables.")
+        print("Please create a .env file with GROQ_API_KEY=your_key")
+        sys.exit(1)
+
+
+def get_client():
+    """
+    The process-wide sync client, created on first use.
+    A forked child (e.g. a shard worker) builds its own instead of sharing the parent's sockets.
+    """
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is None or _client_pid != pid:
+        with _lock:
+            if _client is None or _client_pid != pid:
+                _client = _BACKENDS[_backend][0](**_options)
+                _client_pid = pid
+    return _client
+
+
+def new_async_client():
+    """A fresh async client with its own connection pool (async pools are bound to one event loop)."""
+    return _BACKENDS[_backend][1](**_options)
+
+
+def reset():
+    """Close the shared client (if this process owns it) so the next call creates a new one."""
+    global _client, _client_pid
+    with _lock:
+        if _client is not None and _client_pid == os.getpid() and hasattr(_client, "close"):
+            _client.close()
+        _client = None
+        _client_pid = None
+
+# ============================================================
+# CALLS
+# ============================================================
+
+def _prefix_cache_kwargs(prefix_id):
+    param = _PREFIX_CACHE_PARAMS.get(_backend)
+    return {param: prefix_id} if prefix_id and param else {}
+
+
+def chat(messages, model=MODEL_NAME, temperature=0.7, timeout=None, prefix_id=None, **kwargs):
+    """
+    One chat completion through the shared client.
+
+    Args:
+        messages: Chat messages
+        model: Model name
+        temperature: Sampling temperature
+        timeout: Per-call timeout in seconds (default REQUEST_TIMEOUT_SECONDS)
+        prefix_id: Stable ID of the prompt the messages start with (prompt_registry), passed
+            to backends with prefix caching so they can reuse it; ignored by the others
+        **kwargs: Extra request options (e.g. response_format)
+
+    Returns:
+        The reply text
+    """
+    response = get_client().chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        timeout=timeout if timeout is not None else REQUEST_TIMEOUT_SECONDS,
+        **_prefix_cache_kwargs(prefix_id),
+        **kwargs
+    )
+    return response.choices[0].message.content
+
+
+def chat_stream(messages, model=MODEL_NAME, temperature=0.7, timeout=None, prefix_id=None, **kwargs):
+    """
+    Like chat(), but yields the reply as text deltas while the model is still generating.
+    The request is only sent once the generator is first iterated.
+    """
+    stream = get_client().chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        timeout=timeout if timeout is not None else REQUEST_TIMEOUT_SECONDS,
+        stream=True,
+        **_prefix_cache_kwargs(prefix_id),
+        **kwargs
+    )
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
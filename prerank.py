@@ -0,0 +1,216 @@
+"""
+Pre-Ranker - Cheap local first stage for candidate/job matching
+Scores every candidate against a job with BM25 over profile/spec text plus normalized
+skill overlap, using sparse matrix math, so only the top-K go to the LLM stages.
+"""
+
+import os
+import re
+import json
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+from database import iter_candidates, normalize_skill
+
+# How many candidates per job survive to the (expensive) LLM stages
+PRERANK_TOP_K = int(os.getenv("PRERANK_TOP_K", "20"))
+
+# BM25 parameters and the weight of skill overlap relative to normalized BM25
+BM25_K1 = 1.5
+BM25_B = 0.75
+SKILL_OVERLAP_WEIGHT = 1.0
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "our", "the", "to", "we", "with", "you", "your", "will", "this"
+}
+
+# ============================================================
+# TEXT EXTRACTION
+# ============================================================
+
+def tokenize(text):
+    """Lowercase word tokens with stopwords removed (keeps c++ / c# style tokens)."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+def _json_list(value):
+    if isinstance(value, list):
+        return value
+    try:
+        items = json.loads(value) if value else []
+    except (TypeError, ValueError):
+        return []
+    return items if isinstance(items, list) else []
+
+def _read_file(path):
+    """Read a generated profile/spec file if it exists, else empty text."""
+    if path and os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            pass
+    return ""
+
+def candidate_text(candidate):
+    """All searchable text for a candidate row."""
+    parts = [
+        candidate.get('name') or "",
+        candidate.get('headline') or "",
+        " ".join(str(s) for s in _json_list(candidate.get('skills'))),
+        _read_file(candidate.get('profile_file')),
+    ]
+    return "\n".join(parts)
+
+def job_text(job):
+    """All searchable text for a job row."""
+    parts = [
+        job.get('title') or "",
+        job.get('company') or "",
+        " ".join(str(r) for r in _json_list(job.get('requirements'))),
+        _read_file(job.get('spec_file')),
+    ]
+    return "\n".join(parts)
+
+# ============================================================
+# PRE-RANKER
+# ============================================================
+
+class PreRanker:
+    """
+    In-memory BM25 + skill-overlap index over a candidate pool.
+
+    Only candidate IDs and sparse term weights are kept, so the index stays small even
+    when the candidate rows themselves are streamed from the database.
+    """
+
+    def __init__(self, candidates, k1=BM25_K1, b=BM25_B):
+        self.ids = []
+        self.vocab = {}
+        self.skill_vocab = {}
+        
+        rows, cols, counts, doc_lengths = [], [], [], []
+        skill_rows, skill_cols = [], []
+        
+        for i, candidate in enumerate(candidates):
+            self.ids.append(candidate['id'])
+            tokens = tokenize(candidate_text(candidate))
+            doc_lengths.append(len(tokens))
+            for term, tf in Counter(tokens).items():
+                rows.append(i)
+                cols.append(self.vocab.setdefault(term, len(self.vocab)))
+                counts.append(tf)
+            
+            skills = {normalize_skill(s) for s in _json_list(candidate.get('skills'))} - {""}
+            for skill in skills:
+                skill_rows.append(i)
+                skill_cols.append(self.skill_vocab.setdefault(skill, len(self.skill_vocab)))
+        
+        n_docs = len(self.ids)
+        self.id_index = {cid: i for i, cid in enumerate(self.ids)}
+        
+        # BM25 document weights: idf(t) * tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl / avgdl))
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        tf = np.asarray(counts, dtype=np.float64)
+        doc_lengths = np.asarray(doc_lengths, dtype=np.float64)
+        avgdl = doc_lengths.mean() if n_docs and doc_lengths.mean() > 0 else 1.0
+        
+        df = np.bincount(cols, minlength=len(self.vocab)).astype(np.float64)
+        idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+        norm = k1 * (1 - b + b * doc_lengths[rows] / avgdl) if n_docs else np.zeros(0)
+        weights = idf[cols] * tf * (k1 + 1) / (tf + norm)
+        
+        self.bm25 = sparse.csc_matrix((weights, (rows, cols)), shape=(n_docs, len(self.vocab)))
+        self.skills = sparse.csc_matrix(
+            (np.ones(len(skill_rows)), (skill_rows, skill_cols)),
+            shape=(n_docs, len(self.skill_vocab))
+        )
+
+    @classmethod
+    def from_database(cls, **kwargs):
+        """Build the index by streaming every candidate from the database."""
+        return cls(iter_candidates(), **kwargs)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def score_many(self, jobs):
+        """
+        First-stage scores for every candidate against several jobs at once.
+
+        Returns:
+            Dense (n_candidates, n_jobs) array - normalized BM25 plus weighted skill overlap
+        """
+        n_docs = len(self.ids)
+        if not n_docs or not jobs:
+            return np.zeros((n_docs, len(jobs)))
+        
+        # Binary query matrices (terms x jobs) for text and skills
+        q_rows, q_cols, s_rows, s_cols, s_weights = [], [], [], [], []
+        for j, job in enumerate(jobs):
+            for col in {self.vocab[t] for t in tokenize(job_text(job)) if t in self.vocab}:
+                q_rows.append(col)
+                q_cols.append(j)
+            requirements = {normalize_skill(r) for r in _json_list(job.get('requirements'))} - {""}
+            for r in requirements:
+                if r in self.skill_vocab:
+                    s_rows.append(self.skill_vocab[r])
+                    s_cols.append(j)
+                    s_weights.append(1.0 / len(requirements))
+        
+        queries = sparse.csc_matrix(
+            (np.ones(len(q_rows)), (q_rows, q_cols)), shape=(len(self.vocab), len(jobs))
+        )
+        skill_queries = sparse.csc_matrix(
+            (s_weights, (s_rows, s_cols)), shape=(len(self.skill_vocab), len(jobs))
+        )
+        
+        bm25 = (self.bm25 @ queries).toarray()
+        peaks = bm25.max(axis=0)
+        bm25 /= np.where(peaks > 0, peaks, 1.0)
+        overlap = (self.skills @ skill_queries).toarray()
+        return bm25 + SKILL_OVERLAP_WEIGHT * overlap
+
+    def score(self, job):
+        """Dense array of first-stage scores for every candidate against one job."""
+        return self.score_many([job])[:, 0]
+
+    def _top_k(self, scores, top_k):
+        candidates = np.flatnonzero(np.isfinite(scores))
+        if len(candidates) > top_k:
+            part = np.argpartition(-scores[candidates], top_k - 1)[:top_k]
+            candidates = candidates[part]
+        # Best score first; ties keep database order for stable shortlists
+        order = np.lexsort((candidates, -scores[candidates]))
+        return [(self.ids[i], float(scores[i])) for i in candidates[order]]
+
+    def shortlist(self, job, top_k=PRERANK_TOP_K, allowed_ids=None):
+        """
+        Top-K candidates for a job.
+
+        Args:
+            job: Job row (dict)
+            top_k: Number of candidates to keep
+            allowed_ids: Optional set of candidate IDs to restrict the ranking to
+
+        Returns:
+            List of (candidate_id, score), best first
+        """
+        scores = self.score(job)
+        if allowed_ids is not None:
+            mask = np.full(len(self.ids), -np.inf)
+            idx = [self.id_index[cid] for cid in allowed_ids if cid in self.id_index]
+            mask[idx] = 0.0
+            scores = scores + mask
+        
+        return self._top_k(scores, top_k)
+
+    def shortlist_many(self, jobs, top_k=PRERANK_TOP_K):
+        """Top-K candidates for several jobs. Returns {job_id: [(candidate_id, score), ...]}."""
+        jobs = list(jobs)
+        scores = self.score_many(jobs)
+        return {job['id']: self._top_k(scores[:, j], top_k) for j, job in enumerate(jobs)}
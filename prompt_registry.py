@@ -0,0 +1,138 @@
+"""
+Prompt Registry - Persona and instruction prompts, loaded once and versioned by hash
+Every prompts/*.md file is read and hashed once; later lookups are served from memory and
+only re-read when the file's mtime changes (edits are picked up without a restart). Each
+prompt has a stable prefix ID derived from its content hash, which the LLM gateway passes
+to backends that support prompt/KV prefix caching, and a token count so the per-turn cost
+of each persona is visible.
+
+Usage:
+    python prompt_registry.py        # per-prompt size / token report
+"""
+
+import os
+import sys
+import glob
+import hashlib
+import threading
+
+from scoring_engine import estimate_tokens
+
+PROMPTS_DIR = os.getenv("PROMPTS_DIR", "prompts")
+
+
+class Prompt:
+    """One loaded prompt file."""
+
+    def __init__(self, name, path, text, mtime_ns):
+        self.name = name
+        self.path = path
+        self.text = text
+        self.mtime_ns = mtime_ns
+        self.sha256 = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        self.tokens = estimate_tokens([{"content": text}])
+
+    @property
+    def prefix_id(self):
+        """Stable across processes and restarts; changes only when the content does."""
+        return f"{self.name}:{self.sha256[:16]}"
+
+
+class PromptRegistry:
+    """
+    Thread-safe cache of prompt files in one directory.
+
+    Usage:
+        registry = PromptRegistry("prompts")
+        text = registry.get("jack_persona")           # or "jack_persona.md"
+        key = registry.prefix_id("jack_persona")      # "jack_persona:1f2e..."
+    """
+
+    def __init__(self, directory=PROMPTS_DIR):
+        self.directory = directory
+        self._prompts = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.reloads = 0
+
+    @staticmethod
+    def _name(name):
+        return os.path.splitext(os.path.basename(name))[0]
+
+    def _path(self, name):
+        return os.path.join(self.directory, f"{name}.md")
+
+    def load_all(self):
+        """Load (or refresh) every prompt file in the directory; returns the loaded names."""
+        names = [self._name(path) for path in sorted(glob.glob(os.path.join(self.directory, "*.md")))]
+        for name in names:
+            self.entry(name)
+        return names
+
+    def entry(self, name):
+        """
+        The Prompt for `name`, re-read only if its file changed since it was loaded.
+        Raises FileNotFoundError if the file does not exist.
+        """
+        name = self._name(name)
+        path = self._path(name)
+        mtime_ns = os.stat(path).st_mtime_ns
+        prompt = self._prompts.get(name)
+        if prompt is not None and prompt.mtime_ns == mtime_ns:
+            return prompt
+        with self._lock:
+            prompt = self._prompts.get(name)
+            if prompt is None or prompt.mtime_ns != mtime_ns:
+                with open(path, "r", encoding="utf-8") as f:
+                    text = f.read()
+                if prompt is not None:
+                    self.reloads += 1
+                    print(f"🔄 Reloaded prompt {name} ({prompt.sha256[:8]} -> "
+                          f"{hashlib.sha256(text.encode('utf-8')).hexdigest()[:8]})")
+                prompt = Prompt(name, path, text, mtime_ns)
+                self._prompts[name] = prompt
+                self.loads += 1
+        return prompt
+
+    def get(self, name):
+        return self.entry(name).text
+
+    def prefix_id(self, name):
+        return self.entry(name).prefix_id
+
+    def tokens(self, name):
+        return self.entry(name).tokens
+
+    def report(self):
+        """[{name, prefix_id, bytes, tokens}] for every prompt in the directory."""
+        return [
+            {"name": p.name, "prefix_id": p.prefix_id, "bytes": len(p.text.encode("utf-8")), "tokens": p.tokens}
+            for p in (self.entry(name) for name in self.load_all())
+        ]
+
+    def print_report(self):
+        rows = self.report()
+        print(f"\n📚 Prompts in {self.directory}/ (tokens are resent with every turn that uses them)\n")
+        print(f"{'prompt':<20} {'bytes':>8} {'tokens':>8}  prefix id")
+        for row in rows:
+            print(f"{row['name']:<20} {row['bytes']:>8,} {row['tokens']:>8,}  {row['prefix_id']}")
+
+# ============================================================
+# SHARED REGISTRY
+# ============================================================
+
+registry = PromptRegistry()
+
+
+def get_prompt(name):
+    return registry.get(name)
+
+
+def prefix_id(name):
+    return registry.prefix_id(name)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        registry.directory = sys.argv[1]
+    registry.print_report()
@@ -0,0 +1,97 @@
+"""
+Pruning Policy - Skip negotiation stages whose outcome is already decided
+Jill's review is skipped when Jack's score alone makes the acceptance bar unreachable,
+evaluation stops once a job has its first N accepted matches (if configured), and Scout's
+internal check stops at the first shortlist wave that clears its threshold. Every skipped
+LLM evaluation is counted so each run can report what pruning saved.
+"""
+
+import os
+from collections import Counter
+
+from scoring_engine import DEFAULT_CONCURRENCY
+
+# A pair is accepted when (jack_score + jill_score) / 2 > ACCEPT_THRESHOLD
+ACCEPT_THRESHOLD = 8
+# Highest score either agent can give
+MAX_AGENT_SCORE = 10
+# Stop negotiating a job after this many accepted matches (0 = evaluate the whole shortlist)
+MAX_ACCEPTED_PER_JOB = int(os.getenv("BOARDROOM_MAX_ACCEPTED", "0"))
+# Scout's internal match bar (0.0 - 1.0)
+SCOUT_MATCH_THRESHOLD = 0.7
+# Scout stops scoring a job's shortlist once any internal candidate clears the bar
+SCOUT_EARLY_EXIT = os.getenv("SCOUT_EARLY_EXIT", "1") == "1"
+# Candidates evaluated per wave when a stage can stop early (one wave fills the engine)
+PRUNE_WAVE_SIZE = int(os.getenv("PRUNE_WAVE_SIZE", str(DEFAULT_CONCURRENCY)))
+
+
+class PruningPolicy:
+    """
+    Decides which boardroom/Scout evaluations still matter and counts the ones skipped.
+
+    Usage:
+        policy = PruningPolicy()
+        for wave in policy.waves(shortlist, lambda: policy.job_full(accepted), "jack_eval"):
+            ...
+        policy.print_report()
+    """
+
+    def __init__(self, accept_threshold=ACCEPT_THRESHOLD, max_accepted=MAX_ACCEPTED_PER_JOB,
+                 scout_threshold=SCOUT_MATCH_THRESHOLD, scout_early_exit=SCOUT_EARLY_EXIT,
+                 wave_size=PRUNE_WAVE_SIZE):
+        self.accept_threshold = accept_threshold
+        self.max_accepted = max_accepted
+        self.scout_threshold = scout_threshold
+        self.scout_early_exit = scout_early_exit
+        self.wave_size = max(1, wave_size)
+        self.saved = Counter()
+
+    def is_accepted(self, avg_score):
+        return avg_score > self.accept_threshold
+
+    def jill_can_change_outcome(self, jack_score):
+        """False when even a perfect Jill score could not lift the average over the bar."""
+        return self.is_accepted((jack_score + MAX_AGENT_SCORE) / 2)
+
+    def prune_jill(self, jack_score):
+        """True (and counted) when Jill's review of this pitch can be skipped."""
+        if self.jill_can_change_outcome(jack_score):
+            return False
+        self.saved["jill_eval"] += 1
+        return True
+
+    def job_full(self, accepted):
+        """True once a job has reached its configured number of accepted matches."""
+        return bool(self.max_accepted) and accepted >= self.max_accepted
+
+    def waves(self, items, done, stage):
+        """
+        Yield `items` in evaluation waves, stopping as soon as done() is true.
+        Without a per-job cap everything goes in one wave so the whole list runs concurrently;
+        with one, the last wave may overshoot the cap by the pairs already in flight.
+        Items never yielded are counted as saved `stage` evaluations.
+        """
+        return self._waves(items, done, stage, bool(self.max_accepted))
+
+    def scout_waves(self, items, done):
+        """waves() for Scout's internal check, stopping early only when scout_early_exit is on."""
+        return self._waves(items, done, "match_score", self.scout_early_exit)
+
+    def _waves(self, items, done, stage, can_stop):
+        items = list(items)
+        size = self.wave_size if can_stop else max(1, len(items))
+        for start in range(0, len(items), size):
+            if can_stop and done():
+                self.saved[stage] += len(items) - start
+                return
+            yield items[start:start + size]
+
+    def total_saved(self):
+        return sum(self.saved.values())
+
+    def print_report(self):
+        if not self.saved:
+            print("   ✂️ Pruning: no LLM evaluations skipped")
+            return
+        detail = ", ".join(f"{stage}: {count}" for stage, count in sorted(self.saved.items()))
+        print(f"   ✂️ Pruning saved {self.total_saved()} LLM evaluation(s) ({detail})")
@@ -0,0 +1,193 @@
+"""
+Query Planner - Merges overlapping X-Ray searches before they are issued
+Scout builds one LinkedIn X-Ray query per job and per candidate, and many of them differ
+only in term order or case, or ask for a subset of another query's OR-terms. The planner
+canonicalizes every requested query, issues each equivalent query once, folds a query
+into a broader one that already covers it (same site and phrases, OR-groups that are
+supersets), and fans the results back to every requester. The covering query over-fetches
+for everyone it serves; a narrower requester keeps only the results that mention its own
+terms, and if too few do, its own query is issued after all. It reports queries issued
+vs requested.
+"""
+
+import re
+import threading
+
+import search
+
+_stats = {"requested": 0, "issued": 0, "identical": 0, "subsumed": 0, "reissued": 0}
+_stats_lock = threading.Lock()
+
+
+def _norm(term):
+    return " ".join(str(term).lower().split())
+
+
+def _mentions(text, term):
+    """Whole-word/phrase match, so "go" does not match "google"."""
+    return re.search(rf"(?<!\w){re.escape(term)}(?!\w)", text) is not None
+
+
+class XRayQuery:
+    """
+    A site-restricted query: every phrase must appear, and at least one term of each named
+    OR-group (e.g. "skills", "industries") must appear.
+
+    Usage:
+        q = XRayQuery("linkedin.com/in/", phrases=["Data Engineer"], groups={"skills": ["Python", "SQL"]})
+        q.render()   # 'site:linkedin.com/in/ "data engineer" ("python" OR "sql")'
+    """
+
+    def __init__(self, site, phrases=(), groups=None):
+        self.site = site
+        self.phrases = tuple(sorted({_norm(p) for p in phrases} - {""}))
+        self.groups = tuple(sorted(
+            (role, tuple(sorted({_norm(t) for t in terms} - {""})))
+            for role, terms in (groups or {}).items()
+            if {_norm(t) for t in terms} - {""}
+        ))
+
+    @property
+    def key(self):
+        """Identical for queries that differ only in order, case or whitespace."""
+        return (self.site, self.phrases, self.groups)
+
+    def covers(self, other):
+        """True if every result `other` asks for also satisfies this (broader or equal) query."""
+        if (self.site, self.phrases) != (other.site, other.phrases):
+            return False
+        other_groups = dict(other.groups)
+        return all(
+            role in other_groups and set(other_groups[role]) <= set(terms)
+            for role, terms in self.groups
+        )
+
+    def breadth(self):
+        """Sort key putting broader queries (fewer, larger OR-groups) first."""
+        return (len(self.groups), -sum(len(terms) for _, terms in self.groups))
+
+    def matches(self, result):
+        """Whether a search result's title/snippet mentions this query's phrases and groups."""
+        text = _norm(f"{result.get('title', '')} {result.get('body', '')}")
+        return (all(_mentions(text, p) for p in self.phrases)
+                and all(any(_mentions(text, t) for t in terms) for _, terms in self.groups))
+
+    def render(self):
+        parts = [f"site:{self.site}"]
+        parts += [f'"{p}"' for p in self.phrases]
+        parts += ["(" + " OR ".join(f'"{t}"' for t in terms) + ")" for _, terms in self.groups]
+        return " ".join(parts)
+
+    def __repr__(self):
+        return f"XRayQuery({self.render()!r})"
+
+
+class QueryPlan:
+    """
+    Collects the searches a run needs, then issues the smallest covering set.
+
+    Usage:
+        plan = QueryPlan()
+        for job in jobs:
+            plan.add(XRayQuery(...), limit=5)
+        results = plan.execute()    # one result list per add(), in order
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.issued = []          # [(query, max_results)]
+        self.assignment = []      # request index -> issued index
+        self.identical = 0
+        self.subsumed = 0
+        self.reissued = 0
+
+    def add(self, query, limit):
+        self.requests.append((query, limit))
+        return len(self.requests) - 1
+
+    def plan(self):
+        """
+        Choose the queries to issue and which one answers each request. A covering query
+        fetches the sum of the limits of the distinct queries it answers.
+        """
+        unique = {}
+        for query, limit in self.requests:
+            if query.key in unique:
+                self.identical += 1
+                unique[query.key] = (unique[query.key][0], max(unique[query.key][1], limit))
+            else:
+                unique[query.key] = (query, limit)
+
+        # Broadest first, so narrower queries find the query that covers them already issued
+        chosen = {}
+        families = {}
+        for key, (query, limit) in sorted(unique.items(), key=lambda item: (item[1][0].breadth(), item[0])):
+            family = families.setdefault((query.site, query.phrases), [])
+            cover = next((i for i in family if self.issued[i][0].covers(query)), None)
+            if cover is None:
+                cover = len(self.issued)
+                self.issued.append((query, limit))
+                family.append(cover)
+            else:
+                self.subsumed += 1
+                self.issued[cover] = (self.issued[cover][0], self.issued[cover][1] + limit)
+            chosen[key] = cover
+
+        self.assignment = [chosen[query.key] for query, _ in self.requests]
+        with _stats_lock:
+            _stats["requested"] += len(self.requests)
+            _stats["issued"] += len(self.issued)
+            _stats["identical"] += self.identical
+            _stats["subsumed"] += self.subsumed
+        return self.issued
+
+    def execute(self, search_many=None):
+        """
+        Issue the planned queries (through search.search_many) and fan results back out.
+        A request answered by a broader query gets only the results that match its own
+        terms; if fewer than its limit do, its own query is issued in a second round.
+        """
+        if not self.assignment and self.requests:
+            self.plan()
+        search_many = search_many or search.search_many
+        issued_results = search_many((query.render(), limit) for query, limit in self.issued) if self.issued else []
+
+        results = []
+        reissue = {}
+        for i, ((query, limit), cover) in enumerate(zip(self.requests, self.assignment)):
+            found = issued_results[cover]
+            if self.issued[cover][0].key != query.key:
+                found = [r for r in found if query.matches(r)]
+                if len(found) < limit:
+                    reissue.setdefault(query.key, (query, []))[1].append(i)
+            results.append(found[:limit])
+
+        if reissue:
+            pending = list(reissue.values())
+            limits = [max(self.requests[i][1] for i in indexes) for _, indexes in pending]
+            own_results = search_many((query.render(), limit) for (query, _), limit in zip(pending, limits))
+            for (_, indexes), found in zip(pending, own_results):
+                for i in indexes:
+                    results[i] = found[:self.requests[i][1]]
+            self.reissued = len(pending)
+            with _stats_lock:
+                _stats["issued"] += len(pending)
+                _stats["reissued"] += len(pending)
+        return results
+
+    @property
+    def issued_count(self):
+        return len(self.issued) + self.reissued
+
+
+def get_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["saved"] = stats["requested"] - stats["issued"]
+    return stats
+
+
+def print_stats():
+    stats = get_stats()
+    print(f"   🧭 Query plan: {stats['requested']} requested -> {stats['issued']} issued "
+          f"({stats['identical']} identical, {stats['subsumed']} subsumed, {stats['reissued']} re-issued)")
@@ -0,0 +1,226 @@
+"""
+Response Parsing - One structured-output layer for every LLM score extraction
+Asks for JSON mode where the model supports it, validates replies against a small schema,
+gives each invalid reply a single repair retry and counts outcomes per prompt type, so parse
+failures are bounded and visible instead of silently defaulting a score.
+"""
+
+import json
+from collections import defaultdict
+
+# Models that accept response_format={"type": "json_object"}
+JSON_MODE_MODELS = {
+    "llama-3.3-70b-versatile",
+    "llama-3.1-8b-instant",
+    "llama3-70b-8192",
+    "llama3-8b-8192",
+}
+
+# ============================================================
+# SCHEMAS
+# ============================================================
+# Field specs: type ("number" / "integer" / "string"), optional min/max, nullable.
+
+MATCH_SCORE_SCHEMA = {
+    "score": {"type": "number", "min": 0.0, "max": 1.0},
+    "reason": {"type": "string"},
+}
+
+JACK_EVAL_SCHEMA = {
+    "score": {"type": "number", "min": 0, "max": 10},
+    "pitch": {"type": "string", "nullable": True},
+}
+
+JILL_EVAL_SCHEMA = {
+    "score": {"type": "number", "min": 0, "max": 10},
+    "reason": {"type": "string"},
+}
+
+def batch_item_schema(schema):
+    """Schema for one element of a batched JSON array reply (adds the item id)."""
+    return dict(schema, id={"type": "integer", "min": 1})
+
+# ============================================================
+# PARSING & VALIDATION
+# ============================================================
+
+_stats = defaultdict(lambda: {"ok": 0, "repaired": 0, "failed": 0, "errors": 0})
+
+
+def json_mode_kwargs(model):
+    """Extra request kwargs enabling JSON mode for models that support it."""
+    if model in JSON_MODE_MODELS:
+        return {"response_format": {"type": "json_object"}}
+    return {}
+
+
+def extract_json(text, array=False):
+    """
+    Pull the JSON object (or array) out of a reply, tolerating code fences and prose.
+    Returns the decoded value or None.
+    """
+    if not isinstance(text, str):
+        return None
+    open_char, close_char = ("[", "]") if array else ("{", "}")
+    start, end = text.find(open_char), text.rfind(close_char)
+    if start == -1 or end <= start:
+        return None
+    try:
+        value = json.loads(text[start:end + 1])
+    except ValueError:
+        return None
+    return value if isinstance(value, list if array else dict) else None
+
+
+def validate(value, schema):
+    """Return a list of human-readable schema violations (empty when valid)."""
+    if not isinstance(value, dict):
+        return ["reply is not a JSON object"]
+    errors = []
+    for field, spec in schema.items():
+        if field not in value or value[field] is None:
+            if not spec.get("nullable"):
+                errors.append(f'"{field}" is required')
+            continue
+        item = value[field]
+        kind = spec["type"]
+        if kind in ("number", "integer"):
+            if isinstance(item, bool) or not isinstance(item, (int, float)) or (kind == "integer" and not float(item).is_integer()):
+                errors.append(f'"{field}" must be a {kind}')
+                continue
+            if "min" in spec and item < spec["min"]:
+                errors.append(f'"{field}" must be >= {spec["min"]}')
+            if "max" in spec and item > spec["max"]:
+                errors.append(f'"{field}" must be <= {spec["max"]}')
+        elif kind == "string" and (not isinstance(item, str) or not item.strip()):
+            errors.append(f'"{field}" must be a non-empty string')
+    return errors
+
+
+def parse_reply(text, schema):
+    """Parse and validate a single-object reply. Returns (value or None, errors)."""
+    value = extract_json(text)
+    if value is None:
+        return None, ["reply does not contain a JSON object"]
+    errors = validate(value, schema)
+    return (value, []) if not errors else (None, errors)
+
+
+def reply_is_valid(text, schema):
+    """Cache validator: True if the reply parses and satisfies `schema`."""
+    return parse_reply(text, schema)[0] is not None
+
+
+def repair_messages(messages, reply, errors, schema):
+    """Follow-up conversation asking the model to fix an invalid reply."""
+    fields = ", ".join(f'"{name}" ({spec["type"]})' for name, spec in schema.items())
+    return list(messages) + [
+        {"role": "assistant", "content": reply},
+        {"role": "user", "content": (
+            f"Your reply could not be used: {'; '.join(errors)}. "
+            f"Respond again with ONLY a JSON object with the fields {fields}."
+        )},
+    ]
+
+# ============================================================
+# STRUCTURED CALLS
+# ============================================================
+
+def structured_complete_many(message_lists, schema, prompt_type, complete_many):
+    """
+    Run requests, validate every reply and give invalid ones ONE repair retry.
+
+    Args:
+        message_lists: Chat messages for each request
+        schema: Field spec the reply object must satisfy
+        prompt_type: Label for the parse counters (e.g. "jack_eval")
+        complete_many: fn(list of messages) -> replies (str, or Exception for failed calls)
+
+    Returns:
+        Parsed dicts in input order; None where the call or both parse attempts failed
+    """
+    message_lists = list(message_lists)
+    if not message_lists:
+        return []
+    stats = _stats[prompt_type]
+    replies = complete_many(message_lists)
+    
+    results = [None] * len(message_lists)
+    to_repair = []
+    for i, reply in enumerate(replies):
+        if isinstance(reply, Exception):
+            stats["errors"] += 1
+            continue
+        value, errors = parse_reply(reply, schema)
+        if value is not None:
+            stats["ok"] += 1
+            results[i] = value
+        else:
+            to_repair.append((i, repair_messages(message_lists[i], reply, errors, schema)))
+    
+    if to_repair:
+        repaired = complete_many([messages for _, messages in to_repair])
+        for (i, _), reply in zip(to_repair, repaired):
+            value = None if isinstance(reply, Exception) else parse_reply(reply, schema)[0]
+            if value is not None:
+                stats["repaired"] += 1
+                results[i] = value
+            else:
+                stats["failed"] += 1
+    return results
+
+
+def structured_complete(messages, schema, prompt_type, complete):
+    """Single-request variant: complete(messages) -> str (may raise)."""
+    def complete_many(message_lists):
+        replies = []
+        for m in message_lists:
+            try:
+                replies.append(complete(m))
+            except Exception as e:
+                replies.append(e)
+        return replies
+    return structured_complete_many([messages], schema, prompt_type, complete_many)[0]
+
+
+def parse_batch_reply(text, item_schema, expected, prompt_type):
+    """
+    Validate a batched JSON array reply item by item.
+
+    Returns:
+        {item_id: value} for the valid items; ids outside 1..expected are ignored
+    """
+    valid = _valid_batch_items(text, item_schema, expected)
+    _stats[prompt_type]["ok" if valid is not None and len(valid) == expected else "failed"] += 1
+    return valid or {}
+
+
+def batch_reply_is_complete(text, item_schema, expected):
+    """Cache validator: True if the batched reply has a valid item for every id 1..expected."""
+    valid = _valid_batch_items(text, item_schema, expected)
+    return valid is not None and len(valid) == expected
+
+
+def _valid_batch_items(text, item_schema, expected):
+    items = extract_json(text, array=True)
+    if items is None:
+        return None
+    valid = {}
+    for item in items:
+        if not validate(item, item_schema) and 1 <= item["id"] <= expected:
+            valid[int(item["id"])] = item
+    return valid
+
+# ============================================================
+# COUNTERS
+# ============================================================
+
+def get_parse_stats():
+    """Per-prompt-type counters: ok / repaired / failed parses and failed calls (errors)."""
+    return {prompt_type: dict(counts) for prompt_type, counts in _stats.items()}
+
+
+def print_parse_stats():
+    for prompt_type, counts in sorted(get_parse_stats().items()):
+        print(f"   🧾 {prompt_type}: {counts['ok']} ok, {counts['repaired']} repaired, "
+              f"{counts['failed']} failed, {counts['errors']} call errors")
@@ -5,75 +5,433 @@ with Scout (Sourcer) acting as a fallback.
 """
 
 import os
-import sys
-import json
-import time
+import shutil
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from groq import Groq
 from dotenv import load_dotenv
 
 # Import database and Scout logic
-from database import init_database, get_all_candidates, get_all_jobs, add_match
-from scout_agent import calculate_match_score, search_linkedin_candidates
+from database import (
+    init_database, iter_jobs, count_candidates, count_jobs, add_matches_bulk, get_job_requirements,
+    delete_matches, get_boardroom_job_state, get_boardroom_pairs, record_boardroom_outcomes,
+    job_content_hash, candidate_content_hash, transaction
+)
+from scout_agent import search_linkedin_candidates, internal_candidate_pool, build_ranker, SHORTLIST_RANKER
+from scoring_engine import ScoringEngine
+from batch_eval import run_batched
+from pruning import PruningPolicy
+from transcript import TranscriptSink, rotate, jsonl_path_for
+from response_parsing import (
+    JACK_EVAL_SCHEMA, JILL_EVAL_SCHEMA, batch_item_schema, json_mode_kwargs,
+    structured_complete_many, reply_is_valid, print_parse_stats
+)
+import llm_cache
+import llm_gateway
 
 load_dotenv()
 
-# Setup Groq Client
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-MODEL_NAME = "llama-3.3-70b-versatile"
+MODEL_NAME = llm_gateway.MODEL_NAME
+
+# Concurrent scoring engine (the shared sync client lives in llm_gateway and is created on first use)
+scoring_engine = None
+
+def init_clients():
+    """(Re)create the LLM clients - runs at import and once in every shard worker process."""
+    global scoring_engine
+    llm_gateway.reset()
+    if scoring_engine is not None:
+        scoring_engine.close()
+    scoring_engine = ScoringEngine(model=MODEL_NAME, temperature=0.7)
+
+init_clients()
 
 TRANSCRIPT_FILE = "negotiation_log.md"
+# Buffered transcript writer: the main transcript, or the current job's segment inside a shard
+_sink = None
+
+# Prompt template versions - bump when a prompt changes so cached replies are not reused
+JILL_PITCH_PROMPT_VERSION = "boardroom-jill-pitch-v1"
+JACK_EVAL_PROMPT_VERSION = "boardroom-jack-eval-v2"
+JILL_EVAL_PROMPT_VERSION = "boardroom-jill-eval-v2"
+JACK_BATCH_PROMPT_VERSION = "boardroom-jack-batch-v2"
+JILL_BATCH_PROMPT_VERSION = "boardroom-jill-batch-v2"
 
 def log_to_transcript(speaker, text):
-    """Logs conversation to file and prints to console."""
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    formatted_text = f"**{speaker}**: {text}\n\n"
-    
-    print(f"\n[{timestamp}] {speaker}: {text}")
-    
-    with open(TRANSCRIPT_FILE, "a", encoding="utf-8") as f:
-        f.write(formatted_text)
+    """Prints an utterance and queues it for the transcript, which a background thread writes to disk."""
+    if _sink is None:
+        start_transcript(incremental=True)
+    _sink.write(speaker, text)
 
-def generate_agent_response(system_prompt, user_input):
-    """Generates an agent response using Groq."""
+def generate_agent_response(system_prompt, user_input, prompt_version=None):
+    """Generates an agent response via the shared LLM gateway (served from the LLM cache when prompt_version is given)."""
     try:
         messages = [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_input}
         ]
-        response = client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=messages,
-            temperature=0.7
-        )
-        return response.choices[0].message.content
+        call = lambda: llm_gateway.chat(messages, MODEL_NAME, 0.7)
+        if prompt_version is None:
+            return call()
+        return llm_cache.cached_call(MODEL_NAME, prompt_version, 0.7, messages, call)
     except Exception as e:
         return f"[Error: {e}]"
 
-def main():
+def generate_agent_responses(requests, prompt_version=None, validate=None):
+    """
+    Generates many agent responses concurrently via the async ScoringEngine.
+
+    Args:
+        requests: List of (system_prompt, user_input) pairs
+        validate: Optional cache validator(s) - replies they reject are not cached
+
+    Returns:
+        Responses in the same order; failed calls come back as "[Error: ...]" like generate_agent_response
+    """
+    replies = scoring_engine.run(
+        ([{"role": "system", "content": system_prompt}, {"role": "user", "content": user_input}]
+         for system_prompt, user_input in requests),
+        prompt_version=prompt_version, validate=validate
+    )
+    return [reply if isinstance(reply, str) else f"[Error: {reply}]" for reply in replies]
+
+def generate_structured_responses(requests, schema, prompt_type, prompt_version=None):
+    """
+    Like generate_agent_responses, but in JSON mode with schema validation and one repair retry.
+
+    Returns:
+        Parsed reply dicts in the same order; None where the reply could not be used
+    """
+    return structured_complete_many(
+        ([{"role": "system", "content": system_prompt}, {"role": "user", "content": user_input}]
+         for system_prompt, user_input in requests),
+        schema, prompt_type,
+        lambda message_lists: scoring_engine.run(
+            message_lists, prompt_version=prompt_version,
+            validate=lambda reply: reply_is_valid(reply, schema), **json_mode_kwargs(MODEL_NAME)
+        )
+    )
+
+# ============================================================
+# BATCHED EVALUATION PROMPTS
+# ============================================================
+
+def build_jack_batch_prompt(jill_pitch, candidate_blocks):
+    """One request in which Jack scores a whole batch of candidates."""
+    numbered = "\n".join(f"[{i}] {block}" for i, block in enumerate(candidate_blocks, 1))
+    prompt = f"""
+    You are Jack. Jill just pitched this role: "{jill_pitch}"
+    
+    Evaluate EACH candidate below independently.
+    
+    Step 1: Assign a score from 0-10 based on POTENTIAL and ADAPTABILITY.
+    - 10 = Perfect fit or high potential.
+    - 0 = Completely irrelevant.
+    
+    Step 2: Decide if you should pitch them.
+    - If Score >= 4, you MUST pitch them in 2 sentences explaining why they are a good bet. (Be flexible!)
+    - If Score < 4, set "pitch" to null.
+    
+    CANDIDATES:
+{numbered}
+    
+    Respond with ONLY a JSON array containing one object per candidate, using the candidate's number as "id":
+    [{{"id": 1, "score": 7, "pitch": "..."}}]
+    """
+    return prompt, "Evaluate the candidates."
+
+def build_jill_batch_prompt(job_title, job_reqs, pitch_blocks):
+    """One request in which Jill independently scores a whole batch of Jack's pitches."""
+    numbered = "\n".join(f"[{i}] {block}" for i, block in enumerate(pitch_blocks, 1))
+    prompt = f"""
+    You are Jill. Jack just pitched the candidates below for the {job_title} role.
+    
+    Real Job Requirements: {job_reqs}
+    
+    For EACH candidate:
+    Step 1: Assign your own INDEPENDENT score (0-10) based on requirements fit.
+    - Be critical but fair.
+    
+    Step 2: Provide your strict reasoning.
+    
+    PITCHES:
+{numbered}
+    
+    Respond with ONLY a JSON array containing one object per candidate, using the pitch number as "id":
+    [{{"id": 1, "score": 6, "reason": "..."}}]
+    """
+    return prompt, "Evaluate the pitches."
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Jack/Jill/Scout negotiation boardroom.")
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="Only negotiate jobs/candidates that are new or changed since the last run; "
+             "append to the transcript instead of starting a new one."
+    )
+    parser.add_argument(
+        "--batch-eval", action="store_true",
+        help="Pack many candidates into each Jack/Jill evaluation request (JSON array replies, "
+             "single-candidate fallback on parse failure)."
+    )
+    parser.add_argument(
+        "--jsonl", action="store_true",
+        help="Also write a machine-readable negotiation_log.jsonl (one JSON record per utterance)."
+    )
+    sharding = parser.add_mutually_exclusive_group()
+    sharding.add_argument(
+        "--workers", type=int, default=1,
+        help="Split the open jobs across this many worker processes and merge their transcripts."
+    )
+    sharding.add_argument(
+        "--shard", type=parse_shard, default=None, metavar="I/N",
+        help="Only negotiate shard I of N (every N-th job starting at I); writes transcript "
+             "segments for a later --merge-transcript."
+    )
+    sharding.add_argument(
+        "--merge-transcript", action="store_true",
+        help="Assemble the transcript from the segments written by --shard runs, in job order."
+    )
+    return parser.parse_args(argv)
+
+def needs_evaluation(pair_state, job_hash, candidate):
+    """True if a job/candidate pair has never been negotiated or either side changed since."""
+    return (
+        pair_state is None
+        or pair_state['job_hash'] != job_hash
+        or pair_state['candidate_hash'] != candidate_content_hash(candidate)
+    )
+
+def parse_shard(value):
+    """argparse type for --shard: "i/n" -> (i, n) with 0 <= i < n."""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/n, got {value!r}")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"shard index must be in 0..{count - 1}, got {value!r}")
+    return index, count
+
+# ============================================================
+# TRANSCRIPT & SHARDING
+# ============================================================
+
+def start_transcript(incremental, jsonl=False):
+    """
+    Initialize Log. Fresh runs rotate the previous transcript (negotiation_log.1.md, ...) and
+    start a new one; incremental runs append a new section to the existing transcript.
+    """
+    global _sink
+    close_transcript()
+    appending = incremental and os.path.exists(TRANSCRIPT_FILE)
+    if not appending:
+        rotate(TRANSCRIPT_FILE)
+        rotate(jsonl_path_for(TRANSCRIPT_FILE))
+    _sink = TranscriptSink(TRANSCRIPT_FILE, jsonl=jsonl)
+    if appending:
+        _sink.write_raw(f"## 🔁 Incremental run - {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n")
+    else:
+        _sink.write_raw("# 🤝 Agent Negotiation Transcript\n")
+        _sink.write_raw(f"**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n---\n\n")
+
+def close_transcript():
+    """Flush and close the current transcript writer."""
+    global _sink
+    if _sink is not None:
+        _sink.close()
+        _sink = None
+
+def shard_segment_dir():
+    """Directory holding one transcript segment per job while shards run."""
+    return TRANSCRIPT_FILE + ".shards"
+
+def merge_transcript_segments():
+    """Append every job's transcript segment (and JSONL segment) in job order, then delete them."""
+    segment_dir = shard_segment_dir()
+    if not os.path.isdir(segment_dir):
+        return 0
+    if _sink is not None:
+        _sink.flush()  # Header first
+    names = sorted(name for name in os.listdir(segment_dir) if name.endswith(".md"))
+    for ext, target in ((".md", TRANSCRIPT_FILE), (".jsonl", jsonl_path_for(TRANSCRIPT_FILE))):
+        paths = [os.path.join(segment_dir, os.path.splitext(name)[0] + ext) for name in names]
+        paths = [path for path in paths if os.path.exists(path)]
+        if not paths:
+            continue
+        with open(target, "a", encoding="utf-8") as out:
+            for path in paths:
+                with open(path, encoding="utf-8") as f:
+                    out.write(f.read())
+                os.remove(path)
+    shutil.rmtree(segment_dir, ignore_errors=True)
+    return len(names)
+
+def _init_shard_worker(initializer=None):
+    """Give each worker process its own LLM clients (plus an optional extra setup hook)."""
+    global _sink
+    # The parent's transcript sink came along with the fork, but its writer thread did not;
+    # shards write only their own job segments
+    _sink = None
+    init_clients()
+    if initializer is not None:
+        initializer()
+
+def run_sharded(args, workers, initializer=None):
+    """
+    Split the open jobs across `workers` processes (shard i takes every workers-th job from i),
+    then merge their transcript segments in job order.
+
+    Args:
+        args: Parsed boardroom arguments (passed to every shard)
+        workers: Number of worker processes / shards
+        initializer: Optional picklable hook run in every worker after its clients are created
+
+    Returns:
+        Combined run summary of all shards
+    """
+    shutil.rmtree(shard_segment_dir(), ignore_errors=True)
+    if SHORTLIST_RANKER == "embedding" and count_candidates():
+        build_ranker()  # Sync the shared embedding index once; shards only read it
+    if _sink is not None:
+        _sink.flush()  # Nothing buffered may be inherited by forked workers
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_shard_worker, initargs=(initializer,)) as pool:
+        futures = [pool.submit(negotiate_jobs, args, (i, workers)) for i in range(workers)]
+        summaries = [future.result() for future in futures]
+    merge_transcript_segments()
+    
+    combined = {"jobs": 0, "jobs_skipped": 0, "pairs_reused": 0, "pruned": {}}
+    for summary in summaries:
+        for key in ("jobs", "jobs_skipped", "pairs_reused"):
+            combined[key] += summary[key]
+        for stage, count in summary["pruned"].items():
+            combined["pruned"][stage] = combined["pruned"].get(stage, 0) + count
+    return combined
+
+# ============================================================
+# MAIN LOOP
+# ============================================================
+
+def main(argv=None):
+    args = parse_args(argv)
+    
     print("\n" + "="*60)
     print("🤝 AI AGENT MATCHING 'BOARDROOM'")
     print("="*60)
     
-    # Initialize Log
-    with open(TRANSCRIPT_FILE, "w", encoding="utf-8") as f:
-        f.write("# 🤝 Agent Negotiation Transcript\n")
-        f.write(f"**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n---\n\n")
-
-    init_database()
+    if args.merge_transcript:
+        start_transcript(args.incremental, args.jsonl)
+        merged = merge_transcript_segments()
+        close_transcript()
+        print(f"🧩 Merged {merged} job segment(s) into {TRANSCRIPT_FILE}")
+        return
     
-    jobs = get_all_jobs()
-    candidates = get_all_candidates()
+    init_database()
     
-    if not jobs:
+    if not count_jobs():
         print("❌ No jobs found in database. Run 'python jill_agent.py' first.")
         return
+    
+    # Only negotiating needs the LLM (--help and --merge-transcript work without an API key)
+    llm_gateway.require_backend()
+    
+    # A single --shard writes only its job segments; --merge-transcript assembles the log afterwards
+    if args.shard is None:
+        start_transcript(args.incremental, args.jsonl)
+    
+    if args.workers > 1:
+        print(f"🧩 Sharding jobs across {args.workers} worker processes...")
+        summary = run_sharded(args, args.workers)
+    else:
+        summary = negotiate_jobs(args, args.shard)
+    close_transcript()
+    
+    if args.incremental:
+        print(f"\n🔁 Incremental run: {summary['jobs_skipped']} unchanged job(s) skipped, {summary['pairs_reused']} earlier decision(s) reused.")
+    llm_cache.evict()
+    policy = PruningPolicy()
+    policy.saved.update(summary["pruned"])
+    policy.print_report()
+    if args.shard is None:
+        print(f"\n✅ Negotiation Complete! Read the full transcript in: {TRANSCRIPT_FILE}")
+    else:
+        print(f"\n✅ Shard {args.shard[0]}/{args.shard[1]} complete. Run with --merge-transcript once every shard has finished.")
+
+def negotiate_jobs(args, shard=None):
+    """
+    Run the boardroom for every open job, or with shard=(i, n) only for every n-th job from i.
+    Sharded runs write each job's transcript to its own segment file and every job's DB writes
+    happen in one transaction, so shards can run side by side in separate processes.
+
+    Returns:
+        Run summary: jobs negotiated, incremental skip/reuse counts and pruned evaluations
+    """
+    global _sink
+    main_sink = _sink
+    has_candidates = count_candidates() > 0
+    
+    # Stage 1: cheap local ranking - only each job's top-K candidates get LLM evaluations.
+    # Shards only read the embedding index; it is synced once before they start
+    ranker = build_ranker(sync=shard is None) if has_candidates else None
+
+    jobs_negotiated = 0
+    jobs_skipped = 0
+    pairs_reused = 0
+    # Skips evaluations whose outcome is already decided and counts the LLM calls saved
+    policy = PruningPolicy()
+    if shard is not None:
+        os.makedirs(shard_segment_dir(), exist_ok=True)
 
-    # Loop through each open job
-    for job in jobs:
+    # Loop through each open job (streamed from the database)
+    for position, job in enumerate(iter_jobs()):
+        if shard is not None:
+            if position % shard[1] != shard[0]:
+                continue
+            segment_file = os.path.join(shard_segment_dir(), f"{position:06d}.md")
+            for stale in (segment_file, jsonl_path_for(segment_file)):
+                if os.path.exists(stale):
+                    os.remove(stale)  # Left over from an interrupted run
+            if _sink is not main_sink:
+                _sink.close()
+            _sink = TranscriptSink(segment_file, jsonl=args.jsonl)
         job_title = job['title']
         job_reqs = job['requirements']
+        job_hash = job_content_hash(job)
         
+        # Pre-filter on shared skills in SQL, then keep the pre-ranker's top-K
+        shortlist = []
+        if has_candidates:
+            shortlist = list(internal_candidate_pool(job, get_job_requirements(job['id']), ranker))
+        
+        # Incremental mode: only negotiate pairs where the job or candidate is new/changed
+        previous_matches = []
+        changed_wins = []
+        if args.incremental:
+            job_state = get_boardroom_job_state(job['id'])
+            pair_states = get_boardroom_pairs(job['id'])
+            fresh = [c for c in shortlist if needs_evaluation(pair_states.get(c['id']), job_hash, c)]
+            pairs_reused += len(shortlist) - len(fresh)
+            
+            # Earlier wins still count as internal matches only while neither side has changed since
+            # (this also skips pairs re-evaluated in this run). Changed ones are withdrawn below unless
+            # this run decides the pair again - including candidates that fell out of the shortlist.
+            for p in pair_states.values():
+                if p['decision'] != "accepted":
+                    continue
+                if p['job_hash'] == job_hash and p['candidate_hash'] == p['current_candidate_hash']:
+                    previous_matches.append(p)
+                else:
+                    changed_wins.append(p['candidate_id'])
+            
+            if job_state and job_state['job_hash'] == job_hash and not fresh and not changed_wins:
+                jobs_skipped += 1
+                print(f"⏩ No changes for {job_title} since {job_state['evaluated_at']} - reusing earlier decisions.")
+                continue
+            shortlist = fresh
+        
+        jobs_negotiated += 1
+        if _sink is not None:
+            _sink.context = {"job_id": job['id'], "job_title": job_title}
         log_to_transcript("SYSTEM", f"Opening discussion for Job: **{job_title}**")
         
         # 1. Jill Pitches the Role (New Step)
@@ -89,7 +447,7 @@ def main():
         Pitch the role and the company briefly. Explain what you are looking for and why it's urgent.
         Keep it to 2-3 sentences.
         """
-        jill_pitch = generate_agent_response(jill_pitch_prompt, "Open the meeting.")
+        jill_pitch = generate_agent_response(jill_pitch_prompt, "Open the meeting.", JILL_PITCH_PROMPT_VERSION)
         log_to_transcript("Jill", jill_pitch)
 
         # 2. Jack Responds & Checks Roster
@@ -97,95 +455,166 @@ def main():
         
         internal_matches_found = False
         candidates_pitched = 0
+        outcomes = []
+        new_matches = []
+        accepted = len(previous_matches)  # Earlier wins count towards the per-job cap
         
-        if candidates:
-            # Sort candidates by rough match score to prioritize best ones
-            scored_candidates = []
-            for candidate in candidates:
-                cand_skills = json.loads(candidate['skills']) if candidate['skills'] else []
-                # Simple keyword heuristic for sorting (LLM will do real eval)
-                scored_candidates.append(candidate)
-
-            for candidate in scored_candidates:
-                # Jack evaluates if he should pitch this person
-                jack_eval_prompt = f"""
-                You are Jack. Jill just pitched this role: "{jill_pitch}"
-                
-                CANDIDATE PROFILE:
-                Name: {candidate['name']}
-                Skills: {candidate.get('skills', 'No specific skills listed')}
-                Profile Summary: {candidate.get('headline', 'No headline')}
+        for match in previous_matches:
+            internal_matches_found = True
+            log_to_transcript("SYSTEM", f"♻️ Earlier decision stands: {match['candidate_name']} -> {job_title} (Score: {match['avg_score']:.1f}/10)")
+        
+        if shortlist:
+            # Evaluate in waves so a configured per-job cap can stop the negotiation early
+            offered_ids = set()
+            for wave in policy.waves(shortlist, lambda: policy.job_full(accepted), "jack_eval"):
+                offered_ids.update(c['id'] for c in wave)
+                # Jack evaluates every candidate in the wave (requests run concurrently)
+                jack_requests = []
+                for candidate in wave:
+                    # Jack evaluates if he should pitch this person
+                    jack_eval_prompt = f"""
+                    You are Jack. Jill just pitched this role: "{jill_pitch}"
                 
-                Step 1: Assign a score from 0-10 based on POTENTIAL and ADAPTABILITY.
-                - 10 = Perfect fit or high potential.
-                - 0 = Completely irrelevant.
+                    CANDIDATE PROFILE:
+                    Name: {candidate['name']}
+                    Skills: {candidate.get('skills', 'No specific skills listed')}
+                    Profile Summary: {candidate.get('headline', 'No headline')}
                 
-                Step 2: Decide if you should pitch them.
-                - If Score >= 4, you MUST pitch them. (Be flexible!)
+                    Step 1: Assign a score from 0-10 based on POTENTIAL and ADAPTABILITY.
+                    - 10 = Perfect fit or high potential.
+                    - 0 = Completely irrelevant.
                 
-                Respond in this EXACT format:
-                SCORE: [Number]
-                PITCH: [Your 2 sentence pitch explaining why they are a good bet]
+                    Step 2: Decide if you should pitch them.
+                    - If Score >= 4, you MUST pitch them. (Be flexible!)
                 
-                If Score < 4, just respond: SKIP
-                """
-                jack_response = generate_agent_response(jack_eval_prompt, "Evaluate candidate.")
+                    Respond with ONLY a JSON object:
+                    {{"score": [Number], "pitch": "[Your 2 sentence pitch explaining why they are a good bet]"}}
                 
-                if "SKIP" not in jack_response:
-                    # Extract Jack's score
-                    try:
-                        jack_score_line = [l for l in jack_response.split('\n') if "SCORE:" in l][0]
-                        jack_score = float(jack_score_line.split("SCORE:")[1].strip().split('/')[0])
-                        jack_pitch_text = jack_response.split("PITCH:")[1].strip() if "PITCH:" in jack_response else jack_response
-                    except:
-                        jack_score = 5.0 # Default if parsing fails
-                        jack_pitch_text = jack_response
-
-                    candidates_pitched += 1
-                    log_to_transcript("Jack", f"**Candidate: {candidate['name']}** (Score: {jack_score}/10)\n{jack_pitch_text}")
-                    
-                    # 3. Jill Evaluates the Candidate
+                    If Score < 4, set "pitch" to null.
+                    """
+                    jack_requests.append((jack_eval_prompt, "Evaluate candidate."))
+                if args.batch_eval:
+                    candidate_blocks = [
+                        f"Name: {c['name']} | Skills: {c.get('skills', 'No specific skills listed')} | "
+                        f"Profile Summary: {c.get('headline', 'No headline')}"
+                        for c in wave
+                    ]
+                    jack_results, stats = run_batched(
+                        candidate_blocks, lambda blocks: build_jack_batch_prompt(jill_pitch, blocks),
+                        batch_item_schema(JACK_EVAL_SCHEMA), generate_agent_responses,
+                        lambda indexes: generate_structured_responses(
+                            [jack_requests[i] for i in indexes], JACK_EVAL_SCHEMA, "jack_eval", JACK_EVAL_PROMPT_VERSION
+                        ),
+                        "jack_eval_batch", JACK_BATCH_PROMPT_VERSION
+                    )
+                    print(f"   📦 Jack: {stats['items']} candidates in {stats['batches']} batch request(s), {stats['fallbacks']} fallback(s)")
+                else:
+                    jack_results = generate_structured_responses(
+                        jack_requests, JACK_EVAL_SCHEMA, "jack_eval", JACK_EVAL_PROMPT_VERSION
+                    )
+            
+                pitches = []
+                for candidate, jack_result in zip(wave, jack_results):
+                    if jack_result is None:
+                        # Not a real decision - retry this pair next run
+                        log_to_transcript("SYSTEM", f"⚠️ Could not read Jack's evaluation of {candidate['name']}; will retry next run.")
+                        continue
+                    if jack_result["score"] < 4 or not jack_result.get("pitch"):
+                        outcomes.append({"candidate": candidate, "decision": "skipped"})
+                    else:
+                        pitches.append((candidate, float(jack_result["score"]), jack_result["pitch"].strip()))
+            
+                # 3. Jill evaluates every pitch she can still swing (requests run concurrently)
+                to_review = [pitch for pitch in pitches if not policy.prune_jill(pitch[1])]
+                jill_requests = []
+                for candidate, jack_score, jack_pitch_text in to_review:
                     jill_eval_prompt = f"""
                     You are Jill. Jack just pitched {candidate['name']} for the {job_title} role.
                     Jack's Pitch: "{jack_pitch_text}"
                     Jack's Score: {jack_score}/10
-                    
+                
                     Real Job Requirements: {job_reqs}
-                    
+                
                     Step 1: Assign your own INDEPENDENT score (0-10) based on requirements fit.
                     - Be critical but fair.
-                    
+                
                     Step 2: Provide your reasoning.
-                    
-                    Respond in this EXACT format:
-                    SCORE: [Number]
-                    REASON: [Your strict reasoning]
+                
+                    Respond with ONLY a JSON object:
+                    {{"score": [Number], "reason": "[Your strict reasoning]"}}
                     """
-                    jill_decision = generate_agent_response(jill_eval_prompt, "Evaluate the pitch.")
+                    jill_requests.append((jill_eval_prompt, "Evaluate the pitch."))
+                if args.batch_eval and to_review:
+                    pitch_blocks = [
+                        f"Candidate: {candidate['name']} | Jack's Pitch: \"{jack_pitch_text}\" | Jack's Score: {jack_score}/10"
+                        for candidate, jack_score, jack_pitch_text in to_review
+                    ]
+                    jill_results, stats = run_batched(
+                        pitch_blocks, lambda blocks: build_jill_batch_prompt(job_title, job_reqs, blocks),
+                        batch_item_schema(JILL_EVAL_SCHEMA), generate_agent_responses,
+                        lambda indexes: generate_structured_responses(
+                            [jill_requests[i] for i in indexes], JILL_EVAL_SCHEMA, "jill_eval", JILL_EVAL_PROMPT_VERSION
+                        ),
+                        "jill_eval_batch", JILL_BATCH_PROMPT_VERSION
+                    )
+                    print(f"   📦 Jill: {stats['items']} pitches in {stats['batches']} batch request(s), {stats['fallbacks']} fallback(s)")
+                else:
+                    jill_results = generate_structured_responses(
+                        jill_requests, JILL_EVAL_SCHEMA, "jill_eval", JILL_EVAL_PROMPT_VERSION
+                    )
+            
+                # Replay the negotiation in roster order
+                jill_by_candidate = {pitch[0]['id']: result for pitch, result in zip(to_review, jill_results)}
+                for candidate, jack_score, jack_pitch_text in pitches:
+                    candidates_pitched += 1
+                    log_to_transcript("Jack", f"**Candidate: {candidate['name']}** (Score: {jack_score}/10)\n{jack_pitch_text}")
+                
+                    if candidate['id'] not in jill_by_candidate:
+                        log_to_transcript("SYSTEM", f"✂️ Even a 10/10 from Jill can't lift Jack's {jack_score}/10 over the bar (>8) - review skipped.")
+                        outcomes.append({"candidate": candidate, "decision": "rejected", "jack_score": jack_score})
+                        continue
+                    jill_result = jill_by_candidate[candidate['id']]
+                    if jill_result is None:
+                        # Not a real decision - retry this pair next run
+                        log_to_transcript("SYSTEM", f"⚠️ Could not read Jill's evaluation of {candidate['name']}; will retry next run.")
+                        continue
+                    jill_score = float(jill_result["score"])
+                    jill_reason = jill_result["reason"].strip()
                     
-                    # Extract Jill's score
-                    try:
-                        jill_score_line = [l for l in jill_decision.split('\n') if "SCORE:" in l][0]
-                        jill_score = float(jill_score_line.split("SCORE:")[1].strip().split('/')[0])
-                        jill_reason = jill_decision.split("REASON:")[1].strip() if "REASON:" in jill_decision else jill_decision
-                    except:
-                        jill_score = 0.0
-                        jill_reason = jill_decision
-                        
                     log_to_transcript("Jill", f"(Score: {jill_score}/10)\n{jill_reason}")
-                    
+                
                     # Calculate Average
                     avg_score = (jack_score + jill_score) / 2
                     log_to_transcript("SYSTEM", f"📊 Average Score: {avg_score}/10")
-                    
-                    if avg_score > 8:
+                
+                    if policy.is_accepted(avg_score):
                         internal_matches_found = True
-                        add_match(candidate['id'], job['id'], avg_score/10, source="negotiation_win")
+                        accepted += 1
+                        new_matches.append({"candidate_id": candidate['id'], "job_id": job['id'], "score": avg_score/10, "source": "negotiation_win"})
                         log_to_transcript("SYSTEM", f"✅ INTERVIEW SCHEDULED! {candidate['name']} -> {job_title} (Avg > 8)")
                     else:
                          log_to_transcript("SYSTEM", f"❌ Candidate did not meet the bar (>8).")
+                
+                    outcomes.append({
+                        "candidate": candidate, "decision": "accepted" if policy.is_accepted(avg_score) else "rejected",
+                        "jack_score": jack_score, "jill_score": jill_score, "avg_score": avg_score
+                    })
+        
+            # Candidates left once the cap was reached are settled for this job until either side changes
+            if policy.job_full(accepted):
+                outcomes.extend({"candidate": c, "decision": "capped"} for c in shortlist if c['id'] not in offered_ids)
+        
+        # Matches and the high-water mark for the next incremental run land in one transaction per job.
+        # A re-evaluated pair's earlier win is replaced by this run's decision; a changed pair that was
+        # not decided again loses its win
+        evaluated_ids = {o['candidate']['id'] for o in outcomes}
+        withdrawn = [cid for cid in changed_wins if cid not in evaluated_ids]
+        with transaction():
+            delete_matches(job['id'], [*evaluated_ids, *withdrawn], "negotiation_win")
+            add_matches_bulk(new_matches)
+            record_boardroom_outcomes(job, outcomes, withdrawn)
 
-        if candidates_pitched == 0:
+        if candidates_pitched == 0 and not previous_matches:
             log_to_transcript("Jack", "I've reviewed my entire roster, but honestly, I don't have anyone who meets that specific bar right now.")
 
         # Phase 3: Scout's Fallback (External Search)
@@ -194,7 +623,7 @@ def main():
             log_to_transcript("Scout", f"On it! Scouring LinkedIn for {job_title}...")
             
             # Using basic search terms from job title
-            found_candidates = search_linkedin_candidates(job_title, [], "London", limit=3)
+            found_candidates = search_linkedin_candidates(job_title, [], "London", limit=3, job_id=job['id'])
             
             if found_candidates:
                 log_to_transcript("Scout", f"I found {len(found_candidates)} potential profiles on LinkedIn.")
@@ -205,7 +634,17 @@ def main():
         else:
             log_to_transcript("Scout", "Looks like you two found a great match internally. I'll stay put.")
 
-    print(f"\n✅ Negotiation Complete! Read the full transcript in: {TRANSCRIPT_FILE}")
+    if _sink is not main_sink:
+        _sink.close()
+        _sink = main_sink
+    elif _sink is not None:
+        _sink.flush()
+    llm_cache.print_stats()
+    print_parse_stats()
+    return {
+        "jobs": jobs_negotiated, "jobs_skipped": jobs_skipped, "pairs_reused": pairs_reused,
+        "pruned": dict(policy.saved)
+    }
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,214 @@
+"""
+Async Scoring Engine - Concurrent LLM calls with rate limiting
+Runs many chat completions concurrently through a bounded worker pool, throttled by token
+buckets on requests/min and tokens/min, retrying 429/5xx with jittered backoff.
+Results always come back in input order. An engine keeps its buckets, event loop and async
+client across calls, so the limits hold over a whole run and connections are reused.
+"""
+
+import os
+import time
+import threading
+import random
+import asyncio
+
+import llm_cache
+import llm_gateway
+from llm_gateway import MODEL_NAME
+
+# Defaults follow Groq's free-tier limits for the 70B model; override via environment
+DEFAULT_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "8"))
+DEFAULT_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "30"))
+DEFAULT_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "12000"))
+
+# Retry policy for rate limits, server errors and dropped connections
+MAX_RETRIES = 4
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+
+# Rough completion size used to pre-charge the tokens/min bucket
+COMPLETION_TOKENS_ESTIMATE = 256
+
+
+def estimate_tokens(messages):
+    """Cheap prompt-size estimate (~4 characters per token)."""
+    return sum(len(m.get("content") or "") for m in messages) // 4 + 4 * len(messages)
+
+
+def _default_client_factory():
+    """Async client from the shared gateway (its SDK retries are off - the engine owns retry/backoff)."""
+    return llm_gateway.new_async_client()
+
+
+def _is_retryable(error):
+    """429s, 5xx and connection/timeouts are worth retrying; 4xx client errors are not."""
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    return type(error).__name__ in ("APIConnectionError", "APITimeoutError", "ConnectionError", "TimeoutError")
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at `rate_per_minute`.
+    A rate of 0 disables the limit.
+    """
+
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount=1):
+        """Wait until `amount` tokens are available, then take them."""
+        if self.rate <= 0:
+            return
+        amount = min(amount, self.capacity)
+        while True:
+            self._refill()
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return
+            await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def consume(self, amount):
+        """Charge tokens after the fact (e.g. actual usage above the estimate); may go into debt."""
+        if self.rate > 0:
+            self._refill()
+            self.tokens -= amount
+
+
+class ScoringEngine:
+    """
+    Concurrent chat-completion runner.
+
+    Usage:
+        engine = ScoringEngine()
+        replies = engine.run([messages_1, messages_2, ...])   # list of str / Exception, in order
+        engine.close()
+    """
+
+    def __init__(self, client_factory=None, model=MODEL_NAME, temperature=0.7,
+                 concurrency=DEFAULT_CONCURRENCY,
+                 requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE,
+                 tokens_per_minute=DEFAULT_TOKENS_PER_MINUTE,
+                 max_retries=MAX_RETRIES):
+        self.client_factory = client_factory or _default_client_factory
+        self.model = model
+        self.temperature = temperature
+        self.concurrency = max(1, concurrency)
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = max_retries
+        self.stats = {"requests": 0, "retries": 0, "failures": 0, "tokens": 0}
+        # Shared by every call, so each wave/stage draws on the same per-minute budget
+        self._request_bucket = TokenBucket(requests_per_minute, capacity=max(1, self.concurrency))
+        self._token_bucket = TokenBucket(tokens_per_minute)
+        # The async client's connection pool is bound to one event loop, so the engine owns both
+        self._loop = None
+        self._client = None
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    async def _complete(self, client, semaphore, messages, request_kwargs):
+        estimate = estimate_tokens(messages) + COMPLETION_TOKENS_ESTIMATE
+        for attempt in range(self.max_retries + 1):
+            async with semaphore:
+                await self._request_bucket.acquire(1)
+                await self._token_bucket.acquire(estimate)
+                try:
+                    self.stats["requests"] += 1
+                    response = await client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        temperature=self.temperature,
+                        **request_kwargs
+                    )
+                except Exception as e:
+                    if attempt >= self.max_retries or not _is_retryable(e):
+                        self.stats["failures"] += 1
+                        return e
+                    error = e
+                else:
+                    usage = getattr(response, "usage", None)
+                    used = getattr(usage, "total_tokens", None)
+                    if used:
+                        self.stats["tokens"] += used
+                        if used > estimate:
+                            self._token_bucket.consume(used - estimate)
+                    return response.choices[0].message.content
+            
+            # Full-jitter exponential backoff, outside the semaphore so other work proceeds
+            self.stats["retries"] += 1
+            delay = random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+            await asyncio.sleep(delay)
+        return error
+
+    async def complete_many(self, message_lists, **request_kwargs):
+        """
+        Run all requests concurrently. Returns replies (str) or the final Exception, in input order.
+        Runs on the engine's own event loop (via run()), where its async client lives.
+        """
+        if self._client is None:
+            self._client = self.client_factory()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        return await asyncio.gather(*[
+            self._complete(self._client, semaphore, messages, request_kwargs)
+            for messages in message_lists
+        ])
+
+    def _run_async(self, coro):
+        """Run a coroutine on the engine's event loop, creating it on first use."""
+        if self._pid != os.getpid():
+            # Forked child: the inherited loop and connections belong to the parent
+            self._loop, self._client, self._pid = None, None, os.getpid()
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
+
+    def close(self):
+        """Close the async client and event loop (a no-op in a forked child that inherited them)."""
+        with self._lock:
+            if self._pid == os.getpid():
+                close = getattr(self._client, "close", None)
+                if close is not None:
+                    result = close()
+                    if asyncio.iscoroutine(result):
+                        self._run_async(result)
+                if self._loop is not None:
+                    self._loop.close()
+            self._client = None
+            self._loop = None
+
+    def run(self, message_lists, prompt_version=None, validate=None, **request_kwargs):
+        """
+        Synchronous entry point for the (synchronous) agent loops.
+
+        With a `prompt_version`, replies are served from / stored in the persistent LLM cache
+        and only cache misses are sent to the model. `validate` (fn(reply) -> bool, or one such
+        fn per request) keeps replies that fail to parse out of the cache, so they are retried.
+        """
+        message_lists = list(message_lists)
+        if not message_lists:
+            return []
+        validators = validate if isinstance(validate, (list, tuple)) else [validate] * len(message_lists)
+        if prompt_version is None:
+            with self._lock:
+                return self._run_async(self.complete_many(message_lists, **request_kwargs))
+        
+        keys = [llm_cache.cache_key(self.model, prompt_version, self.temperature, m) for m in message_lists]
+        replies = [llm_cache.get(key, check) for key, check in zip(keys, validators)]
+        misses = [i for i, reply in enumerate(replies) if reply is None]
+        if misses:
+            with self._lock:
+                fresh = self._run_async(self.complete_many([message_lists[i] for i in misses], **request_kwargs))
+            for i, reply in zip(misses, fresh):
+                replies[i] = reply
+                llm_cache.put(keys[i], self.model, prompt_version, reply, validators[i])
+        return replies
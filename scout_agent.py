@@ -6,150 +6,199 @@ Searches LinkedIn for candidates and jobs, ranks matches, feeds recommendations
 import os
 import sys
 import json
-import time
 from datetime import datetime
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from groq import Groq
 from dotenv import load_dotenv
-from duckduckgo_search import DDGS
 
+from prerank import PreRanker, PRERANK_TOP_K
+import embedding_index
+from pruning import PruningPolicy
+from scoring_engine import ScoringEngine
+from llm_gateway import chat, require_backend
+from response_parsing import (
+    MATCH_SCORE_SCHEMA, json_mode_kwargs, structured_complete, structured_complete_many, reply_is_valid,
+    print_parse_stats
+)
+import llm_cache
+import search
+from query_planner import XRayQuery, QueryPlan
+import query_planner
 from database import (
-    init_database, get_all_candidates, get_all_jobs,
-    add_match, send_agent_message, get_candidate, get_job
+    init_database, iter_candidates, iter_jobs, count_candidates, count_jobs,
+    find_candidates_by_skills, find_candidate_ids_by_skills,
+    add_matches_bulk, send_agent_message, send_agent_messages_bulk,
+    get_candidate, get_job, transaction,
+    upsert_external_profiles, add_external_profile_sources, find_external_profiles
 )
 
 load_dotenv()
-# Global Groq client
-client = None
-
-def init_groq():
-    """Initialize Groq client"""
-    global client
-    api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
-        print("❌ GROQ_API_KEY not found")
-        sys.exit(1)
-    client = Groq(api_key=api_key)
-    return client
-
 
 # ============================================================
 # LINKEDIN X-RAY SEARCH
 # ============================================================
 
-def search_linkedin_candidates(job_title, skills, location, limit=10):
+def candidate_xray_query(job_title, skills, location):
+    """X-Ray query for LinkedIn profiles matching a job, in the planner's canonical form."""
+    return XRayQuery("linkedin.com/in/", phrases=[job_title, location], groups={"skills": skills[:3]})
+
+
+def candidate_search_query(job_title, skills, location):
+    """X-Ray query string for LinkedIn profiles matching a job."""
+    return candidate_xray_query(job_title, skills, location).render()
+
+
+def parse_candidate_results(search_results):
+    """LinkedIn profile results -> candidate dicts."""
+    results = []
+    for r in search_results:
+        # Parse LinkedIn result
+        title = r.get('title', '')
+        url = r.get('href', '')
+        snippet = r.get('body', '')
+        
+        # Extract name and headline from title
+        # Format: "Name - Headline | LinkedIn"
+        name = "Unknown"
+        headline = ""
+        
+        if " - " in title:
+            parts = title.split(" - ", 1)
+            name = parts[0].strip()
+            if len(parts) > 1:
+                headline = parts[1].split("|")[0].strip()
+        elif "|" in title:
+            name = title.split("|")[0].strip()
+        
+        if "linkedin.com/in/" in url:
+            results.append({
+                "name": name,
+                "headline": headline,
+                "linkedin_url": url,
+                "snippet": snippet,
+                "source": "linkedin_search"
+            })
+            print(f"   ✓ Found: {name}")
+    return results
+
+
+def search_linkedin_candidates(job_title, skills, location, limit=10, job_id=None):
     """
     Search LinkedIn for candidate profiles using DuckDuckGo X-Ray search.
     This is a safe, API-free approach to finding LinkedIn profiles.
+    Goes through the shared search subsystem (rate limit + query cache); with a job_id the
+    profiles found are also stored in external_profiles.
     """
     print(f"\n🔎 Searching LinkedIn for: {job_title} in {location}...")
-    
-    # Build X-Ray search query
-    skill_query = " OR ".join([f'"{s}"' for s in skills[:3]])
-    query = f'site:linkedin.com/in/ "{job_title}" ({skill_query}) "{location}"'
-    
+    query = candidate_search_query(job_title, skills, location)
     print(f"   Query: {query[:80]}...")
-    
+    found = parse_candidate_results(search.search(query, limit))
+    if job_id:
+        store_external_results("candidate", found, "job", job_id)
+    return found
+
+
+def job_xray_query(candidate_skills, preferred_industries, location):
+    """X-Ray query for LinkedIn job postings matching a candidate, in the planner's canonical form."""
+    return XRayQuery("linkedin.com/jobs/", phrases=[location or ""],
+                     groups={"skills": candidate_skills[:3], "industries": (preferred_industries or [])[:2]})
+
+
+def job_search_query(candidate_skills, preferred_industries, location):
+    """X-Ray query string for LinkedIn job postings matching a candidate."""
+    return job_xray_query(candidate_skills, preferred_industries, location).render()
+
+
+def parse_job_results(search_results):
+    """LinkedIn job posting results -> job dicts."""
     results = []
-    try:
-        with DDGS() as ddgs:
-            search_results = list(ddgs.text(query, max_results=limit))
-            
-            for r in search_results:
-                # Parse LinkedIn result
-                title = r.get('title', '')
-                url = r.get('href', '')
-                snippet = r.get('body', '')
-                
-                # Extract name and headline from title
-                # Format: "Name - Headline | LinkedIn"
-                name = "Unknown"
-                headline = ""
-                
-                if " - " in title:
-                    parts = title.split(" - ", 1)
-                    name = parts[0].strip()
-                    if len(parts) > 1:
-                        headline = parts[1].split("|")[0].strip()
-                elif "|" in title:
-                    name = title.split("|")[0].strip()
-                
-                if "linkedin.com/in/" in url:
-                    results.append({
-                        "name": name,
-                        "headline": headline,
-                        "linkedin_url": url,
-                        "snippet": snippet,
-                        "source": "linkedin_search"
-                    })
-                    print(f"   ✓ Found: {name}")
-                
-                time.sleep(0.3)  # Be polite
-                
-    except Exception as e:
-        print(f"   ❌ Search error: {e}")
-    
+    for r in search_results:
+        title = r.get('title', '')
+        url = r.get('href', '')
+        snippet = r.get('body', '')
+        
+        # Extract job title and company
+        job_title = title.split("|")[0].strip() if "|" in title else title
+        company = ""
+        if " at " in title.lower():
+            company = title.split(" at ")[-1].split("|")[0].strip()
+        
+        if "linkedin.com/jobs/" in url:
+            results.append({
+                "title": job_title,
+                "company": company,
+                "linkedin_url": url,
+                "snippet": snippet,
+                "source": "linkedin_search"
+            })
+            print(f"   ✓ Found: {job_title[:50]}...")
     return results
 
+
 def search_linkedin_jobs(candidate_skills, preferred_industries, location, limit=10):
     """
     Search LinkedIn for job postings matching a candidate's profile.
     """
     print(f"\n🔎 Searching LinkedIn for jobs matching: {', '.join(candidate_skills[:3])}...")
-    
-    skill_query = " OR ".join([f'"{s}"' for s in candidate_skills[:3]])
-    industry_query = " OR ".join([f'"{i}"' for i in preferred_industries[:2]]) if preferred_industries else ""
-    
-    query = f'site:linkedin.com/jobs/ ({skill_query})'
-    if industry_query:
-        query += f' ({industry_query})'
-    if location:
-        query += f' "{location}"'
-    
+    query = job_search_query(candidate_skills, preferred_industries, location)
     print(f"   Query: {query[:80]}...")
-    
-    results = []
-    try:
-        with DDGS() as ddgs:
-            search_results = list(ddgs.text(query, max_results=limit))
-            
-            for r in search_results:
-                title = r.get('title', '')
-                url = r.get('href', '')
-                snippet = r.get('body', '')
-                
-                # Extract job title and company
-                job_title = title.split("|")[0].strip() if "|" in title else title
-                company = ""
-                if " at " in title.lower():
-                    company = title.split(" at ")[-1].split("|")[0].strip()
-                
-                if "linkedin.com/jobs/" in url:
-                    results.append({
-                        "title": job_title,
-                        "company": company,
-                        "linkedin_url": url,
-                        "snippet": snippet,
-                        "source": "linkedin_search"
-                    })
-                    print(f"   ✓ Found: {job_title[:50]}...")
-                
-                time.sleep(0.3)
-                
-    except Exception as e:
-        print(f"   ❌ Search error: {e}")
-    
-    return results
+    return parse_job_results(search.search(query, limit))
 
 # ============================================================
 # MATCHING ENGINE
 # ============================================================
 
-def calculate_match_score(candidate_data, job_data, model_name):
-    """Use Gemini to calculate a match score between candidate and job."""
+# Candidates must share at least this many normalized skills with a job's
+# requirements before we pay for an LLM score
+SKILL_PREFILTER_MIN_OVERLAP = 1
+
+# First-stage shortlist: "bm25" (PreRanker, rebuilt per run) or "embedding" (persistent
+# EmbeddingIndex of candidate profiles, top-K cosine against the job spec)
+SHORTLIST_RANKER = os.getenv("SHORTLIST_RANKER", "bm25")
+
+
+def build_ranker(sync=True):
+    """
+    The ranker internal_candidate_pool shortlists with, per SHORTLIST_RANKER.
+    With sync the embedding index first picks up candidates added or removed outside add_candidate.
+    """
+    if SHORTLIST_RANKER == "embedding":
+        index = embedding_index.candidate_index()
+        if sync:
+            added, removed = index.sync(iter_candidates())
+            if added or removed:
+                print(f"   🧭 Embedding index: +{added} / -{removed} candidate(s)")
+        elif not len(index):
+            print("   ⚠️ Embedding index is empty - run 'python embedding_index.py' first")
+        return index
+    return PreRanker.from_database()
+
+
+def internal_candidate_pool(job, requirements, ranker=None, top_k=PRERANK_TOP_K):
+    """
+    Candidates worth scoring for a job.
+    Uses the SQL skill index when the job lists requirements, then (if a ranker is given -
+    PreRanker or EmbeddingIndex) keeps only its top-K. Without either, streams the whole roster.
+    """
+    if ranker is None:
+        if requirements:
+            return find_candidates_by_skills(requirements, min_overlap=SKILL_PREFILTER_MIN_OVERLAP)
+        return iter_candidates()
+    
+    # The ranker only needs to know which candidates qualify - their rows are loaded for the top-K alone
+    allowed_ids = None
+    if requirements:
+        allowed_ids = find_candidate_ids_by_skills(requirements, min_overlap=SKILL_PREFILTER_MIN_OVERLAP)
+    shortlist = ranker.shortlist(job, top_k, allowed_ids=allowed_ids)
+    return [get_candidate(candidate_id) for candidate_id, _ in shortlist]
+
+# Bump when the match prompt changes so cached scores are not reused
+MATCH_PROMPT_VERSION = "match-score-v2"
+
+def build_match_messages(candidate_data, job_data):
+    """Build the chat messages asking the LLM to score a candidate-job pair."""
     prompt = f"""Analyze this candidate-job match and provide a score from 0.0 to 1.0.
 
 CANDIDATE:
@@ -165,13 +214,203 @@ JOB:
 Respond with ONLY a JSON object:
 {{"score": 0.XX, "reason": "brief explanation"}}
 """
+    return [{"role": "user", "content": prompt}]
+
+def _match_result(result):
+    """(score, reason) from a validated match reply; (None, ...) when it could not be parsed."""
+    if result is None:
+        return None, "Unable to calculate"
+    return float(result["score"]), result["reason"]
+
+def _valid_match_reply(reply):
+    """Only replies that parse as a match score are cached, so bad ones are retried next run."""
+    return reply_is_valid(reply, MATCH_SCORE_SCHEMA)
+
+def calculate_match_score(candidate_data, job_data, model_name):
+    """Use the LLM to calculate a match score between candidate and job."""
+    def complete(messages):
+        return llm_cache.cached_call(
+            model_name, MATCH_PROMPT_VERSION, 0.7, messages,
+            lambda: chat(messages, model_name, 0.7, **json_mode_kwargs(model_name)),
+            validate=_valid_match_reply
+        )
+    result = structured_complete(
+        build_match_messages(candidate_data, job_data), MATCH_SCORE_SCHEMA, "match_score", complete
+    )
+    return _match_result(result)
+
+def calculate_match_scores(pairs, model_name, engine=None):
+    """
+    Score many (candidate_data, job_data) pairs concurrently through the async ScoringEngine.
+    Returns [(score, reason), ...] in the same order as `pairs`; score is None when unusable.
+    """
+    owned = engine is None
+    engine = engine or ScoringEngine(model=model_name, temperature=0.7)
     try:
-        messages = [{"role": "user", "content": prompt}]
-        response_text = client.chat.completions.create(model=model_name, messages=messages, temperature=0.7).choices[0].message.content
-        result = json.loads(response_text.replace("```json", "").replace("```", "").strip())
-        return result.get("score", 0.5), result.get("reason", "")
-    except:
-        return 0.5, "Unable to calculate"
+        results = structured_complete_many(
+            (build_match_messages(c, j) for c, j in pairs), MATCH_SCORE_SCHEMA, "match_score",
+            lambda message_lists: engine.run(
+                message_lists, prompt_version=MATCH_PROMPT_VERSION, validate=_valid_match_reply,
+                **json_mode_kwargs(model_name)
+            )
+        )
+    finally:
+        if owned:
+            engine.close()
+    return [_match_result(result) for result in results]
+
+# ============================================================
+# EXTERNAL SEARCH FAN-OUT
+# ============================================================
+
+# Results per X-Ray search in Scout's MODE 1 / MODE 2
+SCOUT_SEARCH_LIMIT = 5
+# Stored external profiles seen within this many days can stand in for a new web search
+EXTERNAL_PROFILE_MAX_AGE_DAYS = int(os.getenv("EXTERNAL_PROFILE_MAX_AGE_DAYS", "30"))
+
+
+def _stored_profile_result(profile):
+    """An external_profiles row in the shape parse_*_results produces."""
+    if profile['kind'] == 'job':
+        result = {"title": profile['name'], "company": profile['headline'] or ""}
+    else:
+        result = {"name": profile['name'], "headline": profile['headline'] or ""}
+    result.update({
+        "linkedin_url": profile['linkedin_url'],
+        "snippet": profile['snippet'] or "",
+        "source": "external_profiles",
+        "external_profile_id": profile['id'],
+    })
+    return result
+
+
+def find_stored_matches(kind, phrase, any_terms, source_type, source_id):
+    """
+    Stored external profiles matching a query locally - returned (and recorded against the
+    job/candidate) only when there are enough of them to skip the web search.
+    """
+    profiles = find_external_profiles(kind, phrase=phrase, any_terms=any_terms,
+                                      limit=SCOUT_SEARCH_LIMIT, max_age_days=EXTERNAL_PROFILE_MAX_AGE_DAYS)
+    if len(profiles) < SCOUT_SEARCH_LIMIT:
+        return None
+    add_external_profile_sources([p['id'] for p in profiles], source_type, source_id)
+    return [_stored_profile_result(p) for p in profiles]
+
+
+def store_external_results(kind, found, source_type, source_id):
+    """Upsert web search finds into external_profiles and tag each with its profile ID."""
+    ids = upsert_external_profiles(
+        {"kind": kind, "linkedin_url": f['linkedin_url'],
+         "name": f.get('name', f.get('title')), "headline": f.get('headline', f.get('company')),
+         "snippet": f.get('snippet'), "source_type": source_type, "source_id": source_id}
+        for f in found
+    )
+    for f, profile_id in zip(found, ids):
+        f['external_profile_id'] = profile_id
+    return found
+
+
+def send_candidates_to_jack(job_id, title, found_candidates):
+    print(f"\n   📤 Sending {len(found_candidates)} external candidates to Jack...")
+    
+    # Send recommendation to Jack
+    send_agent_message(
+        from_agent="Scout",
+        to_agent="Jack",
+        message_type="candidate_recommendation",
+        content=f"Found {len(found_candidates)} potential candidates for {title}",
+        metadata={
+            "job_id": job_id,
+            "job_title": title,
+            "candidates": found_candidates
+        }
+    )
+    print("   ✅ Sent to Jack!")
+
+
+def send_jobs_to_jack_and_jill(candidate_id, name, found_jobs):
+    print(f"\n   📤 Sending {len(found_jobs)} jobs to Jack for outreach...")
+    
+    metadata = {
+        "candidate_id": candidate_id,
+        "candidate_name": name,
+        "jobs": found_jobs
+    }
+    send_agent_messages_bulk([
+        # Send recommendation to Jack (Jack does candidate outreach)
+        {
+            "from_agent": "Scout",
+            "to_agent": "Jack",
+            "message_type": "job_recommendation",
+            "content": f"Found {len(found_jobs)} potential jobs for {name}",
+            "metadata": metadata
+        },
+        # Also notify Jill for hiring manager outreach
+        {
+            "from_agent": "Scout",
+            "to_agent": "Jill",
+            "message_type": "outreach_opportunity",
+            "content": f"Found jobs for {name} - you may want to reach out to these hiring managers",
+            "metadata": metadata
+        }
+    ])
+    print("   ✅ Sent to Jack and Jill!")
+
+
+def planned_search(searches):
+    """
+    Search for every queued request through one query plan: equivalent and subsumed
+    queries across the whole run are issued once and their results fanned back out.
+    """
+    plan = QueryPlan()
+    for s in searches:
+        plan.add(s['query'], SCOUT_SEARCH_LIMIT)
+    results = plan.execute()
+    print(f"   🧭 {len(searches)} queries planned -> {plan.issued_count} issued "
+          f"({plan.identical} identical, {plan.subsumed} subsumed, {plan.reissued} re-issued)")
+    return results
+
+
+def send_candidate_searches(searches):
+    """Run the queued job -> candidate searches concurrently and send each job's finds to Jack."""
+    if not searches:
+        return
+    print(f"\n🔎 Searching LinkedIn for candidates for {len(searches)} job(s)...")
+    all_results = planned_search(searches)
+    finds = []
+    for s, results in zip(searches, all_results):
+        print(f"\n📋 Job: {s['title']}")
+        print(f"   Query: {s['query'].render()[:80]}...")
+        finds.append(parse_candidate_results(results))
+    
+    # Every profile from this batch is stored (deduplicated by URL) in one transaction
+    with transaction():
+        for s, found in zip(searches, finds):
+            store_external_results("candidate", found, "job", s['job_id'])
+    for s, found in zip(searches, finds):
+        if found:
+            send_candidates_to_jack(s['job_id'], s['title'], found)
+
+
+def send_job_searches(searches):
+    """Run the queued candidate -> job searches concurrently and send each candidate's finds to Jack and Jill."""
+    if not searches:
+        return
+    print(f"\n🔎 Searching LinkedIn for jobs for {len(searches)} candidate(s)...")
+    all_results = planned_search(searches)
+    finds = []
+    for s, results in zip(searches, all_results):
+        print(f"\n👤 Candidate: {s['name']}")
+        print(f"   Query: {s['query'].render()[:80]}...")
+        finds.append(parse_job_results(results))
+    
+    with transaction():
+        for s, found in zip(searches, finds):
+            store_external_results("job", found, "candidate", s['candidate_id'])
+    for s, found in zip(searches, finds):
+        if found:
+            send_jobs_to_jack_and_jill(s['candidate_id'], s['name'], found)
+
 
 # ============================================================
 # MAIN SCOUT WORKFLOW
@@ -186,24 +425,32 @@ def run_scout():
     # Initialize
     init_database()
     
-    init_groq()
+    require_backend()
     model_name = "llama-3.3-70b-versatile"
     
-    # Get existing candidates and jobs from database
-    candidates = get_all_candidates()
-    jobs = get_all_jobs()
+    # Count existing candidates and jobs - rows are streamed from the database below
+    candidate_count = count_candidates()
+    job_count = count_jobs()
     
     print(f"\n📊 Database Status:")
-    print(f"   Candidates: {len(candidates)}")
-    print(f"   Jobs: {len(jobs)}")
+    print(f"   Candidates: {candidate_count}")
+    print(f"   Jobs: {job_count}")
+    
+    # Stage 1: local pre-ranker (BM25 or embeddings) so only the top-K candidates per job reach the LLM
+    ranker = build_ranker() if candidate_count else None
+    # Stage 2: concurrent, rate-limited LLM scoring of each shortlist
+    engine = ScoringEngine(model=model_name, temperature=0.7)
+    # Stage 3: stop scoring a shortlist once the internal check is already decided
+    policy = PruningPolicy()
     
     # MODE 1: Find candidates for existing jobs
-    if jobs:
+    if job_count:
         print("\n" + "-"*40)
         print("🎯 MODE 1: Finding candidates for jobs")
         print("-"*40)
         
-        for job in jobs:
+        external_searches = []
+        for job in iter_jobs():
             job_id = job['id']
             title = job['title']
             requirements = json.loads(job['requirements']) if job['requirements'] else []
@@ -212,24 +459,29 @@ def run_scout():
             
             # 1. First, check INTERNAL candidates from Jack
             internal_matches = []
-            if candidates:
+            if candidate_count:
                 print("   🔍 Checking internal database first...")
-                for candidate in candidates:
-                    # Simple fuzzy match for now (ideally use semantics)
-                    cand_skills = json.loads(candidate['skills']) if candidate['skills'] else []
-                    cand_name = candidate['name']
-                    
-                    # Quick score check
-                    score, reason = calculate_match_score(
-                        {"name": cand_name, "skills": cand_skills, "headline": "Internal Candidate"}, 
-                        {"title": title, "requirements": requirements, "company": job['company']},
-                        model_name
-                    )
+                pool = list(internal_candidate_pool(job, requirements, ranker))
+                job_data = {"title": title, "requirements": requirements, "company": job['company']}
+                
+                # Quick score check - each wave of shortlisted candidates is scored concurrently,
+                # and scoring stops once any internal candidate clears the bar
+                for wave in policy.scout_waves(pool, lambda: bool(internal_matches)):
+                    pairs = []
+                    for candidate in wave:
+                        # The shortlist is already ranked locally (SHORTLIST_RANKER); the LLM scores it
+                        cand_skills = json.loads(candidate['skills']) if candidate['skills'] else []
+                        pairs.append(({"name": candidate['name'], "skills": cand_skills, "headline": "Internal Candidate"}, job_data))
                     
-                    if score >= 0.7:
-                        internal_matches.append({"name": cand_name, "id": candidate['id'], "score": score})
-                        # Add match to DB
-                        add_match(candidate['id'], job_id, score, source="internal_db")
+                    for candidate, (score, reason) in zip(wave, calculate_match_scores(pairs, model_name, engine)):
+                        if score is not None and score >= policy.scout_threshold:
+                            internal_matches.append({"name": candidate['name'], "id": candidate['id'], "score": score})
+                
+                # Add all matches for this job to DB in one transaction
+                add_matches_bulk(
+                    {"candidate_id": m['id'], "job_id": job_id, "score": m['score'], "source": "internal_db"}
+                    for m in internal_matches
+                )
             
             if internal_matches:
                 print(f"   ✅ Found {len(internal_matches)} INTERNAL matches in database!")
@@ -245,83 +497,62 @@ def run_scout():
                 )
                 continue  # SKIP LinkedIn search
             
-            # 2. If NO internal matches, search LinkedIn
-            print("   ⚠️ No internal matches found. Searching LinkedIn...")
-            found_candidates = search_linkedin_candidates(
-                job_title=title,
-                skills=requirements[:5] if requirements else [title],
-                location="",  # Could be extracted from job spec
-                limit=5
-            )
+            # 2. If NO internal matches, reuse stored external profiles that match this job
+            skills = requirements[:5] if requirements else [title]
+            stored = find_stored_matches("candidate", title, skills[:3], "job", job_id)
+            if stored:
+                print(f"   ♻️ {len(stored)} stored LinkedIn profiles match - skipping web search.")
+                send_candidates_to_jack(job_id, title, stored)
+                continue
             
-            if found_candidates:
-                print(f"\n   📤 Sending {len(found_candidates)} external candidates to Jack...")
-                
-                # Send recommendation to Jack
-                send_agent_message(
-                    from_agent="Scout",
-                    to_agent="Jack",
-                    message_type="candidate_recommendation",
-                    content=f"Found {len(found_candidates)} potential candidates for {title}",
-                    metadata={
-                        "job_id": job_id,
-                        "job_title": title,
-                        "candidates": found_candidates
-                    }
-                )
-                print("   ✅ Sent to Jack!")
+            # 3. Otherwise search LinkedIn - queued, then planned and searched together
+            print("   ⚠️ No internal matches found. Queued for LinkedIn search...")
+            external_searches.append({
+                "job_id": job_id,
+                "title": title,
+                "query": candidate_xray_query(title, skills, ""),  # location could be extracted from job spec
+            })
+        
+        # One plan across all jobs, so shared titles/skills are searched once
+        send_candidate_searches(external_searches)
     
     # MODE 2: Find jobs for existing candidates
-    if candidates:
+    if candidate_count:
         print("\n" + "-"*40)
         print("🎯 MODE 2: Finding jobs for candidates")
         print("-"*40)
         
-        for candidate in candidates:
-            candidate_id = candidate['id']
-            name = candidate['name']
-            skills = json.loads(candidate['skills']) if candidate['skills'] else []
+        job_searches = []
+        for candidate in iter_candidates():
             prefs = json.loads(candidate['preferences']) if candidate['preferences'] else {}
+            skills = json.loads(candidate['skills']) if candidate['skills'] else []
             
-            print(f"\n👤 Candidate: {name}")
-            
-            # Search LinkedIn for matching jobs
-            found_jobs = search_linkedin_jobs(
-                candidate_skills=skills[:5] if skills else ["software"],
-                preferred_industries=prefs.get('industries', []),
-                location=prefs.get('location', ''),
-                limit=5
-            )
+            # Reuse stored LinkedIn job postings that match this candidate
+            search_skills = skills[:5] if skills else ["software"]
+            stored = find_stored_matches("job", prefs.get('location', ''), search_skills[:3], "candidate", candidate['id'])
+            if stored:
+                print(f"\n👤 Candidate: {candidate['name']}")
+                print(f"   ♻️ {len(stored)} stored LinkedIn job postings match - skipping web search.")
+                send_jobs_to_jack_and_jill(candidate['id'], candidate['name'], stored)
+                continue
             
-            if found_jobs:
-                print(f"\n   📤 Sending {len(found_jobs)} jobs to Jack for outreach...")
-                
-                # Send recommendation to Jack (Jack does candidate outreach)
-                send_agent_message(
-                    from_agent="Scout",
-                    to_agent="Jack",
-                    message_type="job_recommendation",
-                    content=f"Found {len(found_jobs)} potential jobs for {name}",
-                    metadata={
-                        "candidate_id": candidate_id,
-                        "candidate_name": name,
-                        "jobs": found_jobs
-                    }
-                )
-                
-                # Also notify Jill for hiring manager outreach
-                send_agent_message(
-                    from_agent="Scout",
-                    to_agent="Jill",
-                    message_type="outreach_opportunity",
-                    content=f"Found jobs for {name} - you may want to reach out to these hiring managers",
-                    metadata={
-                        "candidate_id": candidate_id,
-                        "candidate_name": name,
-                        "jobs": found_jobs
-                    }
-                )
-                print("   ✅ Sent to Jack and Jill!")
+            # Otherwise search LinkedIn for matching jobs - queued, then planned and searched together
+            job_searches.append({
+                "candidate_id": candidate['id'],
+                "name": candidate['name'],
+                "query": job_xray_query(search_skills, prefs.get('industries', []), prefs.get('location', '')),
+            })
+        
+        send_job_searches(job_searches)
+    
+    engine.close()
+    llm_cache.evict()
+    llm_cache.print_stats()
+    search.evict()
+    query_planner.print_stats()
+    search.print_stats()
+    print_parse_stats()
+    policy.print_report()
     
     print("\n" + "="*60)
     print("✅ Scout run complete!")
@@ -0,0 +1,282 @@
+"""
+Search - Rate-limited, concurrent, cached web search for Scout's X-Ray queries
+Every query goes through one shared rate limiter per backend (instead of sleeping after
+each result), batches of queries run concurrently on a bounded thread pool, and results
+are kept in a persistent query -> results cache with a TTL so re-runs over the same jobs
+and candidates do not search again. Backends are pluggable: DuckDuckGo (default) or a
+local fixture provider for tests and benchmarks.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from database import get_connection, transaction
+
+# "ddgs" (DuckDuckGo, default) or "fixture" (local, deterministic)
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "ddgs")
+# Queries in flight at once across all jobs/candidates
+SEARCH_CONCURRENCY = int(os.getenv("SEARCH_CONCURRENCY", "4"))
+# Requests per second allowed to the DuckDuckGo backend (0 disables the limit)
+DDGS_REQUESTS_PER_SECOND = float(os.getenv("SEARCH_REQUESTS_PER_SECOND", "1.0"))
+# JSON file of {query: [{"title", "href", "body"}, ...]} for the fixture backend
+SEARCH_FIXTURES = os.getenv("SEARCH_FIXTURES")
+
+SEARCH_CACHE_ENABLED = os.getenv("SEARCH_CACHE_ENABLED", "1") != "0"
+SEARCH_CACHE_TTL_SECONDS = int(os.getenv("SEARCH_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+_stats = {"queries": 0, "cache_hits": 0, "backend_calls": 0, "errors": 0, "deduplicated": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(key, amount=1):
+    with _stats_lock:
+        _stats[key] += amount
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket allowing `per_second` requests per second with bursts of `burst`.
+    A rate of 0 disables the limit.
+    """
+
+    def __init__(self, per_second, burst=1):
+        self.rate = per_second
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+# ============================================================
+# PROVIDERS
+# ============================================================
+# A provider has a `name`, a `limiter` and `text(query, max_results)` returning a list of
+# {"title", "href", "body"} dicts (the DDGS result shape). It raises on failure.
+
+class DDGSProvider:
+    """DuckDuckGo text search (one DDGS session per worker thread)."""
+
+    name = "ddgs"
+
+    def __init__(self, requests_per_second=DDGS_REQUESTS_PER_SECOND):
+        self.limiter = RateLimiter(requests_per_second)
+        self._local = threading.local()
+
+    def text(self, query, max_results):
+        from duckduckgo_search import DDGS
+        if getattr(self._local, "ddgs", None) is None:
+            self._local.ddgs = DDGS()
+        self.limiter.acquire()
+        return list(self._local.ddgs.text(query, max_results=max_results) or [])
+
+
+class FixtureProvider:
+    """
+    Local search for tests and benchmarks.
+    Queries found in `fixtures` ({query: results}) return those results; any other query
+    gets deterministic synthetic LinkedIn profile or job results derived from its hash.
+    `latency` simulates the round trip of a real search.
+    """
+
+    name = "fixture"
+
+    def __init__(self, fixtures=None, latency=0.0, requests_per_second=0):
+        if isinstance(fixtures, str):
+            with open(fixtures, "r", encoding="utf-8") as f:
+                fixtures = json.load(f)
+        self.fixtures = fixtures or {}
+        self.latency = latency
+        self.limiter = RateLimiter(requests_per_second)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def text(self, query, max_results):
+        self.limiter.acquire()
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        if query in self.fixtures:
+            return self.fixtures[query][:max_results]
+        return _synthetic_results(query, max_results)
+
+
+def _synthetic_results(query, max_results):
+    digest = hashlib.sha256(query.encode("utf-8")).hexdigest()
+    results = []
+    for i in range(max_results):
+        tag = f"{digest[:8]}-{i}"
+        if "linkedin.com/jobs/" in query:
+            results.append({
+                "title": f"Engineer {tag} at Company {digest[i:i + 4]} | LinkedIn",
+                "href": f"https://www.linkedin.com/jobs/view/{int(digest[i:i + 8], 16)}",
+                "body": f"Job posting matching {query[:60]}",
+            })
+        else:
+            results.append({
+                "title": f"Person {tag} - Engineer at Company {digest[i:i + 4]} | LinkedIn",
+                "href": f"https://www.linkedin.com/in/person-{tag}",
+                "body": f"Profile matching {query[:60]}",
+            })
+    return results
+
+
+_PROVIDERS = {
+    "ddgs": DDGSProvider,
+    "fixture": lambda: FixtureProvider(SEARCH_FIXTURES),
+}
+
+
+def register_provider(name, factory):
+    """Add a search backend: factory() -> provider."""
+    _PROVIDERS[name] = factory
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def configure(provider=None):
+    """Use `provider` (an instance or a registered backend name) for every later search."""
+    global _provider
+    with _provider_lock:
+        _provider = _PROVIDERS[provider]() if isinstance(provider, str) else provider
+
+
+def get_provider():
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                if SEARCH_BACKEND not in _PROVIDERS:
+                    raise ValueError(f"Unknown search backend {SEARCH_BACKEND!r} (known: {', '.join(sorted(_PROVIDERS))})")
+                _provider = _PROVIDERS[SEARCH_BACKEND]()
+    return _provider
+
+# ============================================================
+# QUERY CACHE
+# ============================================================
+
+def cache_key(backend, query, max_results):
+    normalized = " ".join(query.split())
+    return hashlib.sha256(f"{backend}\n{max_results}\n{normalized}".encode("utf-8")).hexdigest()
+
+
+def _cache_get(key):
+    if not SEARCH_CACHE_ENABLED:
+        return None
+    row = get_connection().execute(
+        'SELECT results, created_at FROM search_cache WHERE cache_key = ?', (key,)
+    ).fetchone()
+    if row is None or time.time() - row['created_at'] > SEARCH_CACHE_TTL_SECONDS:
+        return None
+    return json.loads(row['results'])
+
+
+def _cache_put(entries):
+    """Store [(key, backend, query, max_results, results)] in one transaction."""
+    if not SEARCH_CACHE_ENABLED or not entries:
+        return
+    now = time.time()
+    with transaction() as conn:
+        conn.executemany('''
+            INSERT OR REPLACE INTO search_cache (cache_key, backend, query, max_results, results, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', [(key, backend, query, max_results, json.dumps(results), now)
+              for key, backend, query, max_results, results in entries])
+
+
+def evict():
+    """Drop expired cache entries."""
+    with transaction() as conn:
+        return conn.execute(
+            'DELETE FROM search_cache WHERE created_at < ?', (time.time() - SEARCH_CACHE_TTL_SECONDS,)
+        ).rowcount
+
+# ============================================================
+# SEARCH
+# ============================================================
+
+def _run(provider, query, max_results):
+    try:
+        _count("backend_calls")
+        return provider.text(query, max_results)
+    except Exception as e:
+        _count("errors")
+        print(f"   ❌ Search error: {e}")
+        return None
+
+
+def search_many(queries, concurrency=SEARCH_CONCURRENCY):
+    """
+    Run (query, max_results) pairs and return their result lists in input order.
+    Cached queries are answered from the cache, duplicates are searched once, and the rest
+    run concurrently (at most `concurrency` at a time) under the backend's rate limit.
+    A failed search returns [] and is not cached.
+    """
+    provider = get_provider()
+    queries = list(queries)
+    _count("queries", len(queries))
+
+    answers = {}
+    pending = []
+    seen = set()
+    for query, max_results in queries:
+        key = cache_key(provider.name, query, max_results)
+        if key in seen:
+            _count("deduplicated")
+            continue
+        seen.add(key)
+        cached = _cache_get(key)
+        if cached is not None:
+            _count("cache_hits")
+            answers[key] = cached
+        else:
+            pending.append((key, query, max_results))
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(pending)))) as pool:
+            fetched = list(pool.map(lambda p: _run(provider, p[1], p[2]), pending))
+        _cache_put([(key, provider.name, query, max_results, results)
+                    for (key, query, max_results), results in zip(pending, fetched) if results is not None])
+        for (key, _, _), results in zip(pending, fetched):
+            answers[key] = results or []
+
+    return [answers[cache_key(provider.name, query, max_results)] for query, max_results in queries]
+
+
+def search(query, max_results=10):
+    """One query through the cache, rate limiter and backend."""
+    return search_many([(query, max_results)])[0]
+
+
+def get_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats["cache_hits"] + stats["backend_calls"]
+    stats["hit_rate"] = stats["cache_hits"] / lookups if lookups else 0.0
+    return stats
+
+
+def print_stats():
+    stats = get_stats()
+    print(f"   🔎 Search: {stats['queries']} queries -> {stats['backend_calls']} searched, "
+          f"{stats['cache_hits']} cached ({stats['hit_rate']:.0%} of distinct queries), "
+          f"{stats['deduplicated']} duplicate(s), {stats['errors']} error(s)")
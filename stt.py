@@ -0,0 +1,269 @@
+"""
+STT - Persistent microphone listener for the voice agents
+One Listener per agent keeps its recognizer and microphone stream open for the whole
+session, calibrates for ambient noise once (and again every few minutes) instead of on
+every turn, and hands the audio to a pluggable recognizer backend: Google (online),
+Sphinx or Vosk (offline), or a WAV-file replay that makes a conversation deterministic.
+Each turn's capture / recognize / total latency is recorded and printed.
+"""
+
+import os
+import glob
+import json
+import time
+import threading
+
+import speech_recognition as sr
+
+# google (online, default) | sphinx | vosk (offline) | replay (WAV files + .txt transcripts)
+STT_BACKEND = os.getenv("STT_BACKEND", "google")
+# Folder of WAV files replayed, in name order, instead of the microphone (default for the replay backend)
+STT_REPLAY_DIR = os.getenv("STT_REPLAY_DIR")
+# Unpacked Vosk model folder for the vosk backend
+VOSK_MODEL_PATH = os.getenv("VOSK_MODEL_PATH", "model")
+
+# Ambient-noise calibration: once at startup, then again when it is older than this
+CALIBRATION_SECONDS = 0.3
+RECALIBRATE_SECONDS = float(os.getenv("STT_RECALIBRATE_SECONDS", "300"))
+
+# Seconds to wait for speech to start before giving up on a turn
+LISTEN_TIMEOUT_SECONDS = 10
+
+# ============================================================
+# RECOGNIZER BACKENDS
+# ============================================================
+# A backend is fn(recognizer, audio) -> text. It raises sr.UnknownValueError when nothing
+# intelligible was said and sr.RequestError when the engine itself failed.
+
+def _recognize_google(recognizer, audio):
+    return recognizer.recognize_google(audio)
+
+
+def _recognize_sphinx(recognizer, audio):
+    return recognizer.recognize_sphinx(audio)
+
+
+_vosk_model = None
+_vosk_lock = threading.Lock()
+
+
+def _recognize_vosk(recognizer, audio):
+    # Model loaded once per process (speech_recognition's own helper reloads it on every call)
+    global _vosk_model
+    try:
+        from vosk import KaldiRecognizer, Model
+    except ImportError:
+        raise sr.RequestError("vosk backend requires: pip install vosk")
+    with _vosk_lock:
+        if _vosk_model is None:
+            if not os.path.isdir(VOSK_MODEL_PATH):
+                raise sr.RequestError(f"Vosk model not found at {VOSK_MODEL_PATH} (set VOSK_MODEL_PATH)")
+            _vosk_model = Model(VOSK_MODEL_PATH)
+    kaldi = KaldiRecognizer(_vosk_model, 16000)
+    kaldi.AcceptWaveform(audio.get_raw_data(convert_rate=16000, convert_width=2))
+    text = json.loads(kaldi.FinalResult()).get("text", "").strip()
+    if not text:
+        raise sr.UnknownValueError()
+    return text
+
+
+def _recognize_replay(recognizer, audio):
+    # ReplaySource attaches each file's transcript (its .txt sidecar) to the audio it returns
+    text = getattr(audio, "transcript", None)
+    if text is None:
+        raise sr.RequestError("replay backend needs a .txt transcript next to each WAV file")
+    if not text:
+        raise sr.UnknownValueError()
+    return text
+
+
+_BACKENDS = {
+    "google": _recognize_google,
+    "sphinx": _recognize_sphinx,
+    "vosk": _recognize_vosk,
+    "replay": _recognize_replay,
+}
+
+
+def register_backend(name, recognize):
+    """Add a recognizer backend: fn(recognizer, audio) -> text."""
+    _BACKENDS[name] = recognize
+
+# ============================================================
+# AUDIO SOURCES
+# ============================================================
+
+class MicrophoneSource:
+    """The default microphone, opened once and paused between turns."""
+
+    def __init__(self, device_index=None):
+        self._microphone = sr.Microphone(device_index=device_index)
+        self._open = False
+
+    def open(self):
+        if not self._open:
+            self._microphone.__enter__()
+            self._open = True
+        return self._microphone
+
+    def _stream(self):
+        stream = getattr(self._microphone, "stream", None)
+        return getattr(stream, "pyaudio_stream", None)
+
+    def resume(self):
+        # Paused between turns so the agent's own speech is not buffered into the next capture
+        stream = self._stream()
+        if stream is not None and stream.is_stopped():
+            stream.start_stream()
+
+    def pause(self):
+        stream = self._stream()
+        if stream is not None and not stream.is_stopped():
+            stream.stop_stream()
+
+    def capture(self, recognizer, timeout, phrase_time_limit):
+        self.resume()
+        try:
+            return recognizer.listen(self._microphone, timeout=timeout, phrase_time_limit=phrase_time_limit)
+        finally:
+            self.pause()
+
+    def calibrate(self, recognizer, duration):
+        self.resume()
+        try:
+            recognizer.adjust_for_ambient_noise(self._microphone, duration=duration)
+        finally:
+            self.pause()
+
+    def close(self):
+        if self._open:
+            self._microphone.__exit__(None, None, None)
+            self._open = False
+
+
+class ReplaySource:
+    """
+    Plays back WAV files, one per turn, in place of the microphone.
+    A `<name>.txt` next to `<name>.wav` holds what was said (used by the replay backend);
+    once every file has been played each turn times out as if nobody spoke.
+    """
+
+    def __init__(self, paths):
+        if isinstance(paths, str):
+            paths = sorted(glob.glob(os.path.join(paths, "*.wav")))
+        self.paths = list(paths)
+        self._next = 0
+
+    def open(self):
+        return self
+
+    def capture(self, recognizer, timeout, phrase_time_limit):
+        if self._next >= len(self.paths):
+            raise sr.WaitTimeoutError("replay finished")
+        path = self.paths[self._next]
+        self._next += 1
+        with sr.AudioFile(path) as source:
+            audio = recognizer.record(source, duration=phrase_time_limit)
+        transcript_path = os.path.splitext(path)[0] + ".txt"
+        if os.path.exists(transcript_path):
+            with open(transcript_path, "r", encoding="utf-8") as f:
+                audio.transcript = f.read().strip()
+        return audio
+
+    def calibrate(self, recognizer, duration):
+        pass
+
+    def close(self):
+        pass
+
+# ============================================================
+# LISTENER
+# ============================================================
+
+class Listener:
+    """
+    Long-lived speech input for one agent.
+
+    Usage:
+        listener = Listener(pause_threshold=2.5)
+        listener.open()                 # microphone + calibration, once
+        text = listener.listen()        # raises sr.WaitTimeoutError / UnknownValueError / RequestError
+        print(listener.last_metrics)    # {"capture": s, "recognize": s, "total": s}
+    """
+
+    def __init__(self, pause_threshold=0.8, backend=None, source=None,
+                 timeout=LISTEN_TIMEOUT_SECONDS, phrase_time_limit=None,
+                 recalibrate_seconds=RECALIBRATE_SECONDS):
+        self.backend = backend or STT_BACKEND
+        if self.backend not in _BACKENDS:
+            raise ValueError(f"Unknown STT backend {self.backend!r} (known: {', '.join(sorted(_BACKENDS))})")
+        self.recognizer = sr.Recognizer()
+        self.recognizer.pause_threshold = pause_threshold
+        self.timeout = timeout
+        self.phrase_time_limit = phrase_time_limit
+        self.recalibrate_seconds = recalibrate_seconds
+        self._source = source
+        self._opened = False
+        self._calibrated_at = None
+        self.last_metrics = None
+        self.history = []
+
+    def open(self):
+        """Open the audio source and calibrate (safe to call repeatedly)."""
+        if self._source is None:
+            replay = STT_REPLAY_DIR
+            if replay:
+                self._source = ReplaySource(replay)
+            elif self.backend == "replay":
+                raise ValueError("The replay backend needs STT_REPLAY_DIR (or a ReplaySource)")
+            else:
+                self._source = MicrophoneSource()
+        if not self._opened:
+            self._source.open()
+            self._opened = True
+            self.calibrate()
+        return self
+
+    def calibrate(self):
+        """Measure ambient noise to set the recognizer's energy threshold."""
+        self._source.calibrate(self.recognizer, CALIBRATION_SECONDS)
+        self._calibrated_at = time.monotonic()
+
+    def listen(self):
+        """
+        Capture one utterance and return its text.
+        Raises sr.WaitTimeoutError (silence), sr.UnknownValueError (unintelligible) or
+        sr.RequestError (backend failure), like speech_recognition itself.
+        """
+        self.open()
+        if self.recalibrate_seconds and time.monotonic() - self._calibrated_at > self.recalibrate_seconds:
+            self.calibrate()
+
+        start = time.perf_counter()
+        metrics = {"backend": self.backend, "capture": None, "recognize": None, "total": None}
+        try:
+            audio = self._source.capture(self.recognizer, self.timeout, self.phrase_time_limit)
+            metrics["capture"] = time.perf_counter() - start
+            print("Recognizing...")
+            recognized = time.perf_counter()
+            text = _BACKENDS[self.backend](self.recognizer, audio)
+            metrics["recognize"] = time.perf_counter() - recognized
+            return text
+        finally:
+            metrics["total"] = time.perf_counter() - start
+            self.last_metrics = metrics
+            self.history.append(metrics)
+            if metrics["capture"] is not None:
+                print(format_listen_metrics(metrics))
+
+    def close(self):
+        if self._source is not None and self._opened:
+            self._source.close()
+            self._opened = False
+
+
+def format_listen_metrics(metrics):
+    def seconds(value):
+        return "-" if value is None else f"{value:.2f}s"
+    return (f"⏱️ STT ({metrics['backend']}): capture {seconds(metrics['capture'])}, "
+            f"recognize {seconds(metrics['recognize'])}, total {seconds(metrics['total'])}")
@@ -0,0 +1,157 @@
+"""
+Transcript - Buffered, structured sink for the boardroom transcript
+Utterances are queued and written by a background thread that keeps the Markdown file open
+and flushes in batches (every TRANSCRIPT_FLUSH_SECONDS or TRANSCRIPT_MAX_BUFFERED lines) and
+optionally mirrors each utterance to a JSONL stream, so the LLM loop never waits on disk.
+Console echo happens on the calling thread as each line is queued, so it stays in order with
+the caller's own prints. Fresh runs rotate the previous transcript out of the way.
+"""
+
+import os
+import json
+import time
+import queue
+import threading
+from datetime import datetime
+
+FLUSH_INTERVAL_SECONDS = float(os.getenv("TRANSCRIPT_FLUSH_SECONDS", "1.0"))
+MAX_BUFFERED_LINES = int(os.getenv("TRANSCRIPT_MAX_BUFFERED", "256"))
+# Earlier runs kept as negotiation_log.1.md (newest) ... negotiation_log.N.md
+KEEP_RUNS = int(os.getenv("TRANSCRIPT_KEEP_RUNS", "5"))
+
+
+def jsonl_path_for(path):
+    """The machine-readable stream that sits next to a Markdown transcript."""
+    return os.path.splitext(path)[0] + ".jsonl"
+
+
+def rotate(path, keep=KEEP_RUNS):
+    """
+    Move `path` to `<name>.1<ext>`, shifting older runs up and dropping anything beyond `keep`.
+    With keep=0 the old transcript is simply removed.
+    """
+    if not os.path.exists(path):
+        return
+    if keep <= 0:
+        os.remove(path)
+        return
+    base, ext = os.path.splitext(path)
+    oldest = f"{base}.{keep}{ext}"
+    if os.path.exists(oldest):
+        os.remove(oldest)
+    for i in range(keep - 1, 0, -1):
+        older = f"{base}.{i}{ext}"
+        if os.path.exists(older):
+            os.replace(older, f"{base}.{i + 1}{ext}")
+    os.replace(path, f"{base}.1{ext}")
+
+
+class TranscriptSink:
+    """
+    Append-only transcript written by a background thread.
+
+    Usage:
+        sink = TranscriptSink("negotiation_log.md", jsonl=True)
+        sink.context = {"job_id": job_id}
+        sink.write("Jill", "Welcome, everyone.")
+        sink.close()
+    """
+
+    def __init__(self, path, jsonl=False, echo=True,
+                 flush_interval=FLUSH_INTERVAL_SECONDS, max_buffered=MAX_BUFFERED_LINES):
+        self.path = path
+        self.jsonl_path = jsonl_path_for(path) if jsonl else None
+        self.echo = echo
+        self.flush_interval = flush_interval
+        self.max_buffered = max(1, max_buffered)
+        # Extra fields stamped on every JSONL record written after it is set (e.g. the current job)
+        self.context = {}
+        self.lines_written = 0
+        self.disk_writes = 0
+
+        self._md = open(path, "a", encoding="utf-8")
+        self._jsonl = open(self.jsonl_path, "a", encoding="utf-8") if jsonl else None
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="transcript-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, speaker, text):
+        """Queue one utterance (returns immediately); the console echo is printed here, in caller order."""
+        timestamp = time.time()
+        if self.echo:
+            print(f"\n[{datetime.fromtimestamp(timestamp).strftime('%H:%M:%S')}] {speaker}: {text}")
+        self._queue.put(("utterance", (timestamp, speaker, text, dict(self.context))))
+
+    def write_raw(self, text):
+        """Queue verbatim Markdown (headers, separators) - not echoed or mirrored to JSONL."""
+        self._queue.put(("raw", text))
+
+    def flush(self):
+        """Block until everything queued so far is on disk."""
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        while not done.wait(0.1):
+            if not self._thread.is_alive():
+                raise RuntimeError("transcript writer thread died")
+
+    def close(self):
+        if self._closed:
+            return
+        self._queue.put(("stop", None))
+        self._thread.join()
+        self._closed = True
+        self._md.close()
+        if self._jsonl:
+            self._jsonl.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --------------------------------------------------------
+    # Writer thread
+    # --------------------------------------------------------
+
+    def _run(self):
+        markdown, records = [], []
+        last_flush = time.monotonic()
+        while True:
+            try:
+                kind, payload = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                kind, payload = None, None
+
+            if kind == "utterance":
+                timestamp, speaker, text, context = payload
+                markdown.append(f"**{speaker}**: {text}\n\n")
+                if self._jsonl:
+                    record = {"ts": datetime.fromtimestamp(timestamp).isoformat(timespec="milliseconds"),
+                              "speaker": speaker, "text": text, **context}
+                    records.append(json.dumps(record, ensure_ascii=False) + "\n")
+            elif kind == "raw":
+                markdown.append(payload)
+
+            due = time.monotonic() - last_flush >= self.flush_interval
+            if markdown and (kind in ("flush", "stop") or due or len(markdown) >= self.max_buffered):
+                self._write_out(markdown, records)
+                markdown, records = [], []
+            if kind in ("flush", "stop") or due:
+                last_flush = time.monotonic()
+            if kind == "flush":
+                payload.set()
+            elif kind == "stop":
+                return
+
+    def _write_out(self, markdown, records):
+        self._md.write("".join(markdown))
+        self._md.flush()
+        if self._jsonl and records:
+            self._jsonl.write("".join(records))
+            self._jsonl.flush()
+        self.lines_written += len(markdown)
+        self.disk_writes += 1
@@ -0,0 +1,348 @@
+"""
+TTS - Speech output for the voice agents
+SpeechService keeps one TTS engine alive on its own thread (voice looked up once) and
+plays queued utterances, with non-blocking speak_async and barge-in cancel. The engine is
+only touched from that thread: COM is initialized there for Windows SAPI5, and cancel is
+carried out from the engine's own word callbacks. Replies are consumed as a token stream,
+cut into sentences as soon as each one is complete and spoken while later tokens are
+still arriving; every turn's time-to-first-audio is reported.
+"""
+
+import os
+import re
+import sys
+import time
+import queue
+import threading
+
+import llm_gateway
+
+# Speak replies sentence by sentence while they stream in (STREAMING_TTS=0 waits for the full reply)
+STREAMING_TTS = os.getenv("STREAMING_TTS", "1") != "0"
+
+# Sentence end: terminal punctuation (plus closing quotes/brackets) followed by whitespace, or a line break
+SENTENCE_BOUNDARY = re.compile(r"([.!?]+[\"')\]]*)\s+|\n+")
+# Words whose trailing period does not end a sentence
+ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "e.g", "i.e", "inc", "ltd", "approx"}
+
+# Markdown that should not be read aloud: *emphasis* spans, then stray "*" / "#" and "- " bullets
+_EMPHASIS = re.compile(r"\*.*?\*")
+_STRAY_MARKUP = re.compile(r"[*#]")
+_BULLET = re.compile(r"- ")
+
+
+def clean_for_speech(text):
+    """Strip markdown symbols (and *stage directions*) before text is spoken."""
+    return _BULLET.sub("", _STRAY_MARKUP.sub("", _EMPHASIS.sub("", text)))
+
+# ============================================================
+# SPEECH SERVICE
+# ============================================================
+
+# Voice id found for each keyword tuple - the voice list is only enumerated once per process
+_voice_cache = {}
+
+
+def find_voice(engine, keywords):
+    """First installed voice whose name contains one of `keywords` (cached), or None."""
+    keywords = tuple(keywords)
+    if keywords not in _voice_cache:
+        _voice_cache[keywords] = next(
+            (voice.id for voice in engine.getProperty('voices')
+             if any(keyword in voice.name.lower() for keyword in keywords)),
+            None
+        )
+    return _voice_cache[keywords]
+
+
+def create_pyttsx3_engine(voice_keywords=()):
+    """A pyttsx3 engine set to the first voice matching `voice_keywords` (default voice otherwise)."""
+    import pyttsx3
+    engine = pyttsx3.init()
+    voice_id = find_voice(engine, voice_keywords) if voice_keywords else None
+    if voice_id:
+        engine.setProperty('voice', voice_id)
+    return engine
+
+
+def _com_initialize():
+    """
+    SAPI5 (pyttsx3's Windows driver) is a COM API, so the thread that drives the engine must
+    initialize COM first. Returns the pythoncom module to uninitialize with, or None elsewhere.
+    """
+    if sys.platform != "win32":
+        return None
+    try:
+        import pythoncom
+    except ImportError:
+        return None
+    pythoncom.CoInitialize()
+    return pythoncom
+
+
+class Utterance:
+    """Handle for a queued piece of speech."""
+
+    def __init__(self, text, generation):
+        self.text = text
+        self.generation = generation
+        self.queued_at = time.perf_counter()
+        self.cancelled = False
+        self._done = threading.Event()
+
+    def wait(self, timeout=None):
+        """Block until the utterance has been spoken (or cancelled). Returns False on timeout."""
+        return self._done.wait(timeout)
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+
+class SpeechService:
+    """
+    One long-lived TTS engine owned by a worker thread that plays a queue of utterances.
+
+    Usage:
+        speech = SpeechService(voice_keywords=("david", "male"))
+        speech.start()                 # engine + voice lookup happen once, here
+        speech.speak("Hello!")         # blocks until spoken
+        handle = speech.speak_async("Tell me more.")
+        speech.cancel()                # barge-in: stop talking, drop anything queued
+    """
+
+    def __init__(self, voice_keywords=(), engine_factory=None, missing_voice_warning=None):
+        self.voice_keywords = tuple(voice_keywords)
+        self.engine_factory = engine_factory or create_pyttsx3_engine
+        self.missing_voice_warning = missing_voice_warning
+        self.stats = {"utterances": 0, "cancelled": 0, "setup_seconds": None, "queue_wait_seconds": 0.0}
+        self._engine = None
+        self._speaking = None
+        self._queue = queue.Queue()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the speech thread and wait until its engine is ready (safe to call repeatedly)."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="speech-service", daemon=True)
+                self._thread.start()
+        self._ready.wait()
+        return self
+
+    def speak_async(self, text):
+        """Queue `text` and return its Utterance handle immediately."""
+        self.start()
+        with self._lock:
+            utterance = Utterance(clean_for_speech(text), self._generation)
+        self._queue.put(utterance)
+        return utterance
+
+    def speak(self, text):
+        """Speak `text` and block until it has been played (or cancelled)."""
+        utterance = self.speak_async(text)
+        utterance.wait()
+        return utterance
+
+    def cancel(self):
+        """
+        Barge-in: stop the current utterance and drop everything still queued. The engine is
+        not thread-safe, so it stops itself at its next word boundary (see _on_word).
+        """
+        with self._lock:
+            self._generation += 1
+
+    def wait_idle(self):
+        """Block until every queued utterance has been played or dropped."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _on_word(self, name, location, length):
+        # Runs inside runAndWait on the speech thread, where stopping the engine is safe
+        if self._speaking is not None and self._speaking.generation != self._generation:
+            self._engine.stop()
+
+    def _run(self):
+        com = _com_initialize()
+        try:
+            self._serve()
+        finally:
+            if com is not None:
+                com.CoUninitialize()
+
+    def _serve(self):
+        start = time.perf_counter()
+        try:
+            self._engine = self.engine_factory(self.voice_keywords)
+            self._engine.connect('started-word', self._on_word)
+            if self.missing_voice_warning and self.voice_keywords and _voice_cache.get(self.voice_keywords) is None:
+                print(self.missing_voice_warning)
+        except Exception as e:
+            print(f"Error in TTS: {e}")
+        self.stats["setup_seconds"] = time.perf_counter() - start
+        self._ready.set()
+
+        while True:
+            utterance = self._queue.get()
+            try:
+                if utterance is None:
+                    return
+                if utterance.generation != self._generation or self._engine is None:
+                    utterance.cancelled = True
+                    self.stats["cancelled"] += 1
+                    continue
+                self.stats["queue_wait_seconds"] += time.perf_counter() - utterance.queued_at
+                self.stats["utterances"] += 1
+                self._speaking = utterance
+                try:
+                    self._engine.say(utterance.text)
+                    self._engine.runAndWait()
+                except Exception as e:
+                    print(f"Error in TTS: {e}")
+                finally:
+                    self._speaking = None
+            finally:
+                if utterance is not None:
+                    utterance._done.set()
+                self._queue.task_done()
+
+# ============================================================
+# STREAMED REPLIES
+# ============================================================
+
+
+def _boundary(text):
+    """Index just past the first sentence boundary in `text`, or None if no sentence is complete yet."""
+    for match in SENTENCE_BOUNDARY.finditer(text):
+        if match.group(1) and match.group(1).startswith(".") and len(match.group(1)) == 1:
+            words = text[:match.start(1)].split()
+            word = words[-1].lower() if words else ""
+            if word in ABBREVIATIONS or (len(word) == 1 and word.isalpha()):
+                continue  # "Dr. Smith", "J. Doe"
+        return match.end()
+    return None
+
+
+def split_sentences(chunks):
+    """
+    Re-chunk a stream of text deltas into sentences.
+    Yields each sentence as soon as the text after it shows it is complete; the remainder
+    is yielded when the stream ends.
+    """
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        cut = _boundary(buffer)
+        while cut is not None:
+            sentence, buffer = buffer[:cut].strip(), buffer[cut:]
+            if sentence:
+                yield sentence
+            cut = _boundary(buffer)
+    if buffer.strip():
+        yield buffer.strip()
+
+
+def speak_stream(label, chunks, speak, split=True):
+    """
+    Print and speak a streamed reply, one sentence at a time.
+
+    The stream is consumed on a background thread while the calling thread hands each
+    sentence to `speak` (SpeechService plays it on its own engine thread), so generation
+    and speech overlap.
+
+    Args:
+        label: Speaker name printed before the reply (e.g. "Jack")
+        chunks: Iterable of text deltas (e.g. llm_gateway.chat_stream(...))
+        speak: fn(text) that plays one piece of speech and returns when done
+        split: False speaks the whole reply at once (the pre-streaming behaviour)
+
+    Returns:
+        (full_reply_text, metrics) - metrics holds first_token / first_audio / total seconds
+        since the request started, plus the number of sentences spoken
+    """
+    start = time.perf_counter()
+    metrics = {"first_token": None, "first_audio": None, "total": None, "sentences": 0}
+    parts = []
+    sentences = queue.Queue()
+    errors = []
+
+    def tokens():
+        for chunk in chunks:
+            if metrics["first_token"] is None:
+                metrics["first_token"] = time.perf_counter() - start
+            parts.append(chunk)
+            yield chunk
+
+    def produce():
+        try:
+            if split:
+                for sentence in split_sentences(tokens()):
+                    sentences.put(sentence)
+            else:
+                sentences.put("".join(tokens()).strip())
+        except Exception as e:
+            errors.append(e)
+        finally:
+            sentences.put(None)
+
+    threading.Thread(target=produce, name="tts-reply-stream", daemon=True).start()
+
+    first = True
+    while True:
+        sentence = sentences.get()
+        if sentence is None:
+            break
+        if not sentence:
+            continue
+        if metrics["first_audio"] is None:
+            metrics["first_audio"] = time.perf_counter() - start
+        print(f"\n{label}: {sentence}" if first else sentence)
+        first = False
+        metrics["sentences"] += 1
+        speak(sentence)
+
+    metrics["total"] = time.perf_counter() - start
+    if errors:
+        raise errors[0]
+    return "".join(parts), metrics
+
+
+def _whole_reply(messages, model, prefix_id=None):
+    """A blocking completion presented as a one-chunk stream (sent when first iterated)."""
+    yield llm_gateway.chat(messages, model, prefix_id=prefix_id)
+
+
+def speak_llm_reply(label, messages, model, speak, streaming=None, prefix_id=None):
+    """
+    Generate the agent's next reply and speak it - streamed sentence by sentence when
+    STREAMING_TTS is on - then report the turn's latency.
+
+    Returns:
+        The full reply text (to append to the conversation history)
+    """
+    streaming = STREAMING_TTS if streaming is None else streaming
+    if streaming:
+        chunks = llm_gateway.chat_stream(messages, model, prefix_id=prefix_id)
+    else:
+        chunks = _whole_reply(messages, model, prefix_id)
+    reply, metrics = speak_stream(label, chunks, speak, split=streaming)
+    print(format_turn_metrics(label, metrics, streaming))
+    return reply
+
+
+def format_turn_metrics(label, metrics, streaming=True):
+    def seconds(value):
+        return "-" if value is None else f"{value:.2f}s"
+    mode = "streaming" if streaming else "blocking"
+    return (f"⏱️ {label} turn ({mode}): first token {seconds(metrics['first_token'])}, "
+            f"first audio {seconds(metrics['first_audio'])}, total {seconds(metrics['total'])} "
+            f"({metrics['sentences']} sentence(s))")